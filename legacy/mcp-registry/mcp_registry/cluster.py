@@ -0,0 +1,96 @@
+import os
+import threading
+
+from kubernetes import client, config
+
+# Connections kept alive to the API server by the shared ApiClient
+DEFAULT_POOL_SIZE = 10
+SERVICE_ACCOUNT_NAMESPACE = "/var/run/secrets/kubernetes.io/serviceaccount/namespace"
+
+
+def read_current_namespace() -> str:
+    try:
+        with open(SERVICE_ACCOUNT_NAMESPACE, "r") as f:
+            return f.read().strip()
+    except Exception:
+        context = config.list_kube_config_contexts()[1]
+        return context.get("context", {}).get("namespace", "default")
+
+
+class ClusterContext:
+    """
+    Namespace and Kubernetes API clients of the process, resolved once and
+    shared by all the callers.
+
+    `load` reads the in-cluster or kubeconfig configuration into a single
+    ApiClient with a pool of `pool_size` connections, from which the typed
+    APIs are built. Until then, they use the default ApiClient of the
+    kubernetes package.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE):
+        self.pool_size = max(1, pool_size)
+        self.api_client: client.ApiClient | None = None
+        self._namespace: str | None = None
+        self._apis = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ClusterContext":
+        return cls(pool_size=int(os.getenv("KUBE_POOL_SIZE", str(DEFAULT_POOL_SIZE))))
+
+    def load(self) -> "ClusterContext":
+        """Load the Kubernetes configuration, unless already loaded."""
+        with self._lock:
+            if self.api_client is not None:
+                return self
+            configuration = client.Configuration()
+            try:
+                config.load_incluster_config(client_configuration=configuration)
+            except config.ConfigException:
+                config.load_kube_config(client_configuration=configuration)
+            configuration.connection_pool_maxsize = self.pool_size
+            # For the clients built without an explicit ApiClient
+            client.Configuration.set_default(configuration)
+            self.api_client = client.ApiClient(configuration)
+            self._apis.clear()
+        return self
+
+    @property
+    def namespace(self) -> str:
+        """Namespace the process runs in."""
+        if self._namespace is None:
+            self._namespace = read_current_namespace()
+        return self._namespace
+
+    def _api(self, api_class):
+        with self._lock:
+            api = self._apis.get(api_class)
+            if api is None:
+                api = self._apis[api_class] = api_class(self.api_client)
+            return api
+
+    @property
+    def custom_objects(self) -> client.CustomObjectsApi:
+        return self._api(client.CustomObjectsApi)
+
+    @property
+    def core_v1(self) -> client.CoreV1Api:
+        return self._api(client.CoreV1Api)
+
+    def close(self):
+        if self.api_client is not None:
+            self.api_client.close()
+
+
+_shared: ClusterContext | None = None
+_shared_lock = threading.Lock()
+
+
+def cluster_context() -> ClusterContext:
+    """Cluster context of the process, created on first call."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = ClusterContext.from_env()
+        return _shared
@@ -7,28 +7,33 @@ from mcp_registry.defaults import (
     MCP_SERVER_PLURALS,
     MCP_VERSION,
 )
+from mcp_registry.registry import RegistryClient
 from mcp_registry.utils import get_current_namespace, logger, sanitize_k8s_name
 
 
 class Importer:
     def __init__(
-        self, crd_api, catalog_name: str, import_job_name: str, mcp_registry_source: str
+        self,
+        crd_api,
+        catalog_name: str,
+        import_job_name: str,
+        mcp_registry_source: str,
+        registry_client: RegistryClient | None = None,
     ):
         self.crd_api = crd_api
         self.catalog_name = catalog_name
         self.import_job_name = import_job_name
         self.mcp_registry_source = mcp_registry_source
+        self.registry_client = registry_client or RegistryClient.from_env(
+            mcp_registry_source
+        )
         self.cursor = None
         self.has_next = True
         logger.info(f"Attempting to fetch server data from: {self.mcp_registry_source}")
 
     def import_next(self):
         try:
-            response = requests.get(
-                f"{self.mcp_registry_source}/servers?limit=100{f'&cursor={self.cursor}' if self.cursor else ''}"
-            )
-            response.raise_for_status()
-            server_data = response.json()
+            server_data = self.registry_client.list_servers(self.cursor)
             logger.info("Successfully fetched server data.")
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching data from {self.mcp_registry_source}: {e}")
@@ -61,9 +66,7 @@ class Importer:
             return
 
         try:
-            response = requests.get(f"{self.mcp_registry_source}/servers/{id}")
-            response.raise_for_status()
-            server_data = response.json()
+            server_data = self.registry_client.get_server(id)
         except requests.exceptions.RequestException as e:
             logger.error(
                 f"Error fetching data from {self.mcp_registry_source}/servers/{id}: {e}"
@@ -0,0 +1,146 @@
+import email.utils
+import os
+import random
+import time
+from datetime import datetime, timezone
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from mcp_registry.utils import logger
+
+# Transient statuses that are worth retrying
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header, given either in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(
+    attempt: int,
+    retry_after: float | None = None,
+    base: float = 0.5,
+    max_delay: float = 30.0,
+) -> float:
+    """
+    Delay before retrying a request for the given attempt (starting from 0).
+    The Retry-After delay is used when the server provides it, otherwise an
+    exponential backoff with full jitter. Both are capped to max_delay.
+    """
+    if retry_after is not None:
+        return min(retry_after, max_delay)
+    return random.uniform(0, min(max_delay, base * 2**attempt))
+
+
+class RegistryClient:
+    """
+    Client of the MCP Registry API sharing a pool of keep-alive connections
+    across all the requests, and retrying the connection errors and transient
+    HTTP statuses with a jittered exponential backoff.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        pool_size: int = 10,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.pool_size = max(1, pool_size)
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size, pool_maxsize=self.pool_size
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @classmethod
+    def from_env(cls, base_url: str) -> "RegistryClient":
+        return cls(
+            base_url,
+            pool_size=int(os.getenv("REGISTRY_POOL_SIZE", "10")),
+            connect_timeout=float(os.getenv("REGISTRY_CONNECT_TIMEOUT", "5")),
+            read_timeout=float(os.getenv("REGISTRY_READ_TIMEOUT", "30")),
+            max_retries=int(os.getenv("REGISTRY_MAX_RETRIES", "3")),
+            backoff_base=float(os.getenv("REGISTRY_BACKOFF_BASE", "0.5")),
+            backoff_max=float(os.getenv("REGISTRY_BACKOFF_MAX", "30")),
+        )
+
+    def page_path(self, cursor: str | None = None, limit: int = 100) -> str:
+        return f"servers?limit={limit}{f'&cursor={cursor}' if cursor else ''}"
+
+    def get(self, path: str) -> requests.Response:
+        """
+        GET the given path of the registry, retrying transient failures.
+        Raises a requests.exceptions.RequestException when the retries are
+        exhausted or the response has a non-retryable error status.
+        """
+        url = f"{self.base_url}/{path}"
+        attempt = 0
+        while True:
+            try:
+                response = self.session.get(
+                    url, timeout=(self.connect_timeout, self.read_timeout)
+                )
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = backoff_delay(
+                    attempt, base=self.backoff_base, max_delay=self.backoff_max
+                )
+                logger.warning(f"Retrying {url} in {delay:.2f}s after error: {e}")
+            else:
+                if (
+                    response.status_code not in RETRY_STATUSES
+                    or attempt >= self.max_retries
+                ):
+                    response.raise_for_status()
+                    return response
+                delay = backoff_delay(
+                    attempt,
+                    parse_retry_after(response.headers.get("Retry-After")),
+                    base=self.backoff_base,
+                    max_delay=self.backoff_max,
+                )
+                logger.warning(
+                    f"Retrying {url} in {delay:.2f}s after HTTP {response.status_code}"
+                )
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def list_servers(self, cursor: str | None = None, limit: int = 100) -> dict:
+        return self.get(self.page_path(cursor, limit)).json()
+
+    def get_server(self, id) -> dict:
+        return self.get(f"servers/{id}").json()
+
+    def close(self):
+        self.session.close()
@@ -5,7 +5,7 @@ from enum import Enum
 
 from fastapi import HTTPException
 
-from kubernetes import client, config
+from mcp_registry.cluster import cluster_context
 from mcp_registry.defaults import MCP_GROUP, MCP_REGISTRY_PLURALS, MCP_VERSION
 
 logger = logging.getLogger("uvicorn.error")
@@ -13,12 +13,7 @@ logger.setLevel(logging.INFO)
 
 
 def get_k8s_client():
-    try:
-        config.load_incluster_config()
-    except config.ConfigException:
-        config.load_kube_config()
-
-    return client.CustomObjectsApi()
+    return cluster_context().load().custom_objects
 
 
 async def get_registry(crd_api, registry_name: str):
@@ -41,12 +36,12 @@ async def get_registry(crd_api, registry_name: str):
 
 
 def get_current_namespace():
-    try:
-        with open("/var/run/secrets/kubernetes.io/serviceaccount/namespace", "r") as f:
-            return f.read().strip()
-    except Exception:
-        context = config.list_kube_config_contexts()[1]
-        return context.get("context", {}).get("namespace", "default")
+    return cluster_context().namespace
+
+
+# Runs of separators and of characters not allowed in Kubernetes names, all
+# replaced by a single hyphen
+NAME_SEPARATORS = re.compile(r"[^a-z0-9]+")
 
 
 def sanitize_k8s_name(
@@ -62,9 +57,7 @@ def sanitize_k8s_name(
 
     s = input_string.lower()
 
-    s = re.sub(r"[^a-z0-9\.-]+", "-", s)
-    s = re.sub(r"[-.]+", "-", s)
-    s = s.strip("-.")
+    s = NAME_SEPARATORS.sub("-", s).strip("-")
 
     if not s or not (s[0].isalnum() and s[-1].isalnum()):
         s = "invalid-name-" + hashlib.sha1(input_string.encode("utf-8")).hexdigest()[:8]
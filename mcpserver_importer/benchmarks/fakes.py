@@ -0,0 +1,265 @@
+"""
+Local stand-ins of the MCP registry and of the Kubernetes API, served over HTTP
+on ephemeral ports so that the importer runs end to end against them.
+"""
+
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from importer.defaults import MCP_GROUP, MCP_SERVER_PLURALS, MCP_VERSION
+
+
+def server_entry(index: int) -> dict:
+    return {
+        "id": f"{index:08x}-0000-4000-8000-000000000000",
+        "name": f"io.github.bench/server-{index}",
+        "description": f"Benchmark server {index}",
+        "version_detail": {
+            "version": "1.0.0",
+            "release_date": "2025-06-01T00:00:00Z",
+            "is_latest": True,
+        },
+    }
+
+
+def server_detail(index: int) -> dict:
+    detail = server_entry(index)
+    detail["repository"] = {
+        "url": f"https://github.com/bench/server-{index}",
+        "source": "github",
+    }
+    detail["packages"] = [
+        {
+            "registry_name": "npm",
+            "name": f"@bench/server-{index}",
+            "version": "1.0.0",
+            "environment_variables": [
+                {"name": "API_KEY", "description": "API key of the service"}
+            ],
+        }
+    ]
+    return detail
+
+
+def write_snapshot(path: Path, size: int) -> Path:
+    """Write the details of `size` generated servers as a JSON lines snapshot."""
+    with open(path, "w") as snapshot:
+        for index in range(size):
+            snapshot.write(json.dumps(server_detail(index)) + "\n")
+    return path
+
+
+class FakeServer(ThreadingHTTPServer):
+    """HTTP server on an ephemeral local port, counting its requests by kind."""
+
+    daemon_threads = True
+
+    def __init__(self, handler):
+        super().__init__(("127.0.0.1", 0), handler)
+        self.requests = Counter()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, kind: str):
+        with self._lock:
+            self.requests[kind] += 1
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+
+class JsonHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Send the headers and the body of a response at once, without delay
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    def send_json(self, status: int, body: dict):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class RegistryHandler(JsonHandler):
+    server: "FakeRegistry"
+
+    def do_GET(self):
+        registry = self.server
+        url = urlparse(self.path)
+        if registry.latency:
+            time.sleep(registry.latency)
+        if registry.error_rate and random.random() < registry.error_rate:
+            registry.count("error")
+            self.send_json(503, {"error": "unavailable"})
+            return
+
+        if url.path == "/v0/servers":
+            registry.count("page")
+            query = parse_qs(url.query)
+            start = int(query.get("cursor", ["0"])[0])
+            limit = min(int(query.get("limit", ["100"])[0]), registry.page_size)
+            end = min(start + limit, registry.size)
+            metadata = {"count": end - start}
+            if end < registry.size:
+                metadata["next_cursor"] = str(end)
+            self.send_json(
+                200,
+                {
+                    "servers": [server_entry(i) for i in range(start, end)],
+                    "metadata": metadata,
+                },
+            )
+        elif url.path.startswith("/v0/servers/"):
+            registry.count("detail")
+            index = int(url.path.rsplit("/", 1)[1].split("-", 1)[0], 16)
+            self.send_json(200, server_detail(index))
+        else:
+            self.send_json(404, {"error": "not found"})
+
+
+class FakeRegistry(FakeServer):
+    """
+    Registry of `size` generated servers, in pages of at most `page_size`
+    entries, answering every request after `latency` seconds and with a 503
+    for an `error_rate` share of them.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        page_size: int = 100,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+    ):
+        super().__init__(RegistryHandler)
+        self.size = size
+        self.page_size = page_size
+        self.latency = latency
+        self.error_rate = error_rate
+
+    @property
+    def base_url(self) -> str:
+        return f"{self.url}/v0"
+
+
+class KubeHandler(JsonHandler):
+    server: "FakeKubeApi"
+
+    def _route(self) -> tuple[str, str | None]:
+        """Kind of resource and name of the requested object, if any."""
+        parts = urlparse(self.path).path.strip("/").split("/")
+        custom_objects = parts[:3] == ["apis", MCP_GROUP, MCP_VERSION]
+        if custom_objects and MCP_SERVER_PLURALS in parts:
+            index = parts.index(MCP_SERVER_PLURALS)
+            return "mcpserver", parts[index + 1] if len(parts) > index + 1 else None
+        if "configmaps" in parts:
+            index = parts.index("configmaps")
+            return "configmap", parts[index + 1] if len(parts) > index + 1 else None
+        return "unknown", None
+
+    def do_GET(self):
+        kube = self.server
+        kind, name = self._route()
+        if kube.latency:
+            time.sleep(kube.latency)
+        if kind != "mcpserver":
+            kube.count(f"get_{kind}")
+            self.send_json(404, {"kind": "Status", "code": 404})
+            return
+        if name is not None:
+            kube.count("get")
+            obj = kube.objects.get(name)
+            if obj is None:
+                self.send_json(404, {"kind": "Status", "code": 404})
+            else:
+                self.send_json(200, obj)
+            return
+
+        kube.count("list")
+        query = parse_qs(urlparse(self.path).query)
+        start = int(query.get("continue", ["0"])[0])
+        limit = int(query.get("limit", ["500"])[0])
+        with kube.lock:
+            names = sorted(kube.objects)
+            items = [kube.objects[n] for n in names[start : start + limit]]
+        metadata = {}
+        if start + limit < len(names):
+            metadata["continue"] = str(start + limit)
+        self.send_json(
+            200, {"kind": "McpServerList", "items": items, "metadata": metadata}
+        )
+
+    def do_POST(self):
+        kube = self.server
+        kind, _ = self._route()
+        if kube.latency:
+            time.sleep(kube.latency)
+        body = self.read_json()
+        kube.count(f"create_{kind}")
+        if kind != "mcpserver":
+            self.send_json(201, body)
+            return
+        name = body["metadata"]["name"]
+        with kube.lock:
+            if name in kube.objects:
+                conflict = True
+            else:
+                conflict = False
+                kube.objects[name] = body
+        if conflict:
+            self.send_json(409, {"kind": "Status", "code": 409})
+        else:
+            self.send_json(201, body)
+
+    def do_PATCH(self):
+        kube = self.server
+        _, name = self._route()
+        if kube.latency:
+            time.sleep(kube.latency)
+        self.read_json()
+        kube.count("patch")
+        obj = kube.objects.get(name)
+        if obj is None:
+            self.send_json(404, {"kind": "Status", "code": 404})
+        else:
+            self.send_json(200, obj)
+
+
+class FakeKubeApi(FakeServer):
+    """
+    Custom objects API keeping the McpServer resources in memory, and
+    accepting the ConfigMaps of the execution summaries. Every call answers
+    after `latency` seconds.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__(KubeHandler)
+        self.latency = latency
+        self.objects: dict[str, dict] = {}
+        self.lock = threading.Lock()
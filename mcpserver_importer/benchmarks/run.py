@@ -0,0 +1,277 @@
+"""
+Scale benchmark of the importer: imports registries of increasing sizes from a
+local fake registry into a local fake Kubernetes API and reports the
+throughput, the peak RSS and the number of requests of each run.
+
+Each run happens in its own process so that its peak RSS is its own. Results
+are saved in `benchmarks/results/<commit>.json` and compared to the latest
+results of another commit.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.fakes import FakeKubeApi, FakeRegistry, write_snapshot
+
+RESULTS_DIR = Path(__file__).parent / "results"
+DEFAULT_SIZES = (100, 1000, 10000)
+NAMESPACE = "bench"
+# Throughput drop, relative to the previous results, reported as a regression
+REGRESSION_THRESHOLD = 0.2
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process, in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, KiB elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def kube_cluster(url: str):
+    """Cluster context of a run, its API clients calling the fake API server
+    instead of the shared context of the process."""
+    from kubernetes import client
+
+    from importer.cluster import ClusterContext
+
+    configuration = client.Configuration()
+    configuration.host = url
+    cluster = ClusterContext()
+    cluster.api_client = client.ApiClient(configuration)
+    return cluster
+
+
+async def async_kube_api(url: str):
+    from kubernetes_asyncio import client
+
+    configuration = client.Configuration()
+    configuration.host = url
+    return client.CustomObjectsApi(client.ApiClient(configuration))
+
+
+def import_once(options: dict) -> dict:
+    """Run one import against fresh fakes and return its measures."""
+    from importer.async_importer import AsyncImporter
+    from importer.importer import Importer
+    from importer.registry import RegistryClient
+    from importer.snapshot import SnapshotClient
+    from importer.throttle import Throttle
+
+    logging.getLogger("importer").setLevel(logging.ERROR)
+    size = options["size"]
+    with (
+        FakeRegistry(
+            size,
+            page_size=options["page_size"],
+            latency=options["registry_latency"],
+            error_rate=options["error_rate"],
+        ) as registry,
+        FakeKubeApi(latency=options["kube_latency"]) as kube,
+        tempfile.TemporaryDirectory() as tmp,
+    ):
+        registry_client = RegistryClient(
+            registry.base_url, backoff_base=0.01, backoff_max=0.1
+        )
+        if options.get("snapshot"):
+            # The same servers from a local file, without the registry requests
+            registry_client = SnapshotClient(
+                write_snapshot(Path(tmp) / "snapshot.ndjson", size)
+            )
+        kwargs = {
+            "catalog_name": "bench-catalog",
+            "import_job_name": "bench-job",
+            "mcp_registry_url": registry.base_url,
+            "max_servers": 0,
+            "namespace": NAMESPACE,
+            "fetch_concurrency": options["fetch_concurrency"],
+            "registry_client": registry_client,
+            "throttle": Throttle(qps=0, max_concurrency=options["write_concurrency"]),
+            "cluster": kube_cluster(kube.url),
+        }
+        crd_api = kwargs["cluster"].custom_objects
+        started = time.perf_counter()
+        if options["engine"] == "async":
+            importer = AsyncImporter(
+                None, write_concurrency=options["write_concurrency"], **kwargs
+            )
+
+            async def run():
+                importer.crd_api = importer._throttled(await async_kube_api(kube.url))
+                try:
+                    await importer.run_async()
+                finally:
+                    await importer.crd_api.api_client.close()
+
+            asyncio.run(run())
+        else:
+            importer = Importer(crd_api, **kwargs)
+            importer.run()
+        elapsed = time.perf_counter() - started
+        if importer.import_status == "running":
+            importer.import_status = "completed"
+        importer.generate_configmap()
+        total = time.perf_counter() - started
+        registry_client.close()
+
+        return {
+            "size": size,
+            "engine": options["engine"],
+            "imported": importer.imported_count,
+            "errors": importer.fetch_errors + importer.server_tracking.errors,
+            "import_sec": round(elapsed, 3),
+            "total_sec": round(total, 3),
+            "servers_per_sec": round(size / elapsed, 1) if elapsed else None,
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+            "registry_requests": dict(registry.requests),
+            "kube_requests": dict(kube.requests),
+        }
+
+
+def _child(options: dict, queue: multiprocessing.Queue):
+    try:
+        queue.put(import_once(options))
+    except BaseException as e:
+        queue.put({"size": options["size"], "error": repr(e)})
+        raise
+
+
+def run_isolated(options: dict) -> dict:
+    """Run one import in a child process."""
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_child, args=(options, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def previous_results(commit: str) -> dict | None:
+    """Latest saved results of another commit."""
+    if not RESULTS_DIR.is_dir():
+        return None
+    candidates = [path for path in RESULTS_DIR.glob("*.json") if path.stem != commit]
+    if not candidates:
+        return None
+    latest = max(candidates, key=lambda path: path.stat().st_mtime)
+    return json.loads(latest.read_text())
+
+
+def compare(results: dict, previous: dict) -> list[str]:
+    """Lines comparing the throughput of the runs to the previous results."""
+    lines = []
+    before = {
+        (run["size"], run.get("engine")): run
+        for run in previous.get("runs", [])
+        if run.get("servers_per_sec")
+    }
+    for run in results["runs"]:
+        old = before.get((run["size"], run.get("engine")))
+        if old is None or not run.get("servers_per_sec"):
+            continue
+        change = run["servers_per_sec"] / old["servers_per_sec"] - 1
+        flag = "  REGRESSION" if change < -REGRESSION_THRESHOLD else ""
+        lines.append(
+            f"{run['size']:>6} servers: {old['servers_per_sec']:>8} -> {run['servers_per_sec']:>8} servers/s ({change:+.0%}){flag}"
+        )
+    return lines
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="Comma separated numbers of registry servers",
+    )
+    parser.add_argument("--engine", choices=("sync", "async"), default="sync")
+    parser.add_argument(
+        "--snapshot",
+        action="store_true",
+        help="Read the servers from a local snapshot file (sync engine only)",
+    )
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument(
+        "--registry-latency", type=float, default=0.0, help="Seconds per request"
+    )
+    parser.add_argument(
+        "--kube-latency", type=float, default=0.0, help="Seconds per call"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Share of registry 503s"
+    )
+    parser.add_argument("--fetch-concurrency", type=int, default=10)
+    parser.add_argument("--write-concurrency", type=int, default=10)
+    parser.add_argument(
+        "--output", type=Path, help="Results file (default: results/<commit>.json)"
+    )
+    args = parser.parse_args(argv)
+    if args.snapshot and args.engine == "async":
+        parser.error("snapshots are only read by the sync engine")
+
+    commit = git_commit()
+    results = {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "settings": {
+            "engine": args.engine,
+            "snapshot": args.snapshot,
+            "page_size": args.page_size,
+            "registry_latency": args.registry_latency,
+            "kube_latency": args.kube_latency,
+            "error_rate": args.error_rate,
+            "fetch_concurrency": args.fetch_concurrency,
+            "write_concurrency": args.write_concurrency,
+        },
+        "runs": [],
+    }
+    for size in (int(size) for size in args.sizes.split(",")):
+        run = run_isolated({"size": size, **results["settings"]})
+        results["runs"].append(run)
+        if "error" in run:
+            print(f"{size:>6} servers: failed: {run['error']}")
+            continue
+        print(
+            f"{size:>6} servers: {run['servers_per_sec']:>8} servers/s, "
+            f"{run['peak_rss_mb']:>6} MiB peak RSS, "
+            f"registry {run['registry_requests']}, kube {run['kube_requests']}"
+        )
+
+    previous = previous_results(commit)
+    if previous is not None:
+        print(f"Compared to {previous.get('commit')}:")
+        for line in compare(results, previous):
+            print(line)
+
+    output = args.output or RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+import asyncio
+import contextlib
+import json
+import logging
+import time
+
+import httpx
+from kubernetes_asyncio import client as k8s_client
+from kubernetes_asyncio import config as k8s_config
+
+from importer import metrics
+from importer.defaults import MCP_SERVER_KIND
+from importer.importer import Importer
+from importer.inventory import McpServerInventory, list_params
+from importer.registry import cache_response, revalidated_body
+
+logger = logging.getLogger("importer")
+
+
+async def get_async_api_client(pool_size: int) -> k8s_client.ApiClient:
+    configuration = k8s_client.Configuration()
+    try:
+        k8s_config.load_incluster_config(client_configuration=configuration)
+    except k8s_config.ConfigException:
+        await k8s_config.load_kube_config(client_configuration=configuration)
+    configuration.connection_pool_maxsize = pool_size
+
+    return k8s_client.ApiClient(configuration)
+
+
+class AsyncImporter(Importer):
+    """
+    Importer running the registry pagination, the server detail fetches and the
+    McpServer writes concurrently in a single event loop.
+
+    At most `fetch_concurrency` detail requests and `write_concurrency` McpServer
+    checks and creates are in flight at any time, and the registry is walked
+    no further than needed to keep them busy. When `crd_api` or `http_client`
+    are not given, they are created and closed by `run_async`. The connection
+    pool, timeouts and retries follow the settings of the `registry_client`.
+    """
+
+    def __init__(
+        self,
+        crd_api,
+        catalog_name: str,
+        import_job_name: str,
+        mcp_registry_url: str,
+        write_concurrency: int = 10,
+        http_client: httpx.AsyncClient | None = None,
+        **kwargs,
+    ):
+        super().__init__(
+            crd_api, catalog_name, import_job_name, mcp_registry_url, **kwargs
+        )
+        self.write_concurrency = max(1, write_concurrency)
+        self.http_client = http_client
+        logger.info(f"✍️  Write Concurrency: {self.write_concurrency}")
+
+    api_exceptions = (k8s_client.ApiException,)
+
+    def run(self):
+        """Import the servers of all the registry pages."""
+        asyncio.run(self.run_async())
+
+    def _throttled(self, api):
+        return self.throttle.wrap_async(api) if self.throttle else api
+
+    async def run_async(self):
+        async with contextlib.AsyncExitStack() as stack:
+            if self.http_client is None:
+                registry = self.registry_client
+                self.http_client = await stack.enter_async_context(
+                    httpx.AsyncClient(
+                        timeout=httpx.Timeout(
+                            registry.read_timeout, connect=registry.connect_timeout
+                        ),
+                        limits=httpx.Limits(max_connections=registry.pool_size),
+                    )
+                )
+            if self.crd_api is None:
+                api_client = await stack.enter_async_context(
+                    await get_async_api_client(self.cluster.pool_size)
+                )
+                self.crd_api = self._throttled(k8s_client.CustomObjectsApi(api_client))
+
+            namespace = self.namespace or self.cluster.namespace
+            self.inventory = await self._load_inventory(namespace)
+            self.names.inventory = self.inventory
+            logger.info(
+                f"Found {len(self.inventory)} existing {MCP_SERVER_KIND} resources in {namespace}"
+            )
+            fetch_limit = asyncio.Semaphore(self.fetch_concurrency)
+            write_limit = asyncio.Semaphore(self.write_concurrency)
+            # Entries being imported, so that the walk of the registry waits for
+            # the imports instead of scheduling all its entries at once
+            pending = asyncio.Semaphore(self.fetch_concurrency + self.write_concurrency)
+            tasks = set()
+            errors = []
+
+            def done(task: asyncio.Task):
+                tasks.discard(task)
+                pending.release()
+                if not task.cancelled() and task.exception() is not None:
+                    errors.append(task.exception())
+
+            try:
+                async for server_entry in self._server_entries():
+                    await pending.acquire()
+                    self._track_server(server_entry)
+                    task = asyncio.create_task(
+                        self._import_timed_async(
+                            server_entry, namespace, fetch_limit, write_limit
+                        )
+                    )
+                    tasks.add(task)
+                    task.add_done_callback(done)
+            finally:
+                # Let the in-flight imports complete their tracking
+                await asyncio.gather(*tasks, return_exceptions=True)
+            if errors:
+                raise errors[0]
+            if self._can_prune():
+                await self.pruner.prune_async(
+                    self.crd_api, namespace, self.inventory, self._owns, self.dry_run
+                )
+        logger.info("Finished processing all server entries.")
+
+    async def _load_inventory(self, namespace: str) -> McpServerInventory:
+        inventory = McpServerInventory()
+        _continue = None
+        with self.timings.measure("existence_check"):
+            while True:
+                response = await self.crd_api.list_namespaced_custom_object(
+                    **list_params(namespace, self.catalog_name, _continue)
+                )
+                _continue = inventory.add_page(response)
+                if not _continue:
+                    return inventory
+
+    async def _server_entries(self):
+        """Walk the registry pages, yielding the server entries to import. The
+        next page is requested as soon as the entries of the current one have
+        been scheduled."""
+        while self.has_next:
+            server_data = await self._fetch_page()
+            if server_data is None:
+                return
+            server_entries = self._read_page(server_data)
+            if server_entries is None:
+                return
+            self._sanitize_page(server_entries)
+            for server_entry in server_entries:
+                yield server_entry
+                self.imported_servers += 1
+                if self.max_servers > 0 and self.imported_servers >= self.max_servers:
+                    logger.info(f"Reached max servers: {self.max_servers}")
+                    self.has_next = False
+                    self.walk_complete = False
+                    return
+
+    async def _get(self, path: str, headers: dict | None = None) -> httpx.Response:
+        """GET the given path of the registry, retrying transient failures with
+        the same policy as RegistryClient.get."""
+        registry = self.registry_client
+        url = f"{registry.base_url}/{path}"
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                with metrics.REGISTRY_IN_FLIGHT.track_inprogress():
+                    response = await self.http_client.get(url, headers=headers)
+            except httpx.TransportError as e:
+                delay = registry.retry_delay(url, attempt, error=e)
+                if delay is None:
+                    raise
+            else:
+                metrics.REGISTRY_LATENCY.labels(metrics.request_kind(path)).observe(
+                    time.perf_counter() - started
+                )
+                delay = registry.retry_delay(
+                    url,
+                    attempt,
+                    response.status_code,
+                    response.headers.get("Retry-After"),
+                )
+                if delay is None:
+                    if response.is_error:
+                        response.raise_for_status()
+                    return response
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _fetch_page(self) -> dict | None:
+        try:
+            limit = self.page_sizer.next_limit(self._page_budget())
+            started = time.monotonic()
+            with self.timings.measure("page_fetch"):
+                response = await self._get(
+                    self.registry_client.page_path(
+                        self.cursor,
+                        limit,
+                        updated_since=self.updated_since,
+                        search=self.search,
+                    )
+                )
+            server_data = response.json()
+            metrics.PAGES.inc()
+            servers = server_data.get("servers")
+            self.page_sizer.record(
+                limit,
+                len(servers) if isinstance(servers, list) else 0,
+                time.monotonic() - started,
+                len(response.content),
+            )
+            logger.info("Successfully fetched server data.")
+            return server_data
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error(f"Error fetching data from {self.mcp_registry_url}: {e}")
+            self._fail(f"Registry connection error: {str(e)}")
+            return None
+
+    async def _get_server(self, path: str) -> dict:
+        """Fetch a server detail, revalidating the cached one like
+        RegistryClient.get_server when the HTTP cache is enabled."""
+        cache = self.registry_client.cache
+        if cache is None:
+            return (await self._get(path)).json()
+
+        url = f"{self.registry_client.base_url}/{path}"
+        entry = cache.lookup(url)
+        response = await self._get(
+            path, headers=entry.request_headers() if entry else None
+        )
+        body = revalidated_body(cache, entry, response)
+        if body is not None:
+            return json.loads(body)
+        if response.status_code == 304:
+            # Evicted since the lookup, fetch it again unconditionally
+            response = await self._get(path)
+        cache_response(cache, url, response)
+        return response.json()
+
+    async def _fetch_server_detail_async(self, id) -> dict | None:
+        try:
+            with self.timings.measure("detail_fetch"):
+                server_data = await self._get_server(f"servers/{id}")
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error(
+                f"Error fetching data from {self.mcp_registry_url}/servers/{id}: {e}"
+            )
+            metrics.DETAIL_FETCHES.labels("error").inc()
+            return None
+        metrics.DETAIL_FETCHES.labels("ok").inc()
+        return server_data
+
+    async def _import_timed_async(self, server_entry: dict, *args):
+        """Import a server entry, measuring its end-to-end time."""
+        self.timings.start_server(server_entry)
+        try:
+            await self._import_server_entry_async(server_entry, *args)
+        finally:
+            self.timings.finish_server(server_entry)
+
+    async def _import_server_entry_async(
+        self,
+        server_entry: dict,
+        namespace: str,
+        fetch_limit: asyncio.Semaphore,
+        write_limit: asyncio.Semaphore,
+    ):
+        id = server_entry.get("id")
+        server_def_name = self._server_name(server_entry)
+        if server_def_name is None:
+            return
+
+        async with fetch_limit:
+            server_data = await self._fetch_server_detail_async(id)
+        if server_data is None:
+            self._fetch_failed(server_entry)
+            return
+
+        logger.info(f"Processing server: {server_def_name} (ID: {id})")
+
+        mcp_server = self._build_mcp_server(server_entry, server_def_name, server_data)
+
+        async with write_limit:
+            request = None
+            try:
+                request = self._write_request(server_entry, mcp_server, namespace)
+                if request is None:
+                    return
+                _, method, params = request
+                with self.timings.measure("write"):
+                    await getattr(self.crd_api, method)(**params)
+            except Exception as e:
+                self._record_write(server_entry, mcp_server, request, e)
+            else:
+                self._record_write(server_entry, mcp_server, request)
@@ -0,0 +1,141 @@
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+
+import yaml
+from kubernetes import client
+
+from importer.defaults import MCP_CATALOG_LABEL, MCP_IMPORT_JOB_LABEL
+from importer.utils import sanitize_k8s_name
+
+logger = logging.getLogger("importer")
+
+# Label of the checkpoint ConfigMaps, on top of the import job and catalog ones
+CHECKPOINT_LABEL = "mcp.opendatahub.io/checkpoint"
+
+
+def checkpoint_name(import_job_name: str, shard_index: int | None = None) -> str:
+    """Name of the checkpoint ConfigMap of an import job, or of one of its
+    shards, stable across the restarts of its pod."""
+    name = f"mcp-import-checkpoint-{import_job_name}"
+    if shard_index is not None:
+        name = f"{name}-shard-{shard_index}"
+    return sanitize_k8s_name(name)
+
+
+@dataclass
+class Checkpoint:
+    """
+    Progress of an import: the cursor of the registry page being processed,
+    the IDs of the servers of that page already processed and the counters of
+    the servers processed before.
+    """
+
+    registry_uri: str
+    name_filter: str = ""
+    cursor: str | None = None
+    imported_servers: int = 0
+    processed_ids: set[str] = field(default_factory=set)
+    high_water_mark: str | None = None
+    errors: int = 0
+    imported: int = 0
+    updated: int = 0
+    skipped: int = 0
+
+    def to_data(self) -> dict:
+        state = asdict(self)
+        processed_ids = state.pop("processed_ids")
+        return {
+            "checkpoint.yaml": yaml.safe_dump(state, sort_keys=False),
+            "processed_ids": "\n".join(sorted(processed_ids)),
+        }
+
+    @classmethod
+    def from_data(cls, data: dict) -> "Checkpoint":
+        state = yaml.safe_load(data.get("checkpoint.yaml", "")) or {}
+        processed_ids = data.get("processed_ids", "")
+        return cls(
+            **state,
+            processed_ids=set(processed_ids.split("\n")) if processed_ids else set(),
+        )
+
+
+class CheckpointStore:
+    """
+    Stores the checkpoint of an import job in a ConfigMap, at most once every
+    `interval` seconds unless forced.
+    """
+
+    def __init__(
+        self,
+        core_v1_api,
+        namespace: str,
+        catalog_name: str,
+        import_job_name: str,
+        interval: float = 30.0,
+        shard_index: int | None = None,
+    ):
+        self.core_v1_api = core_v1_api
+        self.namespace = namespace
+        self.catalog_name = catalog_name
+        self.import_job_name = import_job_name
+        self.name = checkpoint_name(import_job_name, shard_index)
+        self.interval = interval
+        self.saved_at = time.monotonic()
+        self.saves = 0
+
+    def due(self) -> bool:
+        return time.monotonic() - self.saved_at >= self.interval
+
+    def load(self) -> Checkpoint | None:
+        try:
+            configmap = self.core_v1_api.read_namespaced_config_map(
+                name=self.name, namespace=self.namespace
+            )
+        except client.ApiException as e:
+            if e.status == 404:
+                return None
+            raise
+        return Checkpoint.from_data(configmap.data or {})
+
+    def save(self, checkpoint: Checkpoint):
+        body = {
+            "apiVersion": "v1",
+            "kind": "ConfigMap",
+            "metadata": {
+                "name": self.name,
+                "namespace": self.namespace,
+                "labels": {
+                    "app.kubernetes.io/name": "mcp-registry-operator",
+                    "app.kubernetes.io/managed-by": self.catalog_name,
+                    MCP_IMPORT_JOB_LABEL: self.import_job_name,
+                    MCP_CATALOG_LABEL: self.catalog_name,
+                    CHECKPOINT_LABEL: "true",
+                },
+            },
+            "data": checkpoint.to_data(),
+        }
+        try:
+            self.core_v1_api.replace_namespaced_config_map(
+                name=self.name, namespace=self.namespace, body=body
+            )
+        except client.ApiException as e:
+            if e.status != 404:
+                raise
+            self.core_v1_api.create_namespaced_config_map(
+                namespace=self.namespace, body=body
+            )
+        self.saved_at = time.monotonic()
+        self.saves += 1
+        logger.debug(
+            f"Saved checkpoint at cursor {checkpoint.cursor} after {checkpoint.imported_servers} servers"
+        )
+
+    def delete(self):
+        try:
+            self.core_v1_api.delete_namespaced_config_map(
+                name=self.name, namespace=self.namespace
+            )
+        except client.ApiException as e:
+            if e.status != 404:
+                raise
@@ -14,3 +14,10 @@ MCP_SERVERRUN_PLURALS = "mcpserverruns"
 
 PYTHON_BASE_IMAGE = "registry.redhat.io/ubi9/python-311:latest"
 NODE_BASE_IMAGE = "registry.redhat.io/ubi9/nodejs-22:latest"
+
+MCP_CATALOG_LABEL = "mcp.opendatahub.io/mcpcatalog"
+MCP_IMPORT_JOB_LABEL = "mcp.opendatahub.io/mcpserverimportjob"
+MCP_SERVER_ID_LABEL = "mcp.opendatahub.io/server-id"
+SERVER_DETAIL_HASH_ANNOTATION = "mcp.opendatahub.io/server-detail-hash"
+DROPPED_FIELDS_ANNOTATION = "mcp.opendatahub.io/dropped-fields"
+ORPHANED_ANNOTATION = "mcp.opendatahub.io/orphaned-since"
@@ -0,0 +1,76 @@
+import fnmatch
+import re
+
+GLOB_CHARS = frozenset("*?[")
+REGEX_PREFIX = "re:"
+
+
+def split_patterns(value: str) -> list[str]:
+    return [pattern.strip() for pattern in value.split(",") if pattern.strip()]
+
+
+def pattern_regex(pattern: str) -> str:
+    """
+    Regular expression of a name pattern: `re:` followed by a regular
+    expression searched in the name, a glob matching the whole name when it
+    contains `*`, `?` or `[`, or else a substring of the name.
+    """
+    if pattern.startswith(REGEX_PREFIX):
+        return pattern[len(REGEX_PREFIX) :]
+    if GLOB_CHARS.intersection(pattern):
+        return f"^{fnmatch.translate(pattern)}"
+    return re.escape(pattern)
+
+
+def compile_patterns(patterns: list[str]) -> re.Pattern | None:
+    """Compile patterns into a single case-insensitive regular expression."""
+    if not patterns:
+        return None
+    return re.compile(
+        "|".join(f"(?:{pattern_regex(pattern)})" for pattern in patterns),
+        re.IGNORECASE,
+    )
+
+
+class NameFilter:
+    """
+    Filter of the registry entries by name, from comma separated include and
+    exclude patterns. A name matches when it matches any include pattern, or
+    there is none, and no exclude pattern.
+    """
+
+    def __init__(self, include: str = "", exclude: str = ""):
+        self.include = include
+        self.exclude = exclude
+        self.include_patterns = split_patterns(include)
+        self.exclude_patterns = split_patterns(exclude)
+        self._include = compile_patterns(self.include_patterns)
+        self._exclude = compile_patterns(self.exclude_patterns)
+
+    def __bool__(self) -> bool:
+        return bool(self.include_patterns or self.exclude_patterns)
+
+    @property
+    def key(self) -> str:
+        """Identity of the filter, to tell whether two imports used the same."""
+        if not self.exclude_patterns:
+            return self.include
+        return f"{self.include};exclude={self.exclude}"
+
+    def matches(self, name: str) -> bool:
+        if self._include is not None and not self._include.search(name):
+            return False
+        return self._exclude is None or not self._exclude.search(name)
+
+    def search_term(self) -> str | None:
+        """
+        Term of the registry `search` query parameter, a case-insensitive
+        substring of the names, narrowing the pages to the entries that can
+        match. Only a single substring pattern can be sent to the registry.
+        """
+        if len(self.include_patterns) != 1:
+            return None
+        pattern = self.include_patterns[0]
+        if pattern.startswith(REGEX_PREFIX) or GLOB_CHARS.intersection(pattern):
+            return None
+        return pattern
@@ -0,0 +1,183 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+
+logger = logging.getLogger("importer")
+
+META_SUFFIX = ".json"
+BODY_SUFFIX = ".body"
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    etag: str | None
+    last_modified: str | None
+    size: int
+    stored_at: float
+
+    def request_headers(self) -> dict:
+        """Conditional request headers revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """
+    Persistent cache of HTTP response bodies keyed by URL, storing the ETag and
+    Last-Modified validators to send conditional requests on later runs. Each
+    entry is a metadata file and a body file named after the hash of the URL.
+    When the bodies exceed `max_bytes`, the least recently used entries are
+    evicted.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.size_bytes = sum(entry.size for entry in self.entries())
+
+    def _path(self, url: str, suffix: str) -> str:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{key}{suffix}")
+
+    def lookup(self, url: str) -> CacheEntry | None:
+        try:
+            with open(self._path(url, META_SUFFIX), "r") as f:
+                entry = CacheEntry(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+        return entry if entry.url == url else None
+
+    def read(self, entry: CacheEntry) -> bytes | None:
+        """Read the body of an entry, marking it as recently used."""
+        meta_path = self._path(entry.url, META_SUFFIX)
+        try:
+            with open(self._path(entry.url, BODY_SUFFIX), "rb") as f:
+                body = f.read()
+            os.utime(meta_path)
+        except OSError:
+            return None
+        with self._lock:
+            self.hits += 1
+        return body
+
+    def store(self, url: str, body: bytes, etag: str | None, last_modified: str | None):
+        if len(body) > self.max_bytes:
+            return
+        previous = self.lookup(url)
+        entry = CacheEntry(url, etag, last_modified, len(body), time.time())
+        # Write the body before the metadata, so that a metadata file always
+        # refers to a complete body
+        self._write(self._path(url, BODY_SUFFIX), body)
+        self._write(
+            self._path(url, META_SUFFIX), json.dumps(asdict(entry)).encode("utf-8")
+        )
+        with self._lock:
+            self.misses += 1
+            self.size_bytes += entry.size - (previous.size if previous else 0)
+            over_limit = self.size_bytes > self.max_bytes
+        if over_limit:
+            self.evict()
+
+    def _write(self, path: str, data: bytes):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+
+    def _remove(self, url: str):
+        for suffix in (META_SUFFIX, BODY_SUFFIX):
+            try:
+                os.remove(self._path(url, suffix))
+            except FileNotFoundError:
+                pass
+
+    def entries(self) -> list[CacheEntry]:
+        """All the cache entries, the least recently used first."""
+        entries = []
+        for file_name in os.listdir(self.directory):
+            if not file_name.endswith(META_SUFFIX):
+                continue
+            path = os.path.join(self.directory, file_name)
+            try:
+                with open(path, "r") as f:
+                    entry = CacheEntry(**json.load(f))
+                entries.append((os.path.getmtime(path), entry))
+            except (OSError, ValueError, TypeError):
+                continue
+        entries.sort(key=lambda item: item[0])
+        return [entry for _, entry in entries]
+
+    def evict(self, target_bytes: int | None = None):
+        """Remove the least recently used entries until the bodies fit in
+        `target_bytes`, by default 90% of the max size."""
+        if target_bytes is None:
+            target_bytes = int(self.max_bytes * 0.9)
+        with self._lock:
+            for entry in self.entries():
+                if self.size_bytes <= target_bytes:
+                    break
+                self._remove(entry.url)
+                self.size_bytes -= entry.size
+                self.evictions += 1
+
+    def clear(self):
+        self.evict(target_bytes=0)
+
+    def stats(self) -> dict:
+        return {
+            "directory": self.directory,
+            "entries": len(self.entries()),
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def main():
+    """Inspect or clear an HTTP cache directory."""
+    parser = argparse.ArgumentParser(description="Inspect the importer HTTP cache.")
+    parser.add_argument("directory", help="Cache directory (HTTP_CACHE_DIR)")
+    parser.add_argument("--list", action="store_true", help="List the entries")
+    parser.add_argument("--clear", action="store_true", help="Remove all entries")
+    args = parser.parse_args()
+
+    cache = HttpCache(args.directory)
+    if args.clear:
+        cache.clear()
+    if args.list:
+        for entry in cache.entries():
+            print(
+                f"{entry.size:>10}  {entry.etag or '-':<40}  "
+                f"{entry.last_modified or '-':<30}  {entry.url}"
+            )
+    stats = cache.stats()
+    print(
+        f"{stats['entries']} entries, {stats['size_bytes']} bytes "
+        f"(max {stats['max_bytes']}) in {stats['directory']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,65 @@
 import logging
 import os
+import signal
 import sys
+import time
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 
 import requests
-import yaml
 from kubernetes import client
 
+from importer import metrics
+from importer.checkpoint import Checkpoint, CheckpointStore
+from importer.cluster import ClusterContext, cluster_context
 from importer.defaults import (
+    DROPPED_FIELDS_ANNOTATION,
     MCP_GROUP,
     MCP_SERVER_KIND,
-    MCP_SERVER_PLURALS,
     MCP_VERSION,
+    SERVER_DETAIL_HASH_ANNOTATION,
 )
-from importer.utils import get_current_namespace, get_k8s_client, sanitize_k8s_name
+from importer.filters import NameFilter
+from importer.incremental import (
+    HIGH_WATER_MARK_ANNOTATION,
+    NAME_FILTER_ANNOTATION,
+    entry_updated_at,
+    format_timestamp,
+    load_high_water_mark,
+    parse_timestamp,
+)
+from importer.inventory import (
+    InventoryRecord,
+    McpServerInventory,
+    create_params,
+    load_inventory,
+    patch_params,
+    server_detail_hash,
+)
+from importer.names import NameSanitizer
+from importer.paging import PageSizer
+from importer.projection import DetailProjection
+from importer.prune import Pruner
+from importer.registry import RegistryClient
+from importer.report import (
+    SUMMARY_KEY,
+    build_report,
+    check_report_format,
+    dump_yaml,
+)
+from importer.shards import SHARD_LABEL, shard_from_env, shard_of
+from importer.throttle import Throttle
+from importer.timing import PhaseTimings
+from importer.tracking import ServerLedger
 
 logger = logging.getLogger("importer")
 
 
 class Importer:
+    # Errors of the Kubernetes API calls, tracked as api_error
+    api_exceptions = (client.ApiException,)
+
     def __init__(
         self,
         crd_api,
@@ -30,25 +70,88 @@ class Importer:
         max_servers: int = 100,
         namespace: str = "",
         dry_run: bool = False,
+        fetch_concurrency: int = 10,
+        registry_client: RegistryClient | None = None,
+        prefetch_pages: bool = True,
+        updated_since: str | None = None,
+        update_existing: bool = False,
+        stream_parse: bool = False,
+        page_sizer: PageSizer | None = None,
+        checkpoint_store: CheckpointStore | None = None,
+        shard_index: int = 0,
+        shard_count: int = 1,
+        throttle: Throttle | None = None,
+        name_exclude: str = "",
+        registry_search: bool = False,
+        timings: PhaseTimings | None = None,
+        cluster: ClusterContext | None = None,
+        report_format: str = "auto",
+        projection: DetailProjection | None = None,
+        pruner: Pruner | None = None,
     ):
         self.crd_api = crd_api
         self.catalog_name = catalog_name
         self.import_job_name = import_job_name
         self.mcp_registry_url = mcp_registry_url
         self.name_filter = name_filter
+        self.name_exclude = name_exclude
+        self._name_filter = NameFilter(name_filter, name_exclude)
+        # Name filter sent to the registry, when it supports search
+        self.search = self._name_filter.search_term() if registry_search else None
         self.max_servers = max_servers
         self.imported_servers = 0
         self.cursor = None
         self.has_next = True
         self.namespace = namespace
         self.dry_run = dry_run
+        self.fetch_concurrency = max(1, fetch_concurrency)
+        self.registry_client = registry_client or RegistryClient(
+            mcp_registry_url, pool_size=self.fetch_concurrency
+        )
+        self.prefetch_pages = prefetch_pages
+        self.update_existing = update_existing
+        self.stream_parse = stream_parse
+        self.page_sizer = page_sizer or PageSizer()
+        self.timings = timings or PhaseTimings()
+        self.report_format = check_report_format(report_format)
+        self.projection = projection or DetailProjection()
+        # Full sync of the catalog at the end of the import, when set
+        self.pruner = pruner
+        self.cluster = cluster or cluster_context()
+        self.checkpoint_store = checkpoint_store
+        self.shard_index = shard_index
+        self.shard_count = max(1, shard_count)
+        self.throttle = throttle
+        if crd_api is not None:
+            self.crd_api = self._throttled(crd_api)
+        # Cursor of the page being processed and IDs of its processed servers
+        self._page_cursor = None
+        self._page_processed = set()
+        # IDs of the servers of the first page processed before a restart
+        self._resumed_ids = set()
+        self._resumed = False
+        # Only the entries updated after this time are imported, when set
+        self.updated_since = updated_since
+        self._updated_since = parse_timestamp(updated_since)
+        # Latest update time of the registry entries seen so far
+        self.high_water_mark = self._updated_since
+        # Whether the last page of the registry was reached
+        self.walk_complete = False
+        # Cursor and pending fetch of the next page, when prefetched
+        self._prefetched_page: tuple[str, Future] | None = None
+        self._page_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="page"
+        )
 
         # Tracking for ConfigMap generation
         self.start_time = datetime.now()
-        self.server_tracking = []
+        self.names = NameSanitizer()
+        self.server_tracking = ServerLedger(self.names)
         self.import_status = "running"
         self.error_message: str | None = None
-        self.imported_count = 0
+        self.fetch_errors = 0
+        # Existing McpServer resources of the catalog, listed on first use
+        self.inventory: McpServerInventory | None = None
 
         logger.info("=" * 80)
         logger.info("🚀 MCP SERVER IMPORTER INITIALIZATION")
@@ -57,105 +160,457 @@ class Importer:
         logger.info(f"📚 Catalog Name: {self.catalog_name}")
         logger.info(f"🏷️  Import Job: {self.import_job_name}")
         logger.info(f"🔍 Name Filter: {self.name_filter or 'None'}")
+        if self.name_exclude:
+            logger.info(f"🚫 Name Exclude: {self.name_exclude}")
+        if self.search:
+            logger.info(f"🔎 Registry Search: {self.search}")
         logger.info(f"📊 Max Servers: {self.max_servers}")
         logger.info(f"🏠 Namespace: {self.namespace}")
         logger.info(f"🔍 Dry Run: {self.dry_run}")
+        logger.info(f"🧵 Fetch Concurrency: {self.fetch_concurrency}")
+        logger.info(f"⏩ Prefetch Pages: {self.prefetch_pages}")
+        logger.info(f"🌊 Stream Parse: {self.stream_parse}")
+        logger.info(f"🔄 Update Existing: {self.update_existing}")
+        if self.projection.fields:
+            logger.info(f"✂️  Server Detail Fields: {', '.join(self.projection.fields)}")
+        if self.shard_count > 1:
+            logger.info(f"🧩 Shard: {self.shard_index + 1}/{self.shard_count}")
+        logger.info(f"🕒 Updated Since: {self.updated_since or 'None'}")
+        if self.pruner is not None:
+            logger.info(f"🧹 Prune: {self.pruner.action}")
         logger.info("=" * 80)
 
-    def import_next(self):
+    def run(self):
+        """Import the servers of all the registry pages."""
         try:
-            response = requests.get(
-                f"{self.mcp_registry_url}/servers?limit=100{f'&cursor={self.cursor}' if self.cursor else ''}"
+            while self.has_next:
+                self.import_next()
+        except BaseException:
+            self._save_checkpoint(force=True)
+            raise
+        finally:
+            self._cancel_prefetch()
+        if self.import_status == "failed":
+            self._save_checkpoint(force=True)
+        elif self._can_prune():
+            namespace = self.namespace or self.cluster.namespace
+            self.pruner.prune(
+                self.crd_api,
+                namespace,
+                self._catalog_inventory(namespace),
+                self._owns,
+                self.dry_run,
             )
-            response.raise_for_status()
-            server_data = response.json()
+
+    def resume(self, checkpoint: Checkpoint):
+        """Continue the import from a checkpoint saved by a previous run."""
+        self.cursor = checkpoint.cursor
+        self._page_cursor = checkpoint.cursor
+        self._page_processed = set(checkpoint.processed_ids)
+        self._resumed_ids = set(checkpoint.processed_ids)
+        # The servers of the pages before the checkpoint are not seen again
+        self._resumed = True
+        self.imported_servers = checkpoint.imported_servers
+        self.high_water_mark = parse_timestamp(checkpoint.high_water_mark)
+        self.fetch_errors = checkpoint.errors
+        self.server_tracking.imported = checkpoint.imported
+        self.server_tracking.updated = checkpoint.updated
+        self.server_tracking.skipped = checkpoint.skipped
+        logger.info(
+            f"♻️  Resuming at cursor {self.cursor} after {self.imported_servers} servers"
+        )
+
+    def _save_checkpoint(self, force: bool = False):
+        """Save the progress of the import when a checkpoint is due. Failures
+        are logged, the import goes on without checkpoint."""
+        store = self.checkpoint_store
+        if store is None or self.dry_run or not (force or store.due()):
+            return
+        checkpoint = Checkpoint(
+            registry_uri=self.mcp_registry_url,
+            name_filter=self._name_filter.key,
+            cursor=self._page_cursor,
+            imported_servers=self.imported_servers,
+            processed_ids=self._page_processed,
+            high_water_mark=format_timestamp(self.high_water_mark)
+            if self.high_water_mark
+            else None,
+            errors=self.fetch_errors + self.server_tracking.errors,
+            imported=self.server_tracking.imported,
+            updated=self.server_tracking.updated,
+            skipped=self.server_tracking.skipped,
+        )
+        try:
+            store.save(checkpoint)
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to save checkpoint: {e}")
+
+    def _start_page(self):
+        if self.cursor != self._page_cursor:
+            self._page_cursor = self.cursor
+            self._page_processed = set()
+            self._resumed_ids = set()
+
+    def import_next(self):
+        self._start_page()
+        if self.stream_parse:
+            self._import_streamed_page()
+            return
+        try:
+            server_data = self._take_page()
             logger.info("Successfully fetched server data.")
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching data from {self.mcp_registry_url}: {e}")
-            self.has_next = False
-            self.cursor = None
-            self.import_status = "failed"
-            self.error_message = f"Registry connection error: {str(e)}"
+            self._fail(f"Registry connection error: {str(e)}")
             return
 
-        if "servers" not in server_data or not isinstance(server_data["servers"], list):
-            logger.error("JSON response does not contain a 'servers' list.")
-            self.has_next = False
-            self.cursor = None
-            self.import_status = "failed"
-            self.error_message = (
-                "Invalid registry response format: missing 'servers' list"
-            )
+        server_entries = self._read_page(server_data)
+        if server_entries is None:
             return
+        if self.has_next and (
+            self.max_servers <= 0
+            or self.imported_servers + len(server_entries) < self.max_servers
+        ):
+            # Overlap the next page fetch with the processing of this one
+            self._prefetch_page(self.cursor, len(server_entries))
 
-        self.cursor = server_data.get("metadata", {}).get("next_cursor", None)
-        self.has_next = bool(self.cursor)
-        logger.info(f"Next cursor: {self.cursor}, has_next: {self.has_next}")
+        self._import_entries(server_entries)
+        logger.info("Finished processing all server entries.")
 
-        for server_entry in server_data["servers"]:
-            if not self._name_match(server_entry):
-                logger.debug(f"Skipping server: {server_entry.get('name', '')}")
-                # Not tracking server if it is filtered out by name filter
-                continue
+    def _import_streamed_page(self):
+        """Import the registry page at the current cursor while it is parsed,
+        fetching and importing its entries in chunks of `fetch_concurrency`.
+        The next cursor is only known at the end of the page, so the page is
+        not prefetched."""
+        import ijson
 
-            # Track server before processing
-            server_id = server_entry.get("id", "")
-            server_name = server_entry.get("name", "")
-            mcpserver_name = sanitize_k8s_name(server_name)
+        try:
+            # Only the response headers, the page is read while it is imported
+            with self.timings.measure("page_fetch"):
+                page = self.registry_client.stream_servers(
+                    self.cursor,
+                    limit=self.page_sizer.next_limit(self._page_budget()),
+                    updated_since=self.updated_since,
+                    search=self.search,
+                )
+            metrics.PAGES.inc()
+            logger.info("Successfully fetched server data.")
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error fetching data from {self.mcp_registry_url}: {e}")
+            self._fail(f"Registry connection error: {str(e)}")
+            return
 
-            self.server_tracking.append(
-                {
-                    "id": server_id,
-                    "name": server_name,
-                    "mcpserver_name": mcpserver_name,
-                    "skipped": False,
-                    "reason": None,
-                }
-            )
+        try:
+            chunk = []
+            for server_entry in self._select_entries(page.servers()):
+                chunk.append(server_entry)
+                if len(chunk) >= self.fetch_concurrency:
+                    self._import_entries(chunk)
+                    chunk = []
+            self._import_entries(chunk)
+        except (ijson.JSONError, requests.exceptions.RequestException) as e:
+            logger.error(f"Error reading data from {self.mcp_registry_url}: {e}")
+            self._fail(f"Registry connection error: {str(e)}")
+            return
+        finally:
+            page.close()
+        logger.info("Finished processing all server entries.")
+
+        if not self.has_next:
+            # Reached max servers within the page
+            return
+        if not page.has_servers:
+            logger.error("JSON response does not contain a 'servers' list.")
+            self._fail("Invalid registry response format: missing 'servers' list")
+            return
+        self.cursor = page.next_cursor
+        self.has_next = bool(self.cursor)
+        self.walk_complete = not self.has_next
+        logger.info(f"Next cursor: {self.cursor}, has_next: {self.has_next}")
 
-            self._import_server_entry(server_entry)
+    def _import_entries(self, server_entries: list):
+        """Fetch the details of the given server entries and import them, until
+        max_servers is reached."""
+        self._sanitize_page(server_entries)
+        server_details = self._fetch_server_details(server_entries)
+        for server_entry, server_detail in zip(server_entries, server_details):
+            self._track_server(server_entry)
+            if not self.names.name(server_entry.get("name")):
+                self._skip_missing_name(server_entry)
+            elif server_detail is not None:
+                self._import_server_entry(server_entry, server_detail)
+            else:
+                self._fetch_failed(server_entry)
+            self.timings.finish_server(server_entry)
             self.imported_servers += 1
+            if server_entry.get("id"):
+                self._page_processed.add(server_entry["id"])
             if self.max_servers > 0 and self.imported_servers >= self.max_servers:
                 logger.info(f"Reached max servers: {self.max_servers}")
                 self.has_next = False
+                self.walk_complete = False
                 break
-        logger.info("Finished processing all server entries.")
+            self._save_checkpoint()
 
-    def _name_match(self, server_entry: dict) -> bool:
-        if not self.name_filter:
-            return True
-        return self.name_filter.lower() in server_entry.get("name", "").lower()
-
-    def _import_server_entry(self, server_entry):
-        id = server_entry.get("id")
-        server_def_name = server_entry.get("name")
-        server_def_name = sanitize_k8s_name(server_def_name)
-        if not server_def_name:
+    def _sanitize_page(self, server_entries: list):
+        """Sanitize the names of a page at once, in the registry order, so that
+        the names given to colliding entries do not depend on the processing
+        order. The existing McpServers are listed first, for the names of
+        other servers not to be taken."""
+        if not server_entries:
+            return
+        try:
+            with self.timings.measure("existence_check"):
+                self._catalog_inventory(self.namespace or self.cluster.namespace)
+        except Exception as e:
+            # Retried, and reported per server, by the imports
             logger.warning(
-                f"Server entry missing 'name' field, skipping: {server_entry}"
+                f"⚠️  Failed to list the existing {MCP_SERVER_KIND} resources: {e}"
             )
+        with self.timings.measure("sanitize"):
+            self.names.sanitize_page(server_entries)
+
+    def _catalog_inventory(self, namespace: str) -> McpServerInventory:
+        """Existing McpServer resources of the catalog, listed on first use."""
+        if self.inventory is None:
+            self.inventory = load_inventory(self.crd_api, namespace, self.catalog_name)
+            self.names.inventory = self.inventory
+            logger.info(
+                f"Found {len(self.inventory)} existing {MCP_SERVER_KIND} resources in {namespace}"
+            )
+        return self.inventory
+
+    def _take_page(self) -> dict:
+        """Return the registry page at the current cursor, waiting for the
+        prefetched one when available."""
+        prefetched, self._prefetched_page = self._prefetched_page, None
+        if prefetched is not None:
+            cursor, future = prefetched
+            if cursor == self.cursor:
+                return future.result()
+            future.cancel()
+        return self._list_servers(
+            self.cursor, self.page_sizer.next_limit(self._page_budget())
+        )
+
+    def _page_budget(self, pending: int = 0) -> int | None:
+        """Number of entries still to import when every entry of the next page
+        will be imported, None when unknown because of client-side filtering."""
+        if self.max_servers <= 0 or self._name_filter or self.updated_since:
+            return None
+        if self.shard_count > 1:
+            return None
+        return self.max_servers - self.imported_servers - pending
+
+    def _list_servers(self, cursor: str | None, limit: int) -> dict:
+        started = time.monotonic()
+        with self.timings.measure("page_fetch"):
+            server_data = self.registry_client.list_servers(
+                cursor,
+                limit=limit,
+                updated_since=self.updated_since,
+                search=self.search,
+            )
+        metrics.PAGES.inc()
+        servers = server_data.get("servers")
+        self.page_sizer.record(
+            limit,
+            len(servers) if isinstance(servers, list) else 0,
+            time.monotonic() - started,
+            self.registry_client.last_page_bytes,
+        )
+        return server_data
+
+    def _prefetch_page(self, cursor: str, pending: int):
+        if not self.prefetch_pages:
             return
+        logger.debug(f"Prefetching page at cursor: {cursor}")
+        self._prefetched_page = (
+            cursor,
+            self._page_executor.submit(
+                self._list_servers,
+                cursor,
+                self.page_sizer.next_limit(self._page_budget(pending)),
+            ),
+        )
+
+    def _cancel_prefetch(self):
+        """Drop any prefetched page that will not be used."""
+        if self._prefetched_page is not None:
+            self._prefetched_page[1].cancel()
+            self._prefetched_page = None
+        self._page_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _fail(self, error_message: str):
+        self.has_next = False
+        self.cursor = None
+        self.import_status = "failed"
+        self.error_message = error_message
+
+    def _read_page(self, server_data: dict) -> list | None:
+        """Validate a registry page, move the cursor forward and return the
+        server entries to import from it, honoring the name filter and the
+        max_servers limit. Returns None if the page is invalid."""
+        if "servers" not in server_data or not isinstance(server_data["servers"], list):
+            logger.error("JSON response does not contain a 'servers' list.")
+            self._fail("Invalid registry response format: missing 'servers' list")
+            return None
 
+        self.cursor = server_data.get("metadata", {}).get("next_cursor", None)
+        self.has_next = bool(self.cursor)
+        self.walk_complete = not self.has_next
+        logger.info(f"Next cursor: {self.cursor}, has_next: {self.has_next}")
+
+        return list(self._select_entries(server_data["servers"]))
+
+    def _select_entries(self, servers):
+        """Yield the server entries to import, honoring the updated since time,
+        the name filter and the max_servers limit."""
+        budget = self.max_servers - self.imported_servers
+        selected = 0
+        for server_entry in servers:
+            if self.pruner is not None:
+                self.pruner.see(server_entry)
+            if server_entry.get("id") in self._resumed_ids:
+                # Processed before the restart
+                continue
+            if not self._updated_since_match(server_entry):
+                logger.debug(f"Unchanged server: {server_entry.get('name', '')}")
+                continue
+            if not self._name_match(server_entry):
+                logger.debug(f"Skipping server: {server_entry.get('name', '')}")
+                # Not tracking server if it is filtered out by name filter
+                continue
+            if not self._shard_match(server_entry):
+                continue
+            yield server_entry
+            selected += 1
+            if self.max_servers > 0 and selected >= budget:
+                self.walk_complete = False
+                return
+
+    def _fetch_server_details(self, server_entries: list) -> list:
+        """Fetch the details of the given server entries using a bounded pool of
+        workers. Results are returned in the same order as the entries, with
+        None in place of the details that could not be fetched."""
+        if not server_entries:
+            return []
+        workers = min(self.fetch_concurrency, len(server_entries))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="fetch"
+        ) as executor:
+            return list(executor.map(self._fetch_entry_detail, server_entries))
+
+    def _fetch_entry_detail(self, server_entry: dict) -> dict | None:
+        if not self.names.name(server_entry.get("name")):
+            # Skipped without its detail
+            return None
+        self.timings.start_server(server_entry)
+        return self._fetch_server_detail(server_entry.get("id"))
+
+    def _fetch_server_detail(self, id) -> dict | None:
         try:
-            response = requests.get(f"{self.mcp_registry_url}/servers/{id}")
-            response.raise_for_status()
-            server_data = response.json()
+            with self.timings.measure("detail_fetch"):
+                server_data = self.registry_client.get_server(id)
         except requests.exceptions.RequestException as e:
             logger.error(
                 f"Error fetching data from {self.mcp_registry_url}/servers/{id}: {e}"
             )
-            return
+            metrics.DETAIL_FETCHES.labels("error").inc()
+            return None
+        metrics.DETAIL_FETCHES.labels("ok").inc()
+        return server_data
 
-        logger.info(f"Processing server: {server_def_name} (ID: {id})")
+    def _updated_since_match(self, server_entry: dict) -> bool:
+        """Track the high-water mark and tell whether the entry changed since the
+        last import. Entries without an update time are always imported."""
+        updated_at = entry_updated_at(server_entry)
+        if updated_at is None:
+            return True
+        if self.high_water_mark is None or updated_at > self.high_water_mark:
+            self.high_water_mark = updated_at
+        return self._updated_since is None or updated_at > self._updated_since
 
+    def _throttled(self, api):
+        """Put the Kubernetes API calls behind the client-side limits."""
+        return self.throttle.wrap(api) if self.throttle else api
+
+    def _can_prune(self) -> bool:
+        """The McpServers of the catalog can only be pruned after a complete
+        walk of the unfiltered registry, when every server was seen."""
+        if self.pruner is None:
+            return False
+        if self.import_status == "failed":
+            reason = "the import failed"
+        elif not self.walk_complete:
+            reason = "the registry was not walked to its last page"
+        elif self._name_filter or self.search:
+            reason = "the servers are filtered by name"
+        elif self.updated_since:
+            reason = "the import is incremental"
+        elif self._resumed:
+            reason = "the import resumed from a checkpoint"
+        else:
+            return True
+        self.pruner.skip(reason)
+        return False
+
+    def _owns(self, server_id: str) -> bool:
+        """Tell whether the McpServer of a server ID is handled by this shard."""
+        return self._shard_match({"id": server_id})
+
+    def _shard_match(self, server_entry: dict) -> bool:
+        if self.shard_count == 1:
+            return True
+        key = server_entry.get("id") or server_entry.get("name", "")
+        return shard_of(key, self.shard_count) == self.shard_index
+
+    def _name_match(self, server_entry: dict) -> bool:
+        if not self._name_filter:
+            return True
+        return self._name_filter.matches(server_entry.get("name", ""))
+
+    def _track_server(self, server_entry: dict):
+        """Track a server before processing it."""
+        self.server_tracking.track(server_entry)
+
+    def _set_server_outcome(
+        self, server_entry: dict, skipped: bool, reason: str | None = None
+    ):
+        """Update the tracking of a processed server."""
+        self.server_tracking.set_outcome(server_entry, skipped, reason)
+        metrics.SERVERS.labels(metrics.server_result(skipped, reason)).inc()
+
+    def _fetch_failed(self, server_entry: dict):
+        """Track a server whose detail could not be fetched."""
+        self.fetch_errors += 1
+        self._set_server_outcome(server_entry, True, "fetch_error")
+
+    @property
+    def imported_count(self) -> int:
+        return self.server_tracking.imported
+
+    @property
+    def updated_count(self) -> int:
+        return self.server_tracking.updated
+
+    def _build_mcp_server(
+        self, server_entry: dict, server_def_name: str, server_data: dict
+    ) -> dict:
+        server_detail, dropped = self.projection.project(server_data)
+        annotations = {
+            "mcp.opendatahub.io/registry": self.mcp_registry_url,
+            SERVER_DETAIL_HASH_ANNOTATION: server_detail_hash(server_detail),
+        }
+        if self.projection.max_field_bytes:
+            # Also set when empty, to clear the fields dropped by earlier imports
+            annotations[DROPPED_FIELDS_ANNOTATION] = ",".join(dropped)
         mcp_server = {
             "apiVersion": f"{MCP_GROUP}/{MCP_VERSION}",
             "kind": MCP_SERVER_KIND,
             "metadata": {
                 "name": server_def_name,
-                "annotations": {
-                    "mcp.opendatahub.io/registry": self.mcp_registry_url,
-                },
+                "annotations": annotations,
                 "labels": {
                     "app.kubernetes.io/name": "mcp-registry-operator",
                     "app.kubernetes.io/managed-by": self.catalog_name,
@@ -164,78 +619,196 @@ class Importer:
                     "mcp.opendatahub.io/server-id": server_entry.get("id"),
                 },
             },
-            "spec": {"server_detail": server_data},
+            "spec": {"server_detail": server_detail},
         }
+        self.projection.record(mcp_server)
+        return mcp_server
+
+    def _skip_existing(self, server_entry: dict, server_def_name: str, namespace: str):
+        logger.info(
+            f"{MCP_SERVER_KIND} '{server_def_name}' already exists in {namespace}. Skipping creation."
+        )
+        self._set_server_outcome(server_entry, True, "already_exists")
+
+    def _skip_missing_name(self, server_entry: dict):
+        logger.warning(f"Server entry missing 'name' field, skipping: {server_entry}")
+        self._set_server_outcome(server_entry, True, "missing_name")
+
+    def _skip_name_conflict(self, server_entry: dict, server_def_name: str) -> bool:
+        """Skip an entry whose name was already used by another entry of this
+        import, so that it does not overwrite the McpServer of the other one."""
+        if not self.server_tracking.name_conflict(server_entry):
+            return False
+        logger.warning(
+            f"{MCP_SERVER_KIND} name '{server_def_name}' is already used by another server of this import. Skipping."
+        )
+        self._set_server_outcome(server_entry, True, "name_conflict")
+        return True
+
+    def _needs_update(
+        self,
+        server_entry: dict,
+        existing: InventoryRecord,
+        mcp_server: dict,
+        namespace: str,
+    ) -> bool:
+        """Tell whether an existing McpServer must be updated, tracking it as
+        skipped otherwise. The McpServer of another server ID is never updated."""
+        server_def_name = mcp_server["metadata"]["name"]
+        if existing.belongs_to_other(server_entry.get("id")):
+            # Same name as the McpServer of another server, never overwritten
+            logger.warning(
+                f"{MCP_SERVER_KIND} '{existing.name}' belongs to server '{existing.server_id}' in {namespace}. Skipping."
+            )
+            self._set_server_outcome(server_entry, True, "name_conflict")
+            return False
+        if not self.update_existing:
+            self._skip_existing(server_entry, server_def_name, namespace)
+            return False
+        detail_hash = mcp_server["metadata"]["annotations"][
+            SERVER_DETAIL_HASH_ANNOTATION
+        ]
+        if existing.detail_hash == detail_hash:
+            logger.info(
+                f"{MCP_SERVER_KIND} '{existing.name}' is unchanged in {namespace}. Skipping update."
+            )
+            self._set_server_outcome(server_entry, True, "unchanged")
+            return False
+        return True
+
+    def _server_name(self, server_entry: dict) -> str | None:
+        """McpServer name of an entry to import, None when it is skipped."""
+        server_def_name = self.names.name(server_entry.get("name"))
+        if not server_def_name:
+            self._skip_missing_name(server_entry)
+            return None
+        if self._skip_name_conflict(server_entry, server_def_name):
+            return None
+        return server_def_name
 
-        # print(yaml.dump(mcp_server_definition, sort_keys=False))
+    def _import_server_entry(self, server_entry, server_data: dict | None = None):
+        id = server_entry.get("id")
+        server_def_name = self._server_name(server_entry)
+        if server_def_name is None:
+            return
+
+        if server_data is None:
+            server_data = self._fetch_server_detail(id)
+            if server_data is None:
+                self._fetch_failed(server_entry)
+                return
+
+        logger.info(f"Processing server: {server_def_name} (ID: {id})")
 
+        mcp_server = self._build_mcp_server(server_entry, server_def_name, server_data)
+
+        request = None
         try:
-            namespace = self.namespace or get_current_namespace()
-            try:
-                existing_resource = self.crd_api.get_namespaced_custom_object(
-                    group=MCP_GROUP,
-                    version=MCP_VERSION,
-                    name=server_def_name,
-                    namespace=namespace,
-                    plural=MCP_SERVER_PLURALS,
-                )
-                if existing_resource:
-                    logger.info(
-                        f"{MCP_SERVER_KIND} '{server_def_name}' already exists in {namespace}. Skipping creation."
-                    )
-                    # Update tracking to mark as skipped
-                    for server in self.server_tracking:
-                        if server["mcpserver_name"] == server_def_name:
-                            server["skipped"] = True
-                            server["reason"] = "already_exists"
-                            break
-                    return
-            except client.ApiException as e:
-                if e.status == 404:
-                    pass
-                else:
-                    raise
+            namespace = self.namespace or self.cluster.namespace
+            request = self._write_request(server_entry, mcp_server, namespace)
+            if request is None:
+                return
+            _, method, params = request
+            with self.timings.measure("write"):
+                getattr(self.crd_api, method)(**params)
+        except Exception as e:
+            self._record_write(server_entry, mcp_server, request, e)
+        else:
+            self._record_write(server_entry, mcp_server, request)
 
-            if self.dry_run:
+    def _write_request(
+        self, server_entry: dict, mcp_server: dict, namespace: str
+    ) -> tuple[InventoryRecord | None, str, dict] | None:
+        """
+        Existing McpServer of an imported server, and method of the custom
+        objects API and arguments creating or updating it. None when there is
+        nothing to write, its outcome then being tracked.
+        """
+        server_def_name = mcp_server["metadata"]["name"]
+        with self.timings.measure("existence_check"):
+            existing = self._catalog_inventory(namespace).lookup(
+                server_def_name, server_entry.get("id")
+            )
+        if existing is not None and not self._needs_update(
+            server_entry, existing, mcp_server, namespace
+        ):
+            return None
+
+        if self.dry_run:
+            logger.info(
+                f"Dry run mode enabled. Would have {'updated' if existing else 'created'} McpServerDefinition: {server_def_name}"
+            )
+            return None
+
+        if existing is not None:
+            return (
+                existing,
+                "patch_namespaced_custom_object",
+                patch_params(namespace, existing, mcp_server),
+            )
+        return (
+            None,
+            "create_namespaced_custom_object",
+            create_params(namespace, mcp_server),
+        )
+
+    def _record_write(
+        self,
+        server_entry: dict,
+        mcp_server: dict,
+        request: tuple[InventoryRecord | None, str, dict] | None,
+        error: Exception | None = None,
+    ):
+        """Record the outcome of the write of an imported server, or of the
+        error raised before or by it."""
+        server_def_name = mcp_server["metadata"]["name"]
+        existing = request[0] if request else None
+        if error is None:
+            if existing is not None:
+                existing.detail_hash = mcp_server["metadata"]["annotations"][
+                    SERVER_DETAIL_HASH_ANNOTATION
+                ]
+                logger.info(
+                    f"Successfully updated McpServerDefinition: {existing.name}"
+                )
+                self._set_server_outcome(server_entry, False, "updated")
+            else:
+                self.inventory.add(mcp_server)
                 logger.info(
-                    f"Dry run mode enabled. Would have created McpServerDefinition: {server_def_name}"
+                    f"Successfully created McpServerDefinition: {server_def_name}"
+                )
+                self._set_server_outcome(server_entry, False)
+        elif isinstance(error, self.api_exceptions):
+            if request is not None and existing is None and error.status == 409:
+                # Created by another catalog, so not in the inventory
+                self._skip_existing(
+                    server_entry, server_def_name, request[2]["namespace"]
                 )
                 return
-
-            self.crd_api.create_namespaced_custom_object(
-                group=MCP_GROUP,
-                version=MCP_VERSION,
-                namespace=namespace,
-                plural=MCP_SERVER_PLURALS,
-                body=mcp_server,
+            logger.error(
+                f"Error creating McpServerDefinition '{server_def_name}': {error}"
             )
-            logger.info(f"Successfully created McpServerDefinition: {server_def_name}")
-            # Update tracking to mark as successfully imported
-            for server in self.server_tracking:
-                if server["mcpserver_name"] == server_def_name:
-                    server["skipped"] = False
-                    server["reason"] = None
-                    self.imported_count += 1
-                    break
-        except client.ApiException as e:
-            logger.error(f"Error creating McpServerDefinition '{server_def_name}': {e}")
-            # Update tracking to mark as failed
-            for server in self.server_tracking:
-                if server["mcpserver_name"] == server_def_name:
-                    server["skipped"] = True
-                    server["reason"] = "api_error"
-                    break
-        except Exception as e:
-            logger.error(f"An unexpected error occurred for '{server_def_name}': {e}")
-            # Update tracking to mark as failed
-            for server in self.server_tracking:
-                if server["mcpserver_name"] == server_def_name:
-                    server["skipped"] = True
-                    server["reason"] = "unexpected_error"
-                    break
+            self._set_server_outcome(server_entry, True, "api_error")
+        else:
+            logger.error(
+                f"An unexpected error occurred for '{server_def_name}': {error}"
+            )
+            self._set_server_outcome(server_entry, True, "unexpected_error")
+
+    def _can_record_high_water_mark(self) -> bool:
+        """The high-water mark can be used by later incremental imports only if
+        every entry up to it was walked and imported without errors."""
+        if self.high_water_mark is None or self.dry_run:
+            return False
+        if self.import_status != "completed" or not self.walk_complete:
+            return False
+        if self.fetch_errors:
+            return False
+        return not self.server_tracking.errors
 
     def generate_configmap(self):
         """Generate and create a ConfigMap with execution details."""
+        report_started = time.perf_counter()
         end_time = datetime.now()
         duration_sec = (end_time - self.start_time).total_seconds()
 
@@ -248,27 +821,34 @@ class Importer:
             "duration_sec": duration_sec,
             "max_servers": self.max_servers,
             "name_filter": self.name_filter or None,
+            "name_exclude": self.name_exclude or None,
+            "registry_search": self.search,
+            "updated_since": self.updated_since,
+            "high_water_mark": format_timestamp(self.high_water_mark)
+            if self.high_water_mark
+            else None,
             "status": self.import_status,
             "error": self.error_message,
             "imported_count": self.imported_count,
-            "imported_servers": [],
+            "updated_count": self.updated_count,
+            "fetch_errors": self.fetch_errors,
+            "name_collisions": self.names.collisions,
+            "object_sizes": self.projection.as_dict(),
+            "prune": self.pruner.stats if self.pruner else None,
+            "page_sizes": self.page_sizer.sizes,
+            "throttling": self.throttle.stats() if self.throttle else None,
+            "http_cache": self.registry_client.cache.stats()
+            if self.registry_client.cache
+            else None,
+            "imported_servers": self.server_tracking.as_list(),
         }
-
-        # Add server tracking information
-        for server in self.server_tracking:
-            execution_data["imported_servers"].append(
-                {
-                    "id": server["id"],
-                    "name": server["mcpserver_name"],
-                    "skipped": server["skipped"],
-                    "reason": server["reason"],
-                }
-            )
-
-        # Generate YAML
-        execution_yaml = yaml.dump(
-            execution_data, default_flow_style=False, sort_keys=False
-        )
+        if self.shard_count > 1:
+            # The mark is recorded by the merged summary, once all shards are done
+            execution_data["shard"] = {
+                "index": self.shard_index,
+                "count": self.shard_count,
+                "recordable": self._can_record_high_water_mark(),
+            }
 
         # Generate random ConfigMap name
         configmap_name = f"mcp-import-{uuid.uuid4().hex[:8]}"
@@ -279,7 +859,7 @@ class Importer:
             "kind": "ConfigMap",
             "metadata": {
                 "name": configmap_name,
-                "namespace": self.namespace or get_current_namespace(),
+                "namespace": self.namespace or self.cluster.namespace,
                 "labels": {
                     "app.kubernetes.io/name": "mcp-registry-operator",
                     "app.kubernetes.io/managed-by": self.catalog_name,
@@ -290,8 +870,24 @@ class Importer:
                     "mcp.opendatahub.io/registry": self.mcp_registry_url,
                 },
             },
-            "data": {"execution.yaml": execution_yaml},
         }
+        if self.shard_count > 1:
+            configmap["metadata"]["labels"][SHARD_LABEL] = str(self.shard_index)
+        elif self._can_record_high_water_mark():
+            configmap["metadata"]["annotations"].update(
+                {
+                    HIGH_WATER_MARK_ANNOTATION: execution_data["high_water_mark"],
+                    NAME_FILTER_ANNOTATION: self._name_filter.key,
+                }
+            )
+
+        # Generate the report, the timings last so that they include it
+        execution_yaml, configmaps = build_report(
+            configmap, execution_data, self.report_format
+        )
+        self.timings.record("report", time.perf_counter() - report_started)
+        execution_yaml += dump_yaml({"timings": self.timings.as_dict()})
+        configmaps[-1]["data"][SUMMARY_KEY] = execution_yaml
 
         try:
             if self.dry_run:
@@ -299,29 +895,33 @@ class Importer:
                 logger.info("🔍 DRY RUN - CONFIGMAP GENERATION")
                 logger.info("=" * 80)
                 logger.info(f"Would create ConfigMap: {configmap_name}")
+                if len(configmaps) > 1:
+                    logger.info(
+                        f"Would store the servers in {len(configmaps)} ConfigMaps"
+                    )
                 logger.info(f"Execution YAML:\n{execution_yaml}")
                 logger.info("=" * 80)
                 return configmap_name
 
             # Create the ConfigMap
-            core_v1_api = client.CoreV1Api()
-            namespace = self.namespace or get_current_namespace()
+            core_v1_api = self.cluster.core_v1
+            namespace = self.namespace or self.cluster.namespace
 
-            core_v1_api.create_namespaced_config_map(
-                namespace=namespace, body=configmap
-            )
+            # The execution ConfigMap last, once the rest of its report exists
+            for body in configmaps:
+                core_v1_api.create_namespaced_config_map(namespace=namespace, body=body)
 
             logger.info("=" * 80)
             logger.info("📋 CONFIGMAP GENERATION COMPLETE")
             logger.info("=" * 80)
             logger.info(f"✅ ConfigMap created: {configmap_name}")
+            if len(configmaps) > 1:
+                logger.info(f"🗜️  Servers stored in {len(configmaps)} ConfigMaps")
             logger.info(f"📊 Total servers processed: {len(self.server_tracking)}")
-            logger.info(
-                f"✅ Successfully imported: {len([s for s in self.server_tracking if not s['skipped']])}"
-            )
-            logger.info(
-                f"⏭️  Skipped: {len([s for s in self.server_tracking if s['skipped']])}"
-            )
+            logger.info(f"✅ Successfully imported: {self.server_tracking.imported}")
+            if self.update_existing:
+                logger.info(f"🔄 Updated: {self.server_tracking.updated}")
+            logger.info(f"⏭️  Skipped: {self.server_tracking.skipped}")
             logger.info(f"⏱️  Duration: {duration_sec:.2f} seconds")
             logger.info("=" * 80)
 
@@ -341,12 +941,12 @@ def main():
         handlers=[logging.StreamHandler(sys.stdout)],
     )
 
-    crd_api = get_k8s_client()
     catalog_name = os.getenv("CATALOG_NAME", "")
     if not catalog_name:
         raise ValueError("Environment variable 'CATALOG_NAME' is not set.")
     registry_url = os.getenv("REGISTRY_URL", "")
-    if not registry_url:
+    registry_snapshot = os.getenv("REGISTRY_SNAPSHOT", "")
+    if not registry_url and not registry_snapshot:
         raise ValueError("Environment variable 'REGISTRY_URL' is not set.")
     importjob_name = os.getenv("IMPORT_JOB_NAME", "")
     if not importjob_name:
@@ -354,34 +954,164 @@ def main():
 
     # Get optional environment variables
     name_filter = os.getenv("NAME_FILTER", "")
+    name_exclude = os.getenv("NAME_EXCLUDE", "")
+    filter_key = NameFilter(name_filter, name_exclude).key
+    registry_search = os.getenv("REGISTRY_SEARCH", "false").lower() == "true"
     max_servers = int(os.getenv("MAX_SERVERS", "10"))
     namespace = os.getenv("NAMESPACE", "")
     dry_run = os.getenv("DRY_RUN", "false").lower() == "true"
+    fetch_concurrency = int(os.getenv("FETCH_CONCURRENCY", "10"))
+    prefetch_pages = os.getenv("PREFETCH_PAGES", "true").lower() == "true"
+    update_existing = os.getenv("UPDATE_EXISTING", "false").lower() == "true"
+    stream_parse = os.getenv("STREAM_PARSE", "false").lower() == "true"
+    page_sizer = PageSizer.from_env()
+    timings = PhaseTimings.from_env()
+    shard_index, shard_count = shard_from_env()
+    import_engine = os.getenv("IMPORT_ENGINE", "sync").lower()
+    if registry_snapshot:
+        # Imported lazily, like the async engine, for the live imports
+        from importer.snapshot import SnapshotClient
+
+        registry_client = SnapshotClient(registry_snapshot)
+        # Identifies the snapshot in the annotations, unless it mirrors a registry
+        registry_url = registry_url or registry_client.base_url
+        if import_engine == "async":
+            logger.warning("⚠️  Snapshots are imported by the sync engine")
+            import_engine = "sync"
+    else:
+        registry_client = RegistryClient.from_env(registry_url)
+    write_concurrency = int(os.getenv("WRITE_CONCURRENCY", "10"))
+    report_format = os.getenv("REPORT_FORMAT", "auto").lower()
+    projection = DetailProjection.from_env()
+    pruner = None
+    if os.getenv("PRUNE", "false").lower() == "true":
+        pruner = Pruner.from_env()
+    # The sync engine writes one McpServer at a time, and only prunes in parallel
+    throttle = Throttle.from_env(
+        max_concurrency=write_concurrency
+        if import_engine == "async"
+        else (pruner.concurrency if pruner else 1)
+    )
     level = os.getenv("LOG_LEVEL", "INFO")
     logger.setLevel(level)
-    importer = Importer(
-        crd_api,
-        catalog_name,
-        importjob_name,
-        registry_url,
-        name_filter=name_filter,
-        max_servers=max_servers,
-        namespace=namespace,
-        dry_run=dry_run,
-    )
+    metrics.INFO.labels(catalog_name, importjob_name, registry_url).set(1)
+    metrics.start_server_from_env()
+
+    # The sync clients are also used by the async engine for the ConfigMaps
+    cluster = cluster_context().load()
+    crd_api = cluster.custom_objects
+    updated_since = None
+    if os.getenv("INCREMENTAL", "false").lower() == "true":
+        updated_since = load_high_water_mark(
+            cluster.core_v1,
+            namespace or cluster.namespace,
+            catalog_name,
+            registry_url,
+            filter_key,
+        )
+        logger.info(f"Incremental import of the servers updated since: {updated_since}")
+    checkpoint_store = None
+    if os.getenv("CHECKPOINT", "false").lower() == "true":
+        checkpoint_store = CheckpointStore(
+            cluster.core_v1,
+            namespace or cluster.namespace,
+            catalog_name,
+            importjob_name,
+            interval=float(os.getenv("CHECKPOINT_INTERVAL", "30")),
+            shard_index=shard_index if shard_count > 1 else None,
+        )
+        # Let an evicted pod save its last checkpoint before exiting
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+    if import_engine == "async":
+        if checkpoint_store is not None:
+            logger.warning("⚠️  Checkpoints are not supported by the async engine")
+        # Imported lazily so that the sync engine does not load the async clients
+        from importer.async_importer import AsyncImporter
+
+        importer = AsyncImporter(
+            None,
+            catalog_name,
+            importjob_name,
+            registry_url,
+            name_filter=name_filter,
+            name_exclude=name_exclude,
+            registry_search=registry_search,
+            max_servers=max_servers,
+            namespace=namespace,
+            dry_run=dry_run,
+            fetch_concurrency=fetch_concurrency,
+            registry_client=registry_client,
+            updated_since=updated_since,
+            update_existing=update_existing,
+            page_sizer=page_sizer,
+            timings=timings,
+            shard_index=shard_index,
+            shard_count=shard_count,
+            throttle=throttle,
+            cluster=cluster,
+            report_format=report_format,
+            projection=projection,
+            pruner=pruner,
+            write_concurrency=write_concurrency,
+        )
+    elif import_engine == "sync":
+        importer = Importer(
+            crd_api,
+            catalog_name,
+            importjob_name,
+            registry_url,
+            name_filter=name_filter,
+            name_exclude=name_exclude,
+            registry_search=registry_search,
+            max_servers=max_servers,
+            namespace=namespace,
+            dry_run=dry_run,
+            fetch_concurrency=fetch_concurrency,
+            registry_client=registry_client,
+            prefetch_pages=prefetch_pages,
+            updated_since=updated_since,
+            update_existing=update_existing,
+            stream_parse=stream_parse,
+            page_sizer=page_sizer,
+            timings=timings,
+            checkpoint_store=checkpoint_store,
+            shard_index=shard_index,
+            shard_count=shard_count,
+            throttle=throttle,
+            cluster=cluster,
+            report_format=report_format,
+            projection=projection,
+            pruner=pruner,
+        )
+        checkpoint = checkpoint_store.load() if checkpoint_store else None
+        if checkpoint is not None and (
+            checkpoint.registry_uri,
+            checkpoint.name_filter,
+        ) == (
+            registry_url,
+            filter_key,
+        ):
+            importer.resume(checkpoint)
+        elif checkpoint is not None:
+            logger.warning("⚠️  Ignoring the checkpoint of another configuration")
+    else:
+        raise ValueError(
+            f"Invalid IMPORT_ENGINE '{import_engine}', expected 'sync' or 'async'."
+        )
 
     try:
-        while importer.has_next:
-            try:
-                importer.import_next()
-            except Exception as e:
-                importer.import_status = "failed"
-                importer.error_message = str(e)
-                raise Exception(f"Error during import: {e}")
+        try:
+            importer.run()
+        except Exception as e:
+            importer.import_status = "failed"
+            importer.error_message = str(e)
+            raise Exception(f"Error during import: {e}")
 
         # Set success status only if no errors occurred
         if importer.import_status == "running":
             importer.import_status = "completed"
+            if importer.checkpoint_store is not None and not dry_run:
+                importer.checkpoint_store.delete()
 
         # Generate ConfigMap at the end
         configmap_name = importer.generate_configmap()
@@ -405,6 +1135,14 @@ def main():
         except Exception as cm_error:
             logger.error(f"❌ Failed to create ConfigMap: {cm_error}")
         raise
+    finally:
+        # Releases the connections, or the file of a snapshot
+        registry_client.close()
+        metrics.export_from_env(
+            catalog_name,
+            importjob_name,
+            (datetime.now() - importer.start_time).total_seconds(),
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,76 @@
+import logging
+from datetime import datetime, timezone
+
+from importer.inventory import catalog_label_selector
+
+logger = logging.getLogger("importer")
+
+# Annotation of the execution ConfigMap storing the high-water mark of the run
+HIGH_WATER_MARK_ANNOTATION = "mcp.opendatahub.io/high-water-mark"
+REGISTRY_ANNOTATION = "mcp.opendatahub.io/registry"
+NAME_FILTER_ANNOTATION = "mcp.opendatahub.io/name-filter"
+
+OFFICIAL_META_KEY = "io.modelcontextprotocol.registry/official"
+
+
+def parse_timestamp(value) -> datetime | None:
+    """Parse an RFC 3339 timestamp, assuming UTC when no offset is given."""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        timestamp = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp
+
+
+def entry_updated_at(server_entry: dict) -> datetime | None:
+    """
+    Last update time of a registry server entry, looked up in the official
+    registry metadata, the top level `updated_at` field or the release date of
+    the version, in this order.
+    """
+    official_meta = (server_entry.get("_meta") or {}).get(OFFICIAL_META_KEY) or {}
+    for value in (
+        official_meta.get("updated_at"),
+        server_entry.get("updated_at"),
+        (server_entry.get("version_detail") or {}).get("release_date"),
+    ):
+        timestamp = parse_timestamp(value)
+        if timestamp is not None:
+            return timestamp
+    return None
+
+
+def format_timestamp(timestamp: datetime) -> str:
+    return timestamp.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def load_high_water_mark(
+    core_v1_api,
+    namespace: str,
+    catalog_name: str,
+    registry_url: str,
+    name_filter: str = "",
+) -> str | None:
+    """
+    Return the latest high-water mark recorded by the execution ConfigMaps of
+    the catalog for the given registry and name filter, or None if no complete
+    import ran yet.
+    """
+    configmaps = core_v1_api.list_namespaced_config_map(
+        namespace=namespace, label_selector=catalog_label_selector(catalog_name)
+    )
+    latest = None
+    for configmap in configmaps.items:
+        annotations = configmap.metadata.annotations or {}
+        if annotations.get(REGISTRY_ANNOTATION) != registry_url:
+            continue
+        if annotations.get(NAME_FILTER_ANNOTATION, "") != name_filter:
+            continue
+        mark = parse_timestamp(annotations.get(HIGH_WATER_MARK_ANNOTATION))
+        if mark is not None and (latest is None or mark > latest):
+            latest = mark
+    return format_timestamp(latest) if latest else None
@@ -0,0 +1,174 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+
+from importer.defaults import (
+    MCP_CATALOG_LABEL,
+    MCP_GROUP,
+    MCP_SERVER_ID_LABEL,
+    MCP_SERVER_PLURALS,
+    MCP_VERSION,
+    ORPHANED_ANNOTATION,
+    SERVER_DETAIL_HASH_ANNOTATION,
+)
+
+# Number of McpServer resources requested per list call
+LIST_PAGE_SIZE = 500
+
+
+def catalog_label_selector(catalog_name: str) -> str:
+    return f"{MCP_CATALOG_LABEL}={catalog_name}"
+
+
+def server_detail_hash(server_detail: dict) -> str:
+    """Stable hash of a server detail, independent of the order of its keys."""
+    canonical = json.dumps(server_detail, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def json_patch_path(key: str) -> str:
+    """Escape a key as a JSON Pointer token (RFC 6901)."""
+    return key.replace("~", "~0").replace("/", "~1")
+
+
+@dataclass
+class InventoryRecord:
+    name: str
+    server_id: str | None
+    detail_hash: str | None
+    has_annotations: bool
+    orphaned_since: str | None = None
+
+    def belongs_to_other(self, server_id: str | None) -> bool:
+        """Tell whether the McpServer is labeled with another registry server."""
+        return bool(self.server_id) and self.server_id != server_id
+
+
+@dataclass
+class McpServerInventory:
+    """
+    In-memory index of the McpServer resources of a catalog, by name and by
+    registry server-id, used to decide whether a server must be created or
+    updated.
+    """
+
+    by_name: dict[str, InventoryRecord] = field(default_factory=dict)
+    by_server_id: dict[str, InventoryRecord] = field(default_factory=dict)
+
+    @property
+    def names(self):
+        return self.by_name.keys()
+
+    @property
+    def server_ids(self):
+        return self.by_server_id.keys()
+
+    def add(self, mcp_server: dict):
+        metadata = mcp_server.get("metadata", {})
+        annotations = metadata.get("annotations") or {}
+        record = InventoryRecord(
+            name=metadata.get("name"),
+            server_id=(metadata.get("labels") or {}).get(MCP_SERVER_ID_LABEL),
+            detail_hash=annotations.get(SERVER_DETAIL_HASH_ANNOTATION),
+            has_annotations=bool(annotations),
+            orphaned_since=annotations.get(ORPHANED_ANNOTATION),
+        )
+        self.by_name[record.name] = record
+        if record.server_id:
+            self.by_server_id[record.server_id] = record
+
+    def add_page(self, response: dict) -> str | None:
+        """Add the items of a list response and return its continue token."""
+        for mcp_server in response.get("items", []):
+            self.add(mcp_server)
+        return response.get("metadata", {}).get("continue") or None
+
+    def lookup(self, name: str, server_id: str | None = None) -> InventoryRecord | None:
+        record = self.by_name.get(name)
+        if record is None and server_id:
+            record = self.by_server_id.get(server_id)
+        return record
+
+    def contains(self, name: str, server_id: str | None = None) -> bool:
+        return self.lookup(name, server_id) is not None
+
+    def __len__(self) -> int:
+        return len(self.by_name)
+
+
+def update_patch(record: InventoryRecord, mcp_server: dict) -> list:
+    """
+    JSON patch replacing the server detail of an existing McpServer as a whole
+    and setting the annotations of the imported one, without touching the
+    other annotations of the resource.
+    """
+    annotations = mcp_server["metadata"]["annotations"]
+    if record.has_annotations:
+        patch = [
+            {
+                "op": "add",
+                "path": f"/metadata/annotations/{json_patch_path(key)}",
+                "value": value,
+            }
+            for key, value in annotations.items()
+        ]
+    else:
+        patch = [{"op": "add", "path": "/metadata/annotations", "value": annotations}]
+    patch.append(
+        {
+            "op": "add",
+            "path": "/spec/server_detail",
+            "value": mcp_server["spec"]["server_detail"],
+        }
+    )
+    return patch
+
+
+def patch_params(namespace: str, record: InventoryRecord, mcp_server: dict) -> dict:
+    """Arguments of patch_namespaced_custom_object updating a McpServer."""
+    return {
+        "group": MCP_GROUP,
+        "version": MCP_VERSION,
+        "namespace": namespace,
+        "plural": MCP_SERVER_PLURALS,
+        "name": record.name,
+        "body": update_patch(record, mcp_server),
+        "_content_type": "application/json-patch+json",
+    }
+
+
+def create_params(namespace: str, mcp_server: dict) -> dict:
+    """Arguments of create_namespaced_custom_object creating a McpServer."""
+    return {
+        "group": MCP_GROUP,
+        "version": MCP_VERSION,
+        "namespace": namespace,
+        "plural": MCP_SERVER_PLURALS,
+        "body": mcp_server,
+    }
+
+
+def list_params(namespace: str, catalog_name: str, _continue: str | None) -> dict:
+    """Arguments of list_namespaced_custom_object for a page of the catalog."""
+    return {
+        "group": MCP_GROUP,
+        "version": MCP_VERSION,
+        "namespace": namespace,
+        "plural": MCP_SERVER_PLURALS,
+        "label_selector": catalog_label_selector(catalog_name),
+        "limit": LIST_PAGE_SIZE,
+        "_continue": _continue,
+    }
+
+
+def load_inventory(crd_api, namespace: str, catalog_name: str) -> McpServerInventory:
+    """List, page by page, the McpServer resources labeled with the catalog."""
+    inventory = McpServerInventory()
+    _continue = None
+    while True:
+        response = crd_api.list_namespaced_custom_object(
+            **list_params(namespace, catalog_name, _continue)
+        )
+        _continue = inventory.add_page(response)
+        if not _continue:
+            return inventory
@@ -0,0 +1,133 @@
+import contextlib
+import logging
+import os
+import time
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    push_to_gateway,
+    start_http_server,
+    write_to_textfile,
+)
+
+logger = logging.getLogger("importer")
+
+# Registry of the importer metrics, kept apart from the default one so that
+# only the import is exported
+REGISTRY = CollectorRegistry()
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+INFO = Gauge(
+    "mcp_importer_info",
+    "Import run, always 1",
+    ["catalog", "import_job", "registry"],
+    registry=REGISTRY,
+)
+PAGES = Counter(
+    "mcp_importer_pages_total",
+    "Registry pages received",
+    registry=REGISTRY,
+)
+DETAIL_FETCHES = Counter(
+    "mcp_importer_detail_fetches_total",
+    "Server detail fetches, by result",
+    ["result"],
+    registry=REGISTRY,
+)
+SERVERS = Counter(
+    "mcp_importer_servers_total",
+    "Processed servers, by result: created, updated or the skip reason",
+    ["result"],
+    registry=REGISTRY,
+)
+REGISTRY_LATENCY = Histogram(
+    "mcp_importer_registry_request_seconds",
+    "Latency of the registry GET requests, by kind of resource",
+    ["kind"],
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+REGISTRY_IN_FLIGHT = Gauge(
+    "mcp_importer_registry_requests_in_flight",
+    "Registry GET requests in flight",
+    registry=REGISTRY,
+)
+KUBE_LATENCY = Histogram(
+    "mcp_importer_kube_request_seconds",
+    "Latency of the Kubernetes API calls, by operation",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+KUBE_IN_FLIGHT = Gauge(
+    "mcp_importer_kube_requests_in_flight",
+    "Kubernetes API calls in flight",
+    registry=REGISTRY,
+)
+DURATION = Gauge(
+    "mcp_importer_duration_seconds",
+    "Duration of the import",
+    registry=REGISTRY,
+)
+
+
+def request_kind(path: str) -> str:
+    """Kind of registry resource requested by a GET of the given path."""
+    return "page" if path.startswith("servers?") else "detail"
+
+
+def server_result(skipped: bool, reason: str | None) -> str:
+    if reason:
+        return reason
+    return "skipped" if skipped else "created"
+
+
+@contextlib.contextmanager
+def kube_call(operation: str):
+    """Measure a Kubernetes API call."""
+    started = time.perf_counter()
+    with KUBE_IN_FLIGHT.track_inprogress():
+        try:
+            yield
+        finally:
+            KUBE_LATENCY.labels(operation).observe(time.perf_counter() - started)
+
+
+def start_server_from_env():
+    """Expose the metrics over HTTP on METRICS_PORT while the import runs."""
+    port = int(os.getenv("METRICS_PORT", "0"))
+    if port > 0:
+        start_http_server(port, registry=REGISTRY)
+        logger.info(f"📈 Metrics exposed on port {port}")
+
+
+def export_from_env(catalog_name: str, import_job_name: str, duration_sec: float):
+    """
+    Write the metrics of the import to the METRICS_TEXTFILE text exposition
+    file and push them to the PUSHGATEWAY_URL Pushgateway, when set. Failures
+    are logged and do not fail the import.
+    """
+    DURATION.set(duration_sec)
+    textfile = os.getenv("METRICS_TEXTFILE", "")
+    if textfile:
+        try:
+            write_to_textfile(textfile, REGISTRY)
+            logger.info(f"📈 Metrics written to {textfile}")
+        except OSError as e:
+            logger.warning(f"⚠️  Failed to write metrics to {textfile}: {e}")
+    gateway = os.getenv("PUSHGATEWAY_URL", "")
+    if gateway:
+        try:
+            push_to_gateway(
+                gateway,
+                job="mcpserver-importer",
+                registry=REGISTRY,
+                grouping_key={"catalog": catalog_name, "import_job": import_job_name},
+            )
+            logger.info(f"📈 Metrics pushed to {gateway}")
+        except OSError as e:
+            logger.warning(f"⚠️  Failed to push metrics to {gateway}: {e}")
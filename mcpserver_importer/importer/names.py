@@ -0,0 +1,71 @@
+import logging
+import threading
+
+from importer.defaults import MCP_SERVER_KIND
+from importer.inventory import McpServerInventory
+from importer.utils import sanitize_k8s_name
+
+logger = logging.getLogger("importer")
+
+
+class NameSanitizer:
+    """
+    McpServer names of the registry entries of an import, sanitized once per
+    registry name.
+
+    A registry name gets the hash suffix of its own registry name, so that
+    every registry server gets its own McpServer, when its sanitized name is
+    already used by another server: by the McpServer of another server ID in
+    the `inventory` of the catalog, when set, or else by another registry name
+    seen earlier in the import.
+    """
+
+    def __init__(self, inventory: McpServerInventory | None = None):
+        self.inventory = inventory
+        self._names: dict[str, str] = {}
+        # McpServer name -> registry name it was given to
+        self._owners: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.collisions = 0
+
+    def name(self, registry_name: str | None, server_id: str | None = None) -> str:
+        """McpServer name of a registry name, empty for a missing one."""
+        if not registry_name:
+            return ""
+        name = self._names.get(registry_name)
+        if name is not None:
+            return name
+        with self._lock:
+            name = self._names.get(registry_name)
+            if name is None:
+                name = self._assign(registry_name, server_id)
+                self._names[registry_name] = name
+            return name
+
+    def _assign(self, registry_name: str, server_id: str | None) -> str:
+        name = sanitize_k8s_name(registry_name)
+        owner = self._owners.get(name)
+        if owner is None:
+            existing = self.inventory.by_name.get(name) if self.inventory else None
+            if existing is None or not existing.belongs_to_other(server_id):
+                self._owners[name] = registry_name
+                return name
+            other = f"the {MCP_SERVER_KIND} of server ID {existing.server_id}"
+        elif owner == registry_name:
+            return name
+        else:
+            other = f"server '{owner}'"
+        suffixed = sanitize_k8s_name(registry_name, add_hash_suffix=True)
+        self._owners.setdefault(suffixed, registry_name)
+        self.collisions += 1
+        logger.warning(
+            f"Server '{registry_name}' has the same {name!r} name as {other}, using {suffixed!r}"
+        )
+        return suffixed
+
+    def sanitize_page(self, server_entries: list) -> list[str]:
+        """McpServer names of the entries of a page, in order."""
+        return [
+            self.name(server_entry.get("name"), server_entry.get("id"))
+            for server_entry in server_entries
+        ]
@@ -0,0 +1,71 @@
+import logging
+import os
+
+logger = logging.getLogger("importer")
+
+
+class PageSizer:
+    """
+    Chooses the `limit` of the registry page requests.
+
+    The size is halved after a page slower than `target_latency` or larger than
+    `max_bytes`, and doubled after a full page answered in less than half of both,
+    always within `min_size` and `max_size`. A request never asks for more
+    entries than the remaining budget given by the caller.
+    """
+
+    def __init__(
+        self,
+        initial: int = 100,
+        min_size: int = 10,
+        max_size: int = 100,
+        target_latency: float = 2.0,
+        max_bytes: int = 4 * 1024 * 1024,
+    ):
+        self.min_size = max(1, min_size)
+        self.max_size = max(self.min_size, max_size)
+        self.size = min(max(initial, self.min_size), self.max_size)
+        self.target_latency = target_latency
+        self.max_bytes = max_bytes
+        # Limits of the pages requested so far, for the execution summary
+        self.sizes: list[int] = []
+
+    @classmethod
+    def from_env(cls) -> "PageSizer":
+        return cls(
+            initial=int(os.getenv("PAGE_SIZE", "100")),
+            min_size=int(os.getenv("PAGE_SIZE_MIN", "10")),
+            max_size=int(os.getenv("PAGE_SIZE_MAX", "100")),
+            target_latency=float(os.getenv("PAGE_TARGET_LATENCY", "2")),
+            max_bytes=int(os.getenv("PAGE_MAX_KB", "4096")) * 1024,
+        )
+
+    def next_limit(self, budget: int | None = None) -> int:
+        """Limit of the next page request, capped to the remaining budget of
+        entries when known."""
+        limit = self.size
+        if budget is not None:
+            limit = max(1, min(limit, budget))
+        self.sizes.append(limit)
+        return limit
+
+    def record(
+        self, limit: int, entries: int, elapsed: float, size_bytes: int | None = None
+    ) -> None:
+        """Adapt the page size to the latency and payload of a received page."""
+        too_large = size_bytes is not None and size_bytes > self.max_bytes
+        if elapsed > self.target_latency or too_large:
+            size = max(self.min_size, self.size // 2)
+        elif (
+            entries >= limit >= self.size
+            and elapsed < self.target_latency / 2
+            and (size_bytes is None or size_bytes < self.max_bytes / 2)
+        ):
+            size = min(self.max_size, self.size * 2)
+        else:
+            return
+        if size != self.size:
+            logger.debug(
+                f"Page size {self.size} -> {size} after {entries} entries in {elapsed:.2f}s"
+            )
+            self.size = size
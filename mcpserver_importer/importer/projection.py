@@ -0,0 +1,93 @@
+import json
+import logging
+import os
+from collections import Counter
+
+from importer.timing import percentile
+
+logger = logging.getLogger("importer")
+
+_encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+
+def json_size(value) -> int:
+    """Size of a value in compact JSON, as stored by the API server."""
+    return len(_encoder.encode(value).encode("utf-8"))
+
+
+class DetailProjection:
+    """
+    Fields of the registry server details stored in the McpServer resources,
+    and sizes of the resources built with them.
+
+    Only the top-level `fields` of a server detail are kept, all of them when
+    empty. A kept field larger than `max_field_kb` once serialized is dropped
+    and listed in the annotation of the resource instead, when set.
+    """
+
+    def __init__(self, fields: tuple[str, ...] = (), max_field_kb: int = 0):
+        self.fields = tuple(fields)
+        self.max_field_bytes = max(0, max_field_kb) * 1024
+        # Sizes of the McpServer resources built so far, in bytes
+        self.sizes: list[int] = []
+        self.detail_bytes = 0
+        self.projected_bytes = 0
+        self.dropped: Counter = Counter()
+
+    @classmethod
+    def from_env(cls) -> "DetailProjection":
+        fields = os.getenv("SERVER_DETAIL_FIELDS", "")
+        return cls(
+            fields=tuple(field.strip() for field in fields.split(",") if field.strip()),
+            max_field_kb=int(os.getenv("SERVER_DETAIL_MAX_FIELD_KB", "0")),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.fields or self.max_field_bytes)
+
+    def project(self, server_detail: dict) -> tuple[dict, list[str]]:
+        """Projected server detail, and the fields dropped for their size."""
+        if not self.enabled:
+            return server_detail, []
+        self.detail_bytes += json_size(server_detail)
+        if self.fields:
+            detail = {
+                key: server_detail[key] for key in self.fields if key in server_detail
+            }
+        else:
+            detail = dict(server_detail)
+        dropped = []
+        if self.max_field_bytes:
+            dropped = [
+                key
+                for key, value in detail.items()
+                if json_size(value) > self.max_field_bytes
+            ]
+            for key in dropped:
+                del detail[key]
+            self.dropped.update(dropped)
+        self.projected_bytes += json_size(detail)
+        return detail, dropped
+
+    def record(self, mcp_server: dict) -> None:
+        """Record the size of a built McpServer resource."""
+        self.sizes.append(json_size(mcp_server))
+
+    def as_dict(self) -> dict:
+        """Sizes of the built resources for the execution summary, in KiB."""
+        sizes = sorted(self.sizes)
+        summary = {
+            "count": len(sizes),
+            "total_kb": round(sum(sizes) / 1024, 1),
+            "p50_kb": round(percentile(sizes, 0.5) / 1024, 1),
+            "p95_kb": round(percentile(sizes, 0.95) / 1024, 1),
+            "max_kb": round(sizes[-1] / 1024, 1) if sizes else 0.0,
+        }
+        if self.enabled:
+            summary["server_detail_fields"] = list(self.fields) or None
+            summary["server_detail_saved_kb"] = round(
+                (self.detail_bytes - self.projected_bytes) / 1024, 1
+            )
+            summary["dropped_fields"] = dict(self.dropped)
+        return summary
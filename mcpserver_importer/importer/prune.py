@@ -0,0 +1,208 @@
+import logging
+import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from importer.defaults import (
+    MCP_GROUP,
+    MCP_SERVER_KIND,
+    MCP_SERVER_PLURALS,
+    MCP_VERSION,
+    ORPHANED_ANNOTATION,
+)
+from importer.incremental import format_timestamp
+from importer.inventory import InventoryRecord, McpServerInventory
+
+logger = logging.getLogger("importer")
+
+# Actions on the McpServers of the catalog no longer listed by the registry
+PRUNE_ACTIONS = ("delete", "flag")
+
+
+def is_not_found(error: Exception) -> bool:
+    return getattr(error, "status", None) == 404
+
+
+class Pruner:
+    """
+    Full sync of a catalog: the McpServers labeled with the catalog whose
+    server ID was not seen during a complete walk of the registry are deleted,
+    or flagged with the orphaned annotation, at most `concurrency` at a time.
+
+    Nothing is pruned when the orphans are more than `max_fraction` of the
+    McpServers of the catalog, which is more likely a registry outage or a
+    misconfiguration than servers removed upstream.
+    """
+
+    def __init__(
+        self, action: str = "delete", max_fraction: float = 0.1, concurrency: int = 10
+    ):
+        if action not in PRUNE_ACTIONS:
+            raise ValueError(
+                f"Invalid PRUNE_ACTION '{action}', expected 'delete' or 'flag'."
+            )
+        self.action = action
+        self.max_fraction = max_fraction
+        self.concurrency = max(1, concurrency)
+        # Server IDs listed by the registry during the walk
+        self.seen: set[str] = set()
+        self.stats = {
+            "action": action,
+            "candidates": 0,
+            "orphans": 0,
+            "pruned": 0,
+            "restored": 0,
+            "errors": 0,
+            "skipped": None,
+        }
+
+    @classmethod
+    def from_env(cls) -> "Pruner":
+        return cls(
+            action=os.getenv("PRUNE_ACTION", "delete").lower(),
+            max_fraction=float(os.getenv("PRUNE_MAX_FRACTION", "0.1")),
+            concurrency=int(os.getenv("PRUNE_CONCURRENCY", "10")),
+        )
+
+    def see(self, server_entry: dict):
+        if server_entry.get("id"):
+            self.seen.add(server_entry["id"])
+
+    def skip(self, reason: str):
+        """Record why the McpServers were not pruned."""
+        self.stats["skipped"] = reason
+        logger.warning(f"⚠️  Not pruning the orphaned {MCP_SERVER_KIND}s: {reason}")
+
+    def plan(
+        self, inventory: McpServerInventory, owns: Callable[[str], bool]
+    ) -> list[tuple[InventoryRecord, bool]]:
+        """
+        McpServers to prune, and flagged McpServers to restore because their
+        server is listed again, as (record, restore) pairs. Only the McpServers
+        whose server ID `owns` tells is handled by this import are considered.
+        """
+        candidates = [
+            record
+            for record in inventory.by_name.values()
+            if record.server_id and owns(record.server_id)
+        ]
+        orphans = [record for record in candidates if record.server_id not in self.seen]
+        self.stats["candidates"] = len(candidates)
+        self.stats["orphans"] = len(orphans)
+        if len(orphans) > self.max_fraction * len(candidates):
+            self.skip(
+                f"{len(orphans)} of {len(candidates)} are orphaned, more than PRUNE_MAX_FRACTION={self.max_fraction}"
+            )
+            return []
+        if self.action == "flag":
+            orphans = [record for record in orphans if not record.orphaned_since]
+        restored = [
+            record
+            for record in candidates
+            if record.orphaned_since and record.server_id in self.seen
+        ]
+        return [(record, False) for record in orphans] + [
+            (record, True) for record in restored
+        ]
+
+    def request(self, namespace: str, record: InventoryRecord, restore: bool):
+        """Method of the custom objects API and arguments pruning or restoring
+        a McpServer."""
+        params = {
+            "group": MCP_GROUP,
+            "version": MCP_VERSION,
+            "namespace": namespace,
+            "plural": MCP_SERVER_PLURALS,
+            "name": record.name,
+        }
+        if self.action == "delete" and not restore:
+            return "delete_namespaced_custom_object", params
+        orphaned_since = (
+            None if restore else format_timestamp(datetime.now(timezone.utc))
+        )
+        return "patch_namespaced_custom_object", {
+            **params,
+            "body": {
+                "metadata": {"annotations": {ORPHANED_ANNOTATION: orphaned_since}}
+            },
+            "_content_type": "application/merge-patch+json",
+        }
+
+    def record(self, record: InventoryRecord, restore: bool, error: Exception | None):
+        """Record the outcome of a prune or restore call."""
+        verb = "restore" if restore else self.action
+        if error is not None and not is_not_found(error):
+            logger.error(f"Failed to {verb} {MCP_SERVER_KIND} '{record.name}': {error}")
+            self.stats["errors"] += 1
+            return
+        if restore:
+            logger.info(f"♻️  Restored {MCP_SERVER_KIND} '{record.name}'")
+            self.stats["restored"] += 1
+        else:
+            logger.info(
+                f"🧹 {'Deleted' if self.action == 'delete' else 'Flagged'} orphaned {MCP_SERVER_KIND} '{record.name}'"
+            )
+            self.stats["pruned"] += 1
+
+    def _dry_run(self, plan: list[tuple[InventoryRecord, bool]]):
+        for record, restore in plan:
+            verb = "restore" if restore else self.action
+            logger.info(
+                f"Dry run mode enabled. Would {verb} {MCP_SERVER_KIND}: {record.name}"
+            )
+
+    def prune(
+        self,
+        crd_api,
+        namespace: str,
+        inventory: McpServerInventory,
+        owns: Callable[[str], bool],
+        dry_run: bool = False,
+    ):
+        plan = self.plan(inventory, owns)
+        if dry_run:
+            self._dry_run(plan)
+            return
+
+        def call(step):
+            method, params = self.request(namespace, *step)
+            try:
+                getattr(crd_api, method)(**params)
+            except Exception as e:
+                return e
+            return None
+
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="prune"
+        ) as executor:
+            for step, error in zip(plan, executor.map(call, plan)):
+                self.record(*step, error)
+
+    async def prune_async(
+        self,
+        crd_api,
+        namespace: str,
+        inventory: McpServerInventory,
+        owns: Callable[[str], bool],
+        dry_run: bool = False,
+    ):
+        # Imported lazily so that the sync engine does not load asyncio
+        import asyncio
+
+        plan = self.plan(inventory, owns)
+        if dry_run:
+            self._dry_run(plan)
+            return
+        limit = asyncio.Semaphore(self.concurrency)
+
+        async def call(step):
+            method, params = self.request(namespace, *step)
+            async with limit:
+                await getattr(crd_api, method)(**params)
+
+        errors = await asyncio.gather(
+            *(call(step) for step in plan), return_exceptions=True
+        )
+        for step, error in zip(plan, errors):
+            self.record(*step, error)
@@ -0,0 +1,298 @@
+import email.utils
+import json
+import logging
+import os
+import random
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from importer import metrics
+from importer.http_cache import HttpCache
+
+logger = logging.getLogger("importer")
+
+# Transient statuses that are worth retrying
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header, given either in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(
+    attempt: int,
+    retry_after: float | None = None,
+    base: float = 0.5,
+    max_delay: float = 30.0,
+) -> float:
+    """
+    Delay before retrying a request for the given attempt (starting from 0).
+    The Retry-After delay is used when the server provides it, otherwise an
+    exponential backoff with full jitter. Both are capped to max_delay.
+    """
+    if retry_after is not None:
+        return min(retry_after, max_delay)
+    return random.uniform(0, min(max_delay, base * 2**attempt))
+
+
+def revalidated_body(cache: HttpCache, entry, response) -> bytes | None:
+    """Cached body of a server detail revalidated by a 304 response, None when
+    the response has a body of its own or the cached one was evicted since the
+    lookup."""
+    if response.status_code != 304 or entry is None:
+        return None
+    return cache.read(entry)
+
+
+def cache_response(cache: HttpCache, url: str, response):
+    """Cache the body of a server detail response when it has validators."""
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        cache.store(url, response.content, etag, last_modified)
+
+
+class StreamedPage:
+    """
+    Registry page whose server entries are parsed from the response body while
+    they are iterated, so that only one entry is held in memory at a time
+    instead of the whole page.
+    """
+
+    def __init__(self, response: requests.Response):
+        self.response = response
+        self.has_servers = False
+        self.next_cursor = None
+        # Let urllib3 decompress the body read by the parser
+        response.raw.decode_content = True
+
+    def servers(self):
+        """Yield the entries of the `servers` list, recording the page metadata
+        found along the way. Raises ijson.JSONError on invalid JSON."""
+        # Only used with STREAM_PARSE, kept out of the start-up imports
+        import ijson
+
+        builder = None
+        for prefix, event, value in ijson.parse(self.response.raw, use_float=True):
+            if prefix == "servers.item" or prefix.startswith("servers.item."):
+                if builder is None:
+                    if event not in ("start_map", "start_array"):
+                        yield value
+                        continue
+                    builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+                if prefix == "servers.item" and event in ("end_map", "end_array"):
+                    yield builder.value
+                    builder = None
+            elif prefix == "servers" and event == "start_array":
+                self.has_servers = True
+            elif prefix == "metadata.next_cursor":
+                self.next_cursor = value
+
+    def close(self):
+        self.response.close()
+
+
+class RegistryClient:
+    """
+    Client of the MCP Registry API sharing a pool of keep-alive connections
+    across all the requests, and retrying the connection errors and transient
+    HTTP statuses with a jittered exponential backoff.
+
+    When a `cache` is given, the server details are revalidated with conditional
+    requests and a 304 response reuses the cached body.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        pool_size: int = 10,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        cache: HttpCache | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.pool_size = max(1, pool_size)
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.cache = cache
+        # Size of the body of the last page returned by list_servers
+        self.last_page_bytes = 0
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size, pool_maxsize=self.pool_size
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @classmethod
+    def from_env(cls, base_url: str) -> "RegistryClient":
+        cache_dir = os.getenv("HTTP_CACHE_DIR", "")
+        cache = None
+        if cache_dir:
+            max_bytes = int(os.getenv("HTTP_CACHE_MAX_MB", "256")) * 1024 * 1024
+            cache = HttpCache(cache_dir, max_bytes)
+        return cls(
+            base_url,
+            pool_size=int(os.getenv("REGISTRY_POOL_SIZE", "10")),
+            connect_timeout=float(os.getenv("REGISTRY_CONNECT_TIMEOUT", "5")),
+            read_timeout=float(os.getenv("REGISTRY_READ_TIMEOUT", "30")),
+            max_retries=int(os.getenv("REGISTRY_MAX_RETRIES", "3")),
+            backoff_base=float(os.getenv("REGISTRY_BACKOFF_BASE", "0.5")),
+            backoff_max=float(os.getenv("REGISTRY_BACKOFF_MAX", "30")),
+            cache=cache,
+        )
+
+    def page_path(
+        self,
+        cursor: str | None = None,
+        limit: int = 100,
+        updated_since: str | None = None,
+        search: str | None = None,
+    ) -> str:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        if updated_since:
+            params["updated_since"] = updated_since
+        if search:
+            params["search"] = search
+        return f"servers?{urlencode(params)}"
+
+    def retry_delay(
+        self,
+        url: str,
+        attempt: int,
+        status: int | None = None,
+        retry_after: str | None = None,
+        error: Exception | None = None,
+    ) -> float | None:
+        """
+        Delay before retrying a request that failed with a transport `error`
+        or got a response with the given `status`, None when it must not be
+        retried: the status is not transient or the retries are exhausted.
+        """
+        if error is None and status not in RETRY_STATUSES:
+            return None
+        if attempt >= self.max_retries:
+            return None
+        delay = backoff_delay(
+            attempt,
+            parse_retry_after(retry_after) if error is None else None,
+            base=self.backoff_base,
+            max_delay=self.backoff_max,
+        )
+        reason = f"error: {error}" if error is not None else f"HTTP {status}"
+        logger.warning(f"Retrying {url} in {delay:.2f}s after {reason}")
+        return delay
+
+    def get(
+        self, path: str, headers: dict | None = None, stream: bool = False
+    ) -> requests.Response:
+        """
+        GET the given path of the registry, retrying transient failures.
+        Raises a requests.exceptions.RequestException when the retries are
+        exhausted or the response has a non-retryable error status. With
+        `stream`, the body is left unread for the caller to consume.
+        """
+        url = f"{self.base_url}/{path}"
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                with metrics.REGISTRY_IN_FLIGHT.track_inprogress():
+                    response = self.session.get(
+                        url,
+                        headers=headers,
+                        timeout=(self.connect_timeout, self.read_timeout),
+                        stream=stream,
+                    )
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as e:
+                delay = self.retry_delay(url, attempt, error=e)
+                if delay is None:
+                    raise
+            else:
+                metrics.REGISTRY_LATENCY.labels(metrics.request_kind(path)).observe(
+                    time.perf_counter() - started
+                )
+                delay = self.retry_delay(
+                    url,
+                    attempt,
+                    response.status_code,
+                    response.headers.get("Retry-After"),
+                )
+                if delay is None:
+                    response.raise_for_status()
+                    return response
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def list_servers(
+        self,
+        cursor: str | None = None,
+        limit: int = 100,
+        updated_since: str | None = None,
+        search: str | None = None,
+    ) -> dict:
+        response = self.get(self.page_path(cursor, limit, updated_since, search))
+        self.last_page_bytes = len(response.content)
+        return response.json()
+
+    def stream_servers(
+        self,
+        cursor: str | None = None,
+        limit: int = 100,
+        updated_since: str | None = None,
+        search: str | None = None,
+    ) -> StreamedPage:
+        return StreamedPage(
+            self.get(self.page_path(cursor, limit, updated_since, search), stream=True)
+        )
+
+    def get_server(self, id) -> dict:
+        path = f"servers/{id}"
+        if self.cache is None:
+            return self.get(path).json()
+
+        url = f"{self.base_url}/{path}"
+        entry = self.cache.lookup(url)
+        response = self.get(path, headers=entry.request_headers() if entry else None)
+        body = revalidated_body(self.cache, entry, response)
+        if body is not None:
+            return json.loads(body)
+        if response.status_code == 304:
+            # Evicted since the lookup, fetch it again unconditionally
+            response = self.get(path)
+        cache_response(self.cache, url, response)
+        return response.json()
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,176 @@
+import base64
+import gzip
+import json
+import math
+
+import yaml
+
+# Formats of the execution report: "yaml" keeps the servers inline in
+# execution.yaml, "compact" moves them to gzip-compressed JSON lines and
+# "auto" does so only when they do not fit in the ConfigMap
+REPORT_FORMATS = ("auto", "yaml", "compact")
+# Key of the summary, inline in the execution ConfigMap
+SUMMARY_KEY = "execution.yaml"
+# binaryData key of the gzip-compressed JSON lines of the servers
+SERVERS_KEY = "servers.jsonl.gz"
+# Size of the data of an execution ConfigMap, below the 1 MiB limit of the
+# Kubernetes objects to leave room for the metadata
+CONFIGMAP_BUDGET = 900 * 1024
+# Base64 size of the servers of a compact report per ConfigMap, leaving room
+# for the summary in the execution ConfigMap
+PART_BUDGET = 768 * 1024
+# Label of the ConfigMaps holding the rest of the servers of a compact
+# report: the name of its execution ConfigMap
+REPORT_PART_LABEL = "mcp.opendatahub.io/report-part-of"
+
+# C emitters of libyaml when available
+_Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+
+def dump_yaml(data: dict) -> str:
+    return yaml.dump(data, Dumper=_Dumper, default_flow_style=False, sort_keys=False)
+
+
+def load_yaml(text: str):
+    return yaml.load(text, Loader=_Loader)
+
+
+def check_report_format(report_format: str) -> str:
+    if report_format not in REPORT_FORMATS:
+        raise ValueError(
+            f"Invalid REPORT_FORMAT '{report_format}', expected one of {', '.join(REPORT_FORMATS)}."
+        )
+    return report_format
+
+
+def _encoded_size(payload: bytes) -> int:
+    return 4 * math.ceil(len(payload) / 3)
+
+
+def pack_servers(servers: list[dict], budget: int = PART_BUDGET) -> list[bytes]:
+    """
+    Gzip-compressed JSON lines of the servers, split in as few parts as needed
+    for each part to fit in `budget` once base64-encoded.
+    """
+    lines = [_encoder.encode(server).encode("utf-8") for server in servers]
+    parts = 1
+    while True:
+        size = max(1, math.ceil(len(lines) / parts))
+        payloads = [
+            gzip.compress(b"\n".join(lines[i : i + size]), mtime=0)
+            for i in range(0, len(lines), size)
+        ] or [gzip.compress(b"", mtime=0)]
+        largest = max(_encoded_size(payload) for payload in payloads)
+        if largest <= budget or size == 1:
+            return payloads
+        parts = max(parts + 1, math.ceil(parts * largest / budget))
+
+
+def unpack_servers(payloads: list[str | None]) -> list[dict]:
+    """Servers of the base64 binaryData payloads of a compact report."""
+    servers = []
+    for payload in payloads:
+        if payload:
+            data = gzip.decompress(base64.b64decode(payload))
+            servers.extend(json.loads(line) for line in data.splitlines() if line)
+    return servers
+
+
+def server_counts(servers: list[dict]) -> dict:
+    """Counts of the servers of a report, by outcome and skip reason."""
+    reasons = {}
+    for server in servers:
+        if server.get("reason"):
+            reasons[server["reason"]] = reasons.get(server["reason"], 0) + 1
+    return {
+        "total": len(servers),
+        "skipped": sum(1 for server in servers if server.get("skipped")),
+        "reasons": reasons,
+    }
+
+
+def build_report(
+    configmap: dict, summary: dict, report_format: str = "auto"
+) -> tuple[str, list[dict]]:
+    """
+    Execution YAML of a summary and ConfigMaps of its report.
+
+    `configmap` is the execution ConfigMap without data. The summary is
+    written inline, as before, unless the format is compact or the servers do
+    not fit in the ConfigMap. Its servers are then stored as binaryData, in
+    the execution ConfigMap and, when they are too large for one, in extra
+    ConfigMaps created before it. The execution ConfigMap is the last one.
+    """
+    report_format = check_report_format(report_format)
+    # Block YAML is larger than compact JSON, no need to dump servers that
+    # cannot fit
+    if report_format == "yaml" or (
+        report_format == "auto"
+        and len(_encoder.encode(summary.get("imported_servers") or []))
+        <= CONFIGMAP_BUDGET
+    ):
+        execution_yaml = dump_yaml(summary)
+        if report_format == "yaml" or len(execution_yaml) <= CONFIGMAP_BUDGET:
+            return execution_yaml, [
+                {**configmap, "data": {SUMMARY_KEY: execution_yaml}}
+            ]
+
+    summary = dict(summary)
+    servers = summary.pop("imported_servers", None) or []
+    payloads = [
+        base64.b64encode(payload).decode("ascii")
+        for payload in pack_servers(servers, PART_BUDGET)
+    ]
+    name = configmap["metadata"]["name"]
+    part_names = [name] + [f"{name}-{i}" for i in range(1, len(payloads))]
+    summary["servers"] = server_counts(servers)
+    summary["report"] = {
+        "format": "compact",
+        "key": SERVERS_KEY,
+        "configmaps": part_names,
+    }
+    execution_yaml = dump_yaml(summary)
+
+    metadata = configmap["metadata"]
+    configmaps = []
+    for part_name, payload in zip(part_names[1:], payloads[1:]):
+        configmaps.append(
+            {
+                "apiVersion": "v1",
+                "kind": "ConfigMap",
+                "metadata": {
+                    "name": part_name,
+                    "namespace": metadata.get("namespace"),
+                    "labels": {**metadata.get("labels", {}), REPORT_PART_LABEL: name},
+                },
+                "binaryData": {SERVERS_KEY: payload},
+            }
+        )
+    configmaps.append(
+        {
+            **configmap,
+            "data": {SUMMARY_KEY: execution_yaml},
+            "binaryData": {SERVERS_KEY: payloads[0]},
+        }
+    )
+    return execution_yaml, configmaps
+
+
+def read_servers(core_v1_api, namespace: str, summary: dict, configmap) -> list:
+    """
+    Servers of the summary of an execution ConfigMap, inline or in the
+    binaryData of its compact report.
+    """
+    report = summary.get("report")
+    if not report:
+        return summary.get("imported_servers") or []
+    key = report.get("key", SERVERS_KEY)
+    payloads = [(configmap.binary_data or {}).get(key)]
+    for part_name in report.get("configmaps", [])[1:]:
+        part = core_v1_api.read_namespaced_config_map(
+            name=part_name, namespace=namespace
+        )
+        payloads.append((part.binary_data or {}).get(key))
+    return unpack_servers(payloads)
@@ -0,0 +1,218 @@
+import argparse
+import hashlib
+import logging
+import os
+import sys
+import uuid
+
+from importer.cluster import cluster_context
+from importer.defaults import MCP_CATALOG_LABEL, MCP_IMPORT_JOB_LABEL
+from importer.filters import NameFilter
+from importer.incremental import (
+    HIGH_WATER_MARK_ANNOTATION,
+    NAME_FILTER_ANNOTATION,
+    REGISTRY_ANNOTATION,
+    format_timestamp,
+    parse_timestamp,
+)
+from importer.report import (
+    REPORT_FORMATS,
+    SUMMARY_KEY,
+    build_report,
+    load_yaml,
+    read_servers,
+)
+
+logger = logging.getLogger("importer")
+
+# Label of the execution ConfigMaps of a sharded import: the shard index, or
+# "merged" for the summary combining all the shards
+SHARD_LABEL = "mcp.opendatahub.io/shard"
+MERGED_SHARD = "merged"
+
+
+def shard_of(key: str, shard_count: int) -> int:
+    """Stable shard of a registry entry, from the hash of its server ID."""
+    digest = hashlib.sha256(key.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shard_count
+
+
+def shard_from_env() -> tuple[int, int]:
+    """
+    Read the shard of the current pod from SHARD_INDEX and SHARD_COUNT. The
+    index defaults to the JOB_COMPLETION_INDEX set in the pods of Indexed Jobs.
+    """
+    shard_count = int(os.getenv("SHARD_COUNT", "1"))
+    shard_index = int(
+        os.getenv("SHARD_INDEX", "") or os.getenv("JOB_COMPLETION_INDEX", "") or "0"
+    )
+    if shard_count < 1 or not 0 <= shard_index < shard_count:
+        raise ValueError(
+            f"Invalid shard {shard_index} of {shard_count}, expected 0 <= SHARD_INDEX < SHARD_COUNT."
+        )
+    return shard_index, shard_count
+
+
+def merge_summaries(summaries: list[dict], shard_count: int) -> dict:
+    """
+    Combine the execution summaries of the shards of an import. The merged
+    import is completed only if every shard completed, and its high-water mark
+    is the earliest mark of the shards, recorded only if all of them could.
+    """
+    # A retried shard has several summaries, keep its latest completed one
+    by_index = {
+        summary["shard"]["index"]: summary
+        for summary in sorted(
+            summaries,
+            key=lambda s: (s.get("status") == "completed", s.get("timestamp") or ""),
+        )
+    }
+    missing = [index for index in range(shard_count) if index not in by_index]
+    shards = [by_index[index] for index in sorted(by_index)]
+    failed = [s["shard"]["index"] for s in shards if s.get("status") != "completed"]
+
+    error = None
+    if missing:
+        error = f"Missing shards: {missing}"
+    elif failed:
+        error = f"Failed shards: {failed}"
+    marks = [parse_timestamp(s.get("high_water_mark")) for s in shards]
+    recordable = not error and all(s["shard"].get("recordable") for s in shards)
+    high_water_mark = None
+    if recordable and marks and all(mark is not None for mark in marks):
+        high_water_mark = format_timestamp(min(marks))
+
+    first = shards[0] if shards else {}
+    return {
+        "catalog_name": first.get("catalog_name"),
+        "registry_uri": first.get("registry_uri"),
+        "importjob_name": first.get("importjob_name"),
+        "timestamp": min((s["timestamp"] for s in shards), default=None),
+        "duration_sec": max((s.get("duration_sec", 0) for s in shards), default=0),
+        "max_servers": first.get("max_servers"),
+        "name_filter": first.get("name_filter"),
+        "name_exclude": first.get("name_exclude"),
+        "shard_count": shard_count,
+        "high_water_mark": high_water_mark,
+        "status": "failed" if error else "completed",
+        "error": error,
+        "imported_count": sum(s.get("imported_count", 0) for s in shards),
+        "updated_count": sum(s.get("updated_count", 0) for s in shards),
+        "fetch_errors": sum(s.get("fetch_errors", 0) for s in shards),
+        "name_collisions": sum(s.get("name_collisions", 0) for s in shards),
+        "imported_servers": [
+            server for s in shards for server in s.get("imported_servers") or []
+        ],
+    }
+
+
+def merge_shards(
+    core_v1_api,
+    namespace: str,
+    import_job_name: str,
+    shard_count: int,
+    report_format: str = "auto",
+) -> str:
+    """
+    Read the execution ConfigMaps of the shards of an import job and create
+    the ConfigMap of the merged summary. Returns the name of that ConfigMap.
+    """
+    configmaps = core_v1_api.list_namespaced_config_map(
+        namespace=namespace,
+        label_selector=f"{MCP_IMPORT_JOB_LABEL}={import_job_name},{SHARD_LABEL}",
+    )
+    summaries = []
+    for configmap in configmaps.items:
+        if (configmap.metadata.labels or {}).get(SHARD_LABEL) == MERGED_SHARD:
+            continue
+        summary = load_yaml((configmap.data or {}).get(SUMMARY_KEY, ""))
+        if summary and "shard" in summary:
+            summary["imported_servers"] = read_servers(
+                core_v1_api, namespace, summary, configmap
+            )
+            summaries.append(summary)
+
+    merged = merge_summaries(summaries, shard_count)
+    configmap_name = f"mcp-import-{uuid.uuid4().hex[:8]}"
+    annotations = {REGISTRY_ANNOTATION: merged["registry_uri"]}
+    if merged["high_water_mark"]:
+        annotations[HIGH_WATER_MARK_ANNOTATION] = merged["high_water_mark"]
+        annotations[NAME_FILTER_ANNOTATION] = NameFilter(
+            merged["name_filter"] or "", merged["name_exclude"] or ""
+        ).key
+    _, bodies = build_report(
+        {
+            "apiVersion": "v1",
+            "kind": "ConfigMap",
+            "metadata": {
+                "name": configmap_name,
+                "namespace": namespace,
+                "labels": {
+                    "app.kubernetes.io/name": "mcp-registry-operator",
+                    "app.kubernetes.io/managed-by": merged["catalog_name"],
+                    MCP_IMPORT_JOB_LABEL: import_job_name,
+                    MCP_CATALOG_LABEL: merged["catalog_name"],
+                    SHARD_LABEL: MERGED_SHARD,
+                },
+                "annotations": annotations,
+            },
+        },
+        merged,
+        report_format,
+    )
+    for body in bodies:
+        core_v1_api.create_namespaced_config_map(namespace=namespace, body=body)
+    logger.info(
+        f"📋 Merged {len(summaries)}/{shard_count} shards into ConfigMap {configmap_name}: {merged['status']}"
+    )
+    return configmap_name
+
+
+def main():
+    """Merge the execution summaries of the shards of an import job."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[logging.StreamHandler(sys.stdout)],
+    )
+    parser = argparse.ArgumentParser(
+        description="Merge the execution summaries of a sharded import."
+    )
+    parser.add_argument(
+        "--import-job",
+        default=os.getenv("IMPORT_JOB_NAME", ""),
+        help="Import job name (IMPORT_JOB_NAME)",
+    )
+    parser.add_argument(
+        "--shard-count",
+        type=int,
+        default=int(os.getenv("SHARD_COUNT", "1")),
+        help="Number of shards (SHARD_COUNT)",
+    )
+    parser.add_argument(
+        "--namespace",
+        default=os.getenv("NAMESPACE", ""),
+        help="Namespace of the ConfigMaps (NAMESPACE, default: current namespace)",
+    )
+    parser.add_argument(
+        "--report-format",
+        default=os.getenv("REPORT_FORMAT", "auto").lower(),
+        choices=REPORT_FORMATS,
+        help="Format of the merged report (REPORT_FORMAT, default: auto)",
+    )
+    args = parser.parse_args()
+    if not args.import_job:
+        parser.error("the import job name is required")
+
+    cluster = cluster_context().load()
+    merge_shards(
+        cluster.core_v1,
+        args.namespace or cluster.namespace,
+        args.import_job,
+        args.shard_count,
+        args.report_format,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+import json
+import logging
+import mmap
+import threading
+from collections import deque
+from pathlib import Path
+
+import requests
+
+logger = logging.getLogger("importer")
+
+# Suffixes of the snapshots holding one server per line, the others are JSON
+# documents
+JSON_LINES_SUFFIXES = (".ndjson", ".jsonl")
+# Pages whose server details are kept for get_server: the page being imported
+# and the prefetched one, with one spare
+KEPT_PAGES = 3
+
+
+class SnapshotError(requests.exceptions.RequestException):
+    """Invalid registry snapshot, or server missing from it, handled by the
+    importer like a failed registry request."""
+
+
+class SnapshotPage:
+    """Page of a snapshot, parsed while it is iterated like a StreamedPage."""
+
+    def __init__(self, client: "SnapshotClient", cursor: str | None, limit: int):
+        self.client = client
+        self.cursor = cursor
+        self.limit = limit
+        self.has_servers = True
+        self.next_cursor = None
+
+    def servers(self):
+        yield from self.client._read_page(self)
+
+    def close(self):
+        pass
+
+
+class SnapshotClient:
+    """
+    Registry client reading the servers from a local snapshot file instead of
+    the MCP Registry API, for air-gapped clusters.
+
+    The snapshot holds the detail of each server, as returned by
+    `/servers/{id}`, which also serves as its list entry: one per line in a
+    `.ndjson` or `.jsonl` file, or in the `servers` list of a JSON document
+    shaped like a registry page, or in a bare JSON list. The file is
+    memory-mapped and parsed entry by entry as the pages are requested; a
+    cursor is the index of the first entry of a page. The details of the last
+    pages read are kept for `get_server`, so that each entry is parsed once.
+    """
+
+    # No HTTP cache in front of a local file
+    cache = None
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.base_url = self.path.resolve().as_uri()
+        self.json_lines = self.path.suffix.lower() in JSON_LINES_SUFFIXES
+        # No transfer to adapt the page size to
+        self.last_page_bytes = 0
+        self._mmap = None
+        # The map keeps its own handle of the file, closed by close
+        with open(self.path, "rb") as file:
+            if self.path.stat().st_size:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        # Entries of the snapshot, from the one at index _position
+        self._entries = None
+        self._position = 0
+        self._peeked = None
+        self._read_lock = threading.Lock()
+        self._details: dict[str, dict] = {}
+        self._pages: deque[list[str]] = deque()
+        self._details_lock = threading.Lock()
+
+    def _read_entries(self):
+        """Yield the server entries of the snapshot, in order."""
+        if self._mmap is None:
+            return
+        if self.json_lines:
+            yield from self._read_json_lines()
+        else:
+            yield from self._read_json_document()
+
+    def _read_json_lines(self):
+        data = self._mmap
+        position = 0
+        while position < len(data):
+            end = data.find(b"\n", position)
+            if end < 0:
+                end = len(data)
+            line = data[position:end]
+            position = end + 1
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    raise SnapshotError(f"Invalid line in {self.path}: {e}") from e
+
+    def _read_json_document(self):
+        # Only used with JSON snapshots, kept out of the start-up imports
+        import ijson
+
+        data = self._mmap
+        prefix = "item" if data[:1024].lstrip()[:1] == b"[" else "servers.item"
+        data.seek(0)
+        try:
+            yield from ijson.items(data, prefix, use_float=True)
+        except ijson.JSONError as e:
+            raise SnapshotError(f"Invalid JSON in {self.path}: {e}") from e
+
+    def _next_entry(self):
+        """Next entry of the snapshot, None at its end."""
+        with self._read_lock:
+            if self._peeked is not None:
+                entry, self._peeked = self._peeked, None
+            else:
+                entry = next(self._entries, None)
+            if entry is not None:
+                self._position += 1
+            return entry
+
+    def _seek(self, index: int):
+        """Move the reader to the entry of the given index, reading the
+        snapshot from its start when going backwards."""
+        with self._read_lock:
+            if self._entries is None or index < self._position:
+                self._entries = self._read_entries()
+                self._position = 0
+                self._peeked = None
+        while self._position < index and self._next_entry() is not None:
+            pass
+
+    def _read_page(self, page: SnapshotPage):
+        """Yield the entries of a page, setting its next cursor at the end."""
+        self._seek(int(page.cursor or 0))
+        ids = []
+        with self._details_lock:
+            self._pages.append(ids)
+            if len(self._pages) > KEPT_PAGES:
+                for id in self._pages.popleft():
+                    self._details.pop(id, None)
+        for _ in range(page.limit):
+            entry = self._next_entry()
+            if entry is None:
+                return
+            if isinstance(entry, dict) and entry.get("id"):
+                with self._details_lock:
+                    ids.append(entry["id"])
+                    self._details[entry["id"]] = entry
+            yield entry
+        with self._read_lock:
+            self._peeked = next(self._entries, None)
+            if self._peeked is not None:
+                page.next_cursor = str(self._position)
+
+    def list_servers(
+        self,
+        cursor: str | None = None,
+        limit: int = 100,
+        updated_since: str | None = None,
+        search: str | None = None,
+    ) -> dict:
+        """Page of the snapshot at the given cursor. The updated since time and
+        the name filter are applied by the importer itself."""
+        page = self.stream_servers(cursor, limit)
+        servers = list(page.servers())
+        return {"servers": servers, "metadata": {"next_cursor": page.next_cursor}}
+
+    def stream_servers(
+        self,
+        cursor: str | None = None,
+        limit: int = 100,
+        updated_since: str | None = None,
+        search: str | None = None,
+    ) -> SnapshotPage:
+        return SnapshotPage(self, cursor, limit)
+
+    def get_server(self, id) -> dict:
+        with self._details_lock:
+            detail = self._details.get(id)
+        if detail is None:
+            raise SnapshotError(f"Server {id} is not in the last pages of {self.path}")
+        return detail
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+
+    def __enter__(self) -> "SnapshotClient":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,231 @@
+import logging
+import os
+import threading
+import time
+
+from importer import metrics
+from importer.registry import backoff_delay, parse_retry_after
+
+logger = logging.getLogger("importer")
+
+
+def is_throttled(error: Exception) -> bool:
+    """Tell whether a Kubernetes API error is a 429 Too Many Requests, as
+    returned by API Priority and Fairness."""
+    return getattr(error, "status", None) == 429
+
+
+def retry_after(error: Exception) -> float | None:
+    headers = getattr(error, "headers", None) or {}
+    return parse_retry_after(headers.get("Retry-After"))
+
+
+def operation_name(fn) -> str:
+    return getattr(fn, "__name__", "call")
+
+
+class Throttle:
+    """
+    Client-side limits of the Kubernetes API calls.
+
+    A token bucket allows `qps` calls per second on average with bursts of
+    `burst` calls. The number of calls in flight follows an AIMD limit: it is
+    halved when the API server answers 429 and increased by about one call per
+    round of successful calls, up to `max_concurrency`. Throttled calls are
+    retried after their Retry-After delay, or a jittered exponential backoff,
+    at most `max_retries` times.
+    """
+
+    def __init__(
+        self,
+        qps: float = 20.0,
+        burst: int = 40,
+        max_concurrency: int = 10,
+        min_concurrency: int = 1,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+    ):
+        self.qps = qps
+        self.burst = max(1, burst)
+        self.min_concurrency = max(1, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        self.concurrency = float(self.max_concurrency)
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self._slots = threading.Condition()
+        self._async_slots = None
+
+        self.calls = 0
+        self.throttled = 0
+        self.retries = 0
+        self.wait_sec = 0.0
+
+    @classmethod
+    def from_env(cls, max_concurrency: int = 10) -> "Throttle":
+        return cls(
+            qps=float(os.getenv("KUBE_QPS", "20")),
+            burst=int(os.getenv("KUBE_BURST", "40")),
+            max_concurrency=max_concurrency,
+            max_retries=int(os.getenv("KUBE_MAX_RETRIES", "5")),
+        )
+
+    def reserve(self) -> float:
+        """Take a token and return how long to wait before using it."""
+        if self.qps <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.qps
+            )
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            delay = -self._tokens / self.qps
+            self.wait_sec += delay
+            return delay
+
+    def _has_slot(self) -> bool:
+        return self.in_flight < int(self.concurrency)
+
+    def _on_success(self):
+        self.concurrency = min(
+            self.max_concurrency, self.concurrency + 1 / self.concurrency
+        )
+
+    def _on_throttle(self, error: Exception, attempt: int) -> float:
+        """Record a throttled call and return the delay before retrying it."""
+        self.throttled += 1
+        self.concurrency = max(self.min_concurrency, self.concurrency / 2)
+        delay = backoff_delay(
+            attempt,
+            retry_after(error),
+            base=self.backoff_base,
+            max_delay=self.backoff_max,
+        )
+        logger.warning(
+            f"Kubernetes API throttled, retrying in {delay:.2f}s with at most {int(self.concurrency)} calls in flight"
+        )
+        return delay
+
+    def call(self, fn, *args, **kwargs):
+        """Call a Kubernetes API method within the limits."""
+        attempt = 0
+        while True:
+            delay = self.reserve()
+            if delay:
+                time.sleep(delay)
+            with self._slots:
+                while not self._has_slot():
+                    self._slots.wait()
+                self.in_flight += 1
+            self.calls += 1
+            try:
+                with metrics.kube_call(operation_name(fn)):
+                    result = fn(*args, **kwargs)
+            except Exception as e:
+                if not is_throttled(e) or attempt >= self.max_retries:
+                    raise
+                delay = self._on_throttle(e, attempt)
+            else:
+                self._on_success()
+                return result
+            finally:
+                with self._slots:
+                    self.in_flight -= 1
+                    self._slots.notify_all()
+            time.sleep(delay)
+            attempt += 1
+            self.retries += 1
+
+    async def call_async(self, fn, *args, **kwargs):
+        """Await a Kubernetes API coroutine within the limits."""
+        # Only used by the async engine, kept out of the start-up imports
+        import asyncio
+
+        if self._async_slots is None:
+            self._async_slots = asyncio.Condition()
+        attempt = 0
+        while True:
+            delay = self.reserve()
+            if delay:
+                await asyncio.sleep(delay)
+            async with self._async_slots:
+                await self._async_slots.wait_for(self._has_slot)
+                self.in_flight += 1
+            self.calls += 1
+            try:
+                with metrics.kube_call(operation_name(fn)):
+                    result = await fn(*args, **kwargs)
+            except Exception as e:
+                if not is_throttled(e) or attempt >= self.max_retries:
+                    raise
+                delay = self._on_throttle(e, attempt)
+            else:
+                self._on_success()
+                return result
+            finally:
+                async with self._async_slots:
+                    self.in_flight -= 1
+                    self._async_slots.notify_all()
+            await asyncio.sleep(delay)
+            attempt += 1
+            self.retries += 1
+
+    def wrap(self, api) -> "ThrottledApi":
+        return ThrottledApi(api, self)
+
+    def wrap_async(self, api) -> "AsyncThrottledApi":
+        return AsyncThrottledApi(api, self)
+
+    def stats(self) -> dict:
+        return {
+            "qps": self.qps,
+            "burst": self.burst,
+            "calls": self.calls,
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "wait_sec": round(self.wait_sec, 3),
+            "concurrency": int(self.concurrency),
+        }
+
+
+class ThrottledApi:
+    """Proxy of a Kubernetes API client calling its methods through a Throttle."""
+
+    def __init__(self, api, throttle: Throttle):
+        self._api = api
+        self._throttle = throttle
+
+    def __getattr__(self, name):
+        attr = getattr(self._api, name)
+        if not callable(attr):
+            return attr
+
+        def throttled(*args, **kwargs):
+            return self._throttle.call(attr, *args, **kwargs)
+
+        return throttled
+
+
+class AsyncThrottledApi(ThrottledApi):
+    """Proxy of an asyncio Kubernetes API client awaiting its methods through
+    a Throttle."""
+
+    def __getattr__(self, name):
+        attr = getattr(self._api, name)
+        if not callable(attr):
+            return attr
+
+        async def throttled(*args, **kwargs):
+            return await self._throttle.call_async(attr, *args, **kwargs)
+
+        return throttled
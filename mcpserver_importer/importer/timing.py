@@ -0,0 +1,97 @@
+import contextlib
+import heapq
+import math
+import os
+import threading
+import time
+
+from importer.tracking import record_key
+
+# Phases of the import, in the order they are reported
+PHASES = (
+    "page_fetch",
+    "detail_fetch",
+    "sanitize",
+    "existence_check",
+    "write",
+    "report",
+)
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted samples."""
+    if not samples:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(samples)))
+    return samples[rank - 1]
+
+
+class PhaseTimings:
+    """
+    Durations of the phases of an import and end-to-end durations of the
+    servers, keeping the `slowest` servers. Phases are measured from the
+    worker threads of the sync engine as well as from the event loop of the
+    async one.
+    """
+
+    def __init__(self, slowest: int = 10):
+        self.slowest = max(0, slowest)
+        self._samples: dict[str, list[float]] = {phase: [] for phase in PHASES}
+        # Start time of the servers being processed, by record key
+        self._started: dict[str, float] = {}
+        # Min-heap of the (duration, name) of the slowest servers
+        self._slowest: list[tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "PhaseTimings":
+        return cls(slowest=int(os.getenv("SLOWEST_SERVERS", "10")))
+
+    def record(self, phase: str, elapsed: float):
+        with self._lock:
+            self._samples.setdefault(phase, []).append(elapsed)
+
+    @contextlib.contextmanager
+    def measure(self, phase: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - started)
+
+    def start_server(self, server_entry: dict):
+        """Start the end-to-end time of a server, unless already started."""
+        with self._lock:
+            self._started.setdefault(record_key(server_entry), time.perf_counter())
+
+    def finish_server(self, server_entry: dict):
+        """Stop the end-to-end time of a server and keep it if among the slowest."""
+        with self._lock:
+            started = self._started.pop(record_key(server_entry), None)
+            if started is None or not self.slowest:
+                return
+            item = (time.perf_counter() - started, server_entry.get("name", ""))
+            if len(self._slowest) < self.slowest:
+                heapq.heappush(self._slowest, item)
+            elif item > self._slowest[0]:
+                heapq.heapreplace(self._slowest, item)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            phases = {}
+            for phase, samples in self._samples.items():
+                samples = sorted(samples)
+                phases[phase] = {
+                    "count": len(samples),
+                    "total_sec": round(sum(samples), 4),
+                    "p50_sec": round(percentile(samples, 0.5), 4),
+                    "p95_sec": round(percentile(samples, 0.95), 4),
+                }
+            slowest = sorted(self._slowest, reverse=True)
+        return {
+            "phases": phases,
+            "slowest_servers": [
+                {"name": name, "duration_sec": round(elapsed, 4)}
+                for elapsed, name in slowest
+            ],
+        }
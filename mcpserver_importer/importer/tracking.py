@@ -0,0 +1,126 @@
+import logging
+from collections import Counter
+from collections.abc import Iterator
+
+from importer.names import NameSanitizer
+from importer.utils import sanitize_k8s_name
+
+logger = logging.getLogger("importer")
+
+# Reasons of the servers that could not be written to the cluster
+ERROR_REASONS = ("api_error", "unexpected_error")
+
+
+class ServerRecord:
+    """Outcome of a processed registry entry."""
+
+    __slots__ = ("id", "name", "mcpserver_name", "skipped", "reason", "done")
+
+    def __init__(self, id: str, name: str, mcpserver_name: str):
+        self.id = id
+        self.name = name
+        self.mcpserver_name = mcpserver_name
+        self.skipped = False
+        self.reason = None
+        self.done = False
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.mcpserver_name,
+            "skipped": self.skipped,
+            "reason": self.reason,
+        }
+
+
+def record_key(server_entry: dict) -> str:
+    """Key of a registry entry, its server ID when available."""
+    return server_entry.get("id") or sanitize_k8s_name(server_entry.get("name", ""))
+
+
+class ServerLedger:
+    """
+    Tracking of the servers processed by an import, in processing order.
+
+    Records are indexed by registry server ID, so that two entries whose names
+    sanitize to the same McpServer name keep their own outcome, and the counters
+    of the execution summary are maintained as outcomes are set.
+    """
+
+    def __init__(self, names: NameSanitizer | None = None):
+        self.names = names or NameSanitizer()
+        self._records: dict[str, ServerRecord] = {}
+        # McpServer name -> key of the first entry tracked with it
+        self._owners: dict[str, str] = {}
+        self.reasons: Counter = Counter()
+        self.imported = 0
+        self.updated = 0
+        self.skipped = 0
+
+    def track(self, server_entry: dict) -> ServerRecord:
+        """Track a server before processing it."""
+        key = record_key(server_entry)
+        record = self._records.get(key)
+        if record is not None:
+            return record
+        server_name = server_entry.get("name", "")
+        record = ServerRecord(
+            server_entry.get("id", ""),
+            server_name,
+            self.names.name(server_name, server_entry.get("id")),
+        )
+        self._records[key] = record
+        owner = self._owners.setdefault(record.mcpserver_name, key)
+        if owner != key:
+            logger.warning(
+                f"Server '{server_name}' (ID: {record.id}) has the same {record.mcpserver_name!r} name as server ID {owner}"
+            )
+        return record
+
+    def get(self, server_entry: dict) -> ServerRecord | None:
+        return self._records.get(record_key(server_entry))
+
+    def name_conflict(self, server_entry: dict) -> bool:
+        """Tell whether the name of an entry is already used by another entry
+        of this import."""
+        record = self.get(server_entry)
+        if record is None:
+            return False
+        return self._owners.get(record.mcpserver_name) != record_key(server_entry)
+
+    def set_outcome(
+        self, server_entry: dict, skipped: bool, reason: str | None = None
+    ) -> None:
+        """Record the outcome of a processed server."""
+        record = self.get(server_entry)
+        if record is None:
+            record = self.track(server_entry)
+        if record.done:
+            self._count(record, -1)
+        record.skipped = skipped
+        record.reason = reason
+        record.done = True
+        self._count(record, 1)
+
+    def _count(self, record: ServerRecord, delta: int) -> None:
+        if record.reason == "updated":
+            self.updated += delta
+        elif record.skipped:
+            self.skipped += delta
+        else:
+            self.imported += delta
+        if record.reason:
+            self.reasons[record.reason] += delta
+
+    @property
+    def errors(self) -> int:
+        return sum(self.reasons[reason] for reason in ERROR_REASONS)
+
+    def as_list(self) -> list[dict]:
+        return [record.as_dict() for record in self._records.values()]
+
+    def __iter__(self) -> Iterator[ServerRecord]:
+        return iter(self._records.values())
+
+    def __len__(self) -> int:
+        return len(self._records)
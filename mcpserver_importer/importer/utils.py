@@ -1,19 +1,12 @@
 import hashlib
 import re
 
-from fastapi import HTTPException
-from kubernetes import client, config
-
+from importer.cluster import cluster_context
 from importer.defaults import MCP_GROUP, MCP_REGISTRY_PLURALS, MCP_VERSION
 
 
 def get_k8s_client():
-    try:
-        config.load_incluster_config()
-    except config.ConfigException:
-        config.load_kube_config()
-
-    return client.CustomObjectsApi()
+    return cluster_context().load().custom_objects
 
 
 async def get_registry(crd_api, registry_name: str):
@@ -28,6 +21,9 @@ async def get_registry(crd_api, registry_name: str):
         r for r in resources.get("items", []) if r["metadata"]["name"] == registry_name
     ]
     if not matches:
+        # Only needed by the API, not worth its import time in the importer Job
+        from fastapi import HTTPException
+
         raise HTTPException(
             status_code=404,
             detail=f"Registry '{registry_name}' not found in namespace '{get_current_namespace()}'.",
@@ -36,12 +32,12 @@ async def get_registry(crd_api, registry_name: str):
 
 
 def get_current_namespace():
-    try:
-        with open("/var/run/secrets/kubernetes.io/serviceaccount/namespace", "r") as f:
-            return f.read().strip()
-    except Exception:
-        context = config.list_kube_config_contexts()[1]
-        return context.get("context", {}).get("namespace", "default")
+    return cluster_context().namespace
+
+
+# Runs of separators and of characters not allowed in Kubernetes names, all
+# replaced by a single hyphen
+NAME_SEPARATORS = re.compile(r"[^a-z0-9]+")
 
 
 def sanitize_k8s_name(
@@ -57,9 +53,7 @@ def sanitize_k8s_name(
 
     s = input_string.lower()
 
-    s = re.sub(r"[^a-z0-9\.-]+", "-", s)
-    s = re.sub(r"[-.]+", "-", s)
-    s = s.strip("-.")
+    s = NAME_SEPARATORS.sub("-", s).strip("-")
 
     if not s or not (s[0].isalnum() and s[-1].isalnum()):
         s = "invalid-name-" + hashlib.sha1(input_string.encode("utf-8")).hexdigest()[:8]
@@ -0,0 +1,41 @@
+from unittest.mock import Mock
+
+import pytest
+
+from importer.importer import Importer
+
+
+def _crd_api():
+    crd_api = Mock()
+    crd_api.list_namespaced_custom_object.return_value = {"items": []}
+    return crd_api
+
+
+def _registry_client():
+    registry_client = Mock(cache=None, last_page_bytes=0)
+    registry_client.get_server.side_effect = lambda id: {"id": id}
+    return registry_client
+
+
+@pytest.fixture
+def make_importer():
+    """
+    Factory of importers of the test catalog. Unless given, the Kubernetes API
+    is a mock with no existing McpServers and the registry client a mock
+    returning server details made of their ID.
+    """
+
+    def make(crd_api=None, registry_client=None, importer_class=Importer, **kwargs):
+        kwargs.setdefault("namespace", "test-namespace")
+        return importer_class(
+            crd_api=_crd_api() if crd_api is None else crd_api,
+            catalog_name="test-catalog",
+            import_job_name="test-job",
+            mcp_registry_url="http://localhost:8080/v0",
+            registry_client=(
+                _registry_client() if registry_client is None else registry_client
+            ),
+            **kwargs,
+        )
+
+    return make
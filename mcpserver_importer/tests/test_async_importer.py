@@ -0,0 +1,327 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from kubernetes_asyncio import client
+
+from importer.async_importer import AsyncImporter
+from importer.http_cache import HttpCache
+from importer.prune import Pruner
+from importer.registry import RegistryClient
+
+
+def _registry_transport(servers, page_size=2, failing_ids=()):
+    """Build a mock registry serving the given servers in pages."""
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(str(request.url))
+        if request.url.path.endswith("/servers"):
+            start = int(request.url.params.get("cursor", "0"))
+            end = start + page_size
+            next_cursor = str(end) if end < len(servers) else None
+            return httpx.Response(
+                200,
+                json={
+                    "servers": servers[start:end],
+                    "metadata": {"next_cursor": next_cursor},
+                },
+            )
+        server_id = request.url.path.rsplit("/", 1)[-1]
+        if server_id in failing_ids:
+            return httpx.Response(500)
+        return httpx.Response(200, json={"id": server_id})
+
+    return httpx.MockTransport(handler), requested
+
+
+def _crd_api():
+    crd_api = AsyncMock()
+    crd_api.list_namespaced_custom_object.return_value = {"items": []}
+    return crd_api
+
+
+@pytest.fixture
+def async_importer(make_importer):
+    def make(crd_api, transport, cache=None, **kwargs):
+        return make_importer(
+            crd_api,
+            RegistryClient("http://localhost:8080/v0", backoff_base=0, cache=cache),
+            importer_class=AsyncImporter,
+            http_client=httpx.AsyncClient(transport=transport),
+            **kwargs,
+        )
+
+    return make
+
+
+class TestAsyncImporter:
+    """Test cases for the asyncio import engine."""
+
+    def test_import_all_pages(self, async_importer):
+        """Test that all the servers of all the pages are created."""
+        servers = [{"id": f"id-{i}", "name": f"server-{i}"} for i in range(5)]
+        transport, _ = _registry_transport(servers)
+        crd_api = _crd_api()
+
+        importer = async_importer(crd_api, transport, max_servers=0)
+        asyncio.run(importer.run_async())
+
+        assert [s.id for s in importer.server_tracking] == [s["id"] for s in servers]
+        assert importer.imported_count == 5
+        assert importer.imported_servers == 5
+        assert importer.has_next is False
+        assert crd_api.create_namespaced_custom_object.await_count == 5
+
+    def test_max_servers_and_filter(self, async_importer):
+        """Test that the name filter and max_servers stop the walk."""
+        servers = [
+            {"id": f"id-{i}", "name": f"{'match' if i % 2 else 'other'}-{i}"}
+            for i in range(10)
+        ]
+        transport, requested = _registry_transport(servers)
+        crd_api = _crd_api()
+
+        importer = async_importer(
+            crd_api, transport, name_filter="match", max_servers=2
+        )
+        asyncio.run(importer.run_async())
+
+        assert [s.id for s in importer.server_tracking] == ["id-1", "id-3"]
+        assert not any("cursor=4" in url for url in requested)
+        assert importer.has_next is False
+
+    def test_existing_and_failed_servers(self, async_importer):
+        """Test tracking of existing servers and failed detail fetches."""
+        servers = [{"id": f"id-{i}", "name": f"server-{i}"} for i in range(3)]
+        transport, _ = _registry_transport(servers, failing_ids=("id-2",))
+        crd_api = _crd_api()
+        crd_api.list_namespaced_custom_object.return_value = {
+            "items": [{"metadata": {"name": "server-0"}}]
+        }
+
+        importer = async_importer(crd_api, transport, max_servers=0)
+        asyncio.run(importer.run_async())
+
+        tracking = {s.id: s for s in importer.server_tracking}
+        assert tracking["id-0"].reason == "already_exists"
+        assert tracking["id-1"].skipped is False
+        assert tracking["id-2"].reason == "fetch_error"
+        assert importer.imported_count == 1
+
+    def test_update_existing(self, async_importer):
+        """Test that changed servers are patched instead of skipped."""
+        servers = [{"id": f"id-{i}", "name": f"server-{i}"} for i in range(2)]
+        transport, _ = _registry_transport(servers)
+        crd_api = _crd_api()
+        crd_api.list_namespaced_custom_object.return_value = {
+            "items": [{"metadata": {"name": "server-0"}}]
+        }
+
+        importer = async_importer(
+            crd_api, transport, max_servers=0, update_existing=True
+        )
+        asyncio.run(importer.run_async())
+
+        tracking = {s.id: s for s in importer.server_tracking}
+        assert tracking["id-0"].reason == "updated"
+        assert importer.updated_count == 1
+        assert importer.imported_count == 1
+        crd_api.patch_namespaced_custom_object.assert_awaited_once()
+        assert crd_api.create_namespaced_custom_object.await_count == 1
+
+    def test_backpressure(self, async_importer):
+        """Test that the entries are scheduled no faster than they are imported."""
+        servers = [{"id": f"id-{i}", "name": f"server-{i}"} for i in range(20)]
+        transport, _ = _registry_transport(servers, page_size=10)
+        crd_api = _crd_api()
+
+        async def create(**kwargs):
+            await asyncio.sleep(0.001)
+
+        crd_api.create_namespaced_custom_object.side_effect = create
+        importer = async_importer(
+            crd_api, transport, max_servers=0, fetch_concurrency=2, write_concurrency=1
+        )
+        import_timed_async = importer._import_timed_async
+        in_flight = {"now": 0, "max": 0}
+
+        async def tracked(server_entry, *args):
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            try:
+                await import_timed_async(server_entry, *args)
+            finally:
+                in_flight["now"] -= 1
+
+        importer._import_timed_async = tracked
+        asyncio.run(importer.run_async())
+
+        assert importer.imported_count == 20
+        assert in_flight["max"] == 3
+
+    def test_registry_client_settings(self, make_importer):
+        """Test that the HTTP client follows the pool size and timeouts of the
+        registry client."""
+        transport, _ = _registry_transport([{"id": "id-0", "name": "server-0"}])
+        async_client_class = httpx.AsyncClient
+        settings = {}
+
+        def async_client(**kwargs):
+            settings.update(kwargs)
+            return async_client_class(transport=transport, **kwargs)
+
+        importer = make_importer(
+            _crd_api(),
+            RegistryClient(
+                "http://localhost:8080/v0",
+                pool_size=4,
+                connect_timeout=2.0,
+                read_timeout=60.0,
+            ),
+            importer_class=AsyncImporter,
+        )
+        with patch("importer.async_importer.httpx.AsyncClient", async_client):
+            asyncio.run(importer.run_async())
+
+        assert importer.imported_count == 1
+        assert settings["timeout"] == httpx.Timeout(60.0, connect=2.0)
+        assert settings["limits"] == httpx.Limits(max_connections=4)
+
+    def test_registry_error(self, async_importer):
+        """Test that a failed page marks the import as failed."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(503)
+
+        importer = async_importer(_crd_api(), httpx.MockTransport(handler))
+        asyncio.run(importer.run_async())
+
+        assert importer.import_status == "failed"
+        assert importer.error_message.startswith("Registry connection error")
+        assert len(importer.server_tracking) == 0
+
+    def test_registry_retry(self, async_importer):
+        """Test that transient registry errors are retried."""
+        servers = [{"id": "id-0", "name": "server-0"}]
+        transport, _ = _registry_transport(servers)
+        failures = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if len(failures) < 2:
+                failures.append(request)
+                return httpx.Response(503, headers={"Retry-After": "0"})
+            return transport.handle_request(request)
+
+        crd_api = _crd_api()
+        importer = async_importer(crd_api, httpx.MockTransport(handler))
+        asyncio.run(importer.run_async())
+
+        assert len(failures) == 2
+        assert importer.import_status == "running"
+        assert importer.imported_count == 1
+
+    def test_create_conflict(self, async_importer):
+        """Test that servers created outside of the catalog are skipped."""
+        servers = [{"id": "id-0", "name": "server-0"}]
+        transport, _ = _registry_transport(servers)
+        crd_api = _crd_api()
+        crd_api.create_namespaced_custom_object.side_effect = client.ApiException(
+            status=409
+        )
+
+        importer = async_importer(crd_api, transport)
+        asyncio.run(importer.run_async())
+
+        assert next(iter(importer.server_tracking)).reason == "already_exists"
+        assert importer.imported_count == 0
+
+    def test_write_errors(self, async_importer):
+        """Test that the Kubernetes API errors are tracked apart from the
+        unexpected ones."""
+        servers = [{"id": f"id-{i}", "name": f"server-{i}"} for i in range(2)]
+        transport, _ = _registry_transport(servers)
+        crd_api = _crd_api()
+        crd_api.create_namespaced_custom_object.side_effect = [
+            client.ApiException(status=500),
+            RuntimeError("boom"),
+        ]
+
+        importer = async_importer(crd_api, transport, fetch_concurrency=1)
+        asyncio.run(importer.run_async())
+
+        assert sorted(s.reason for s in importer.server_tracking) == [
+            "api_error",
+            "unexpected_error",
+        ]
+        assert importer.imported_count == 0
+
+    def test_http_cache(self, tmp_path, async_importer):
+        """Test that server details are revalidated against the HTTP cache."""
+        servers = [{"id": "id-0", "name": "server-0"}]
+        transport, _ = _registry_transport(servers)
+        revalidations = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/servers/id-0"):
+                if request.headers.get("If-None-Match") == '"v1"':
+                    revalidations.append(request)
+                    return httpx.Response(304)
+                return httpx.Response(
+                    200, json={"id": "id-0"}, headers={"ETag": '"v1"'}
+                )
+            return transport.handle_request(request)
+
+        cache = HttpCache(str(tmp_path))
+        for _ in range(2):
+            crd_api = _crd_api()
+            importer = async_importer(
+                crd_api, httpx.MockTransport(handler), cache=cache
+            )
+            asyncio.run(importer.run_async())
+            body = crd_api.create_namespaced_custom_object.call_args.kwargs["body"]
+            assert body["spec"]["server_detail"] == {"id": "id-0"}
+
+        assert len(revalidations) == 1
+        assert cache.hits == 1
+
+    def test_dry_run(self, async_importer):
+        """Test that dry run mode does not create resources."""
+        servers = [{"id": "id-0", "name": "server-0"}]
+        transport, _ = _registry_transport(servers)
+        crd_api = _crd_api()
+
+        importer = async_importer(crd_api, transport, dry_run=True)
+        asyncio.run(importer.run_async())
+
+        crd_api.create_namespaced_custom_object.assert_not_called()
+        assert importer.imported_count == 0
+
+    def test_prune(self, async_importer):
+        """Test that the servers no longer listed are deleted after the walk."""
+        servers = [{"id": f"id-{i}", "name": f"server-{i}"} for i in range(2)]
+        transport, _ = _registry_transport(servers)
+        crd_api = _crd_api()
+        crd_api.list_namespaced_custom_object.return_value = {
+            "items": [
+                {
+                    "metadata": {
+                        "name": f"server-{i}",
+                        "labels": {"mcp.opendatahub.io/server-id": f"id-{i}"},
+                    }
+                }
+                for i in range(3)
+            ]
+        }
+
+        importer = async_importer(
+            crd_api, transport, max_servers=0, pruner=Pruner(max_fraction=0.5)
+        )
+        asyncio.run(importer.run_async())
+
+        crd_api.delete_namespaced_custom_object.assert_awaited_once()
+        assert (
+            crd_api.delete_namespaced_custom_object.call_args.kwargs["name"]
+            == "server-2"
+        )
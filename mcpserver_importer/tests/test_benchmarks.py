@@ -0,0 +1,65 @@
+import pytest
+import requests
+
+from benchmarks.fakes import FakeRegistry
+from benchmarks.run import compare, import_once
+
+
+def _options(**kwargs):
+    return {
+        "size": 25,
+        "engine": "sync",
+        "page_size": 10,
+        "registry_latency": 0.0,
+        "kube_latency": 0.0,
+        "error_rate": 0.0,
+        "fetch_concurrency": 4,
+        "write_concurrency": 4,
+        **kwargs,
+    }
+
+
+class TestBenchmark:
+    """Test cases for the scale benchmark harness."""
+
+    @pytest.mark.parametrize("engine", ["sync", "async"])
+    def test_import_once(self, engine):
+        """Test that a run imports every server of the fake registry."""
+        result = import_once(_options(engine=engine))
+
+        assert result["imported"] == 25
+        assert result["errors"] == 0
+        assert result["registry_requests"] == {"page": 3, "detail": 25}
+        assert result["kube_requests"]["create_mcpserver"] == 25
+        assert result["kube_requests"]["create_configmap"] == 1
+
+    def test_import_snapshot(self):
+        """Test that a run reads the servers from a snapshot instead."""
+        result = import_once(_options(snapshot=True))
+
+        assert result["imported"] == 25
+        assert result["registry_requests"] == {}
+        assert result["kube_requests"]["create_mcpserver"] == 25
+
+    def test_fake_registry_pages(self):
+        """Test the pagination of the fake registry."""
+        with FakeRegistry(15, page_size=10) as registry:
+            first = requests.get(f"{registry.base_url}/servers?limit=10").json()
+            second = requests.get(
+                f"{registry.base_url}/servers?limit=10&cursor=10"
+            ).json()
+
+        assert len(first["servers"]) == 10
+        assert first["metadata"]["next_cursor"] == "10"
+        assert len(second["servers"]) == 5
+        assert "next_cursor" not in second["metadata"]
+
+    def test_compare_flags_regressions(self):
+        """Test that a throughput drop beyond the threshold is flagged."""
+        previous = {"runs": [{"size": 100, "engine": "sync", "servers_per_sec": 100}]}
+        results = {"runs": [{"size": 100, "engine": "sync", "servers_per_sec": 50}]}
+
+        (line,) = compare(results, previous)
+
+        assert "-50%" in line
+        assert line.endswith("REGRESSION")
@@ -0,0 +1,158 @@
+from unittest.mock import Mock
+
+import pytest
+from kubernetes import client
+
+from importer.checkpoint import Checkpoint, CheckpointStore, checkpoint_name
+
+
+def _store(core_v1_api=None, interval=0.0):
+    return CheckpointStore(
+        core_v1_api or Mock(),
+        "test-namespace",
+        "test-catalog",
+        "test-job",
+        interval=interval,
+    )
+
+
+class TestCheckpoint:
+    """Test cases for the serialization of the checkpoints."""
+
+    def test_round_trip(self):
+        """Test that a checkpoint is restored from its ConfigMap data."""
+        checkpoint = Checkpoint(
+            registry_uri="http://localhost:8080/v0",
+            cursor="page-2",
+            imported_servers=120,
+            processed_ids={"id-b", "id-a"},
+            high_water_mark="2025-06-01T00:00:00Z",
+            imported=100,
+            skipped=20,
+        )
+
+        data = checkpoint.to_data()
+
+        assert data["processed_ids"] == "id-a\nid-b"
+        assert Checkpoint.from_data(data) == checkpoint
+        assert Checkpoint.from_data(Checkpoint("r").to_data()).processed_ids == set()
+
+    def test_name(self):
+        """Test that the ConfigMap name only depends on the import job."""
+        assert checkpoint_name("My_Job") == "mcp-import-checkpoint-my-job"
+
+
+class TestCheckpointStore:
+    """Test cases for storing the checkpoints in a ConfigMap."""
+
+    def test_load_missing(self):
+        """Test that a job without checkpoint starts from scratch."""
+        core_v1_api = Mock()
+        core_v1_api.read_namespaced_config_map.side_effect = client.ApiException(
+            status=404
+        )
+
+        assert _store(core_v1_api).load() is None
+
+    def test_save_creates_then_replaces(self):
+        """Test that the first save creates the ConfigMap."""
+        core_v1_api = Mock()
+        core_v1_api.replace_namespaced_config_map.side_effect = [
+            client.ApiException(status=404),
+            None,
+        ]
+        store = _store(core_v1_api)
+
+        store.save(Checkpoint("http://localhost:8080/v0"))
+        store.save(Checkpoint("http://localhost:8080/v0"))
+
+        body = core_v1_api.create_namespaced_config_map.call_args.kwargs["body"]
+        assert body["metadata"]["name"] == "mcp-import-checkpoint-test-job"
+        assert body["metadata"]["labels"]["mcp.opendatahub.io/checkpoint"] == "true"
+        assert (
+            body["metadata"]["labels"]["mcp.opendatahub.io/mcpserverimportjob"]
+            == "test-job"
+        )
+        assert core_v1_api.replace_namespaced_config_map.call_count == 2
+        assert store.saves == 2
+
+
+class TestResume:
+    """Test cases for resuming an import from a checkpoint."""
+
+    @pytest.fixture
+    def resumable_importer(self, make_importer):
+        def make(pages, store):
+            importer = make_importer(max_servers=0, checkpoint_store=store)
+            importer.registry_client.list_servers.side_effect = (
+                lambda cursor=None, **kwargs: pages[cursor]
+            )
+            return importer
+
+        return make
+
+    @staticmethod
+    def _pages():
+        servers = [{"id": f"id-{i}", "name": f"server-{i}"} for i in range(6)]
+        return {
+            None: {"servers": servers[:3], "metadata": {"next_cursor": "page-2"}},
+            "page-2": {"servers": servers[3:], "metadata": {}},
+        }
+
+    def test_checkpoints_saved(self, resumable_importer):
+        """Test that the cursor of the page and its processed IDs are saved."""
+        store = _store()
+        store.save = Mock()
+        importer = resumable_importer(self._pages(), store)
+
+        importer.import_next()
+
+        checkpoint = store.save.call_args.args[0]
+        assert checkpoint.cursor is None
+        assert checkpoint.processed_ids == {"id-0", "id-1", "id-2"}
+        assert checkpoint.imported_servers == 3
+
+        importer.import_next()
+
+        checkpoint = store.save.call_args.args[0]
+        assert checkpoint.cursor == "page-2"
+        assert checkpoint.processed_ids == {"id-3", "id-4", "id-5"}
+        assert checkpoint.imported == 6
+
+    def test_resume_skips_processed_servers(self, resumable_importer):
+        """Test that a restarted import continues where it stopped."""
+        store = _store()
+        store.save = Mock()
+        importer = resumable_importer(self._pages(), store)
+        importer.resume(
+            Checkpoint(
+                registry_uri="http://localhost:8080/v0",
+                cursor="page-2",
+                imported_servers=4,
+                processed_ids={"id-3"},
+                imported=4,
+            )
+        )
+
+        importer.run()
+
+        assert [s.id for s in importer.server_tracking] == ["id-4", "id-5"]
+        assert importer.imported_servers == 6
+        assert importer.imported_count == 6
+        importer.registry_client.list_servers.assert_called_once()
+
+    def test_checkpoint_saved_on_failure(self, resumable_importer):
+        """Test that a failed import keeps its progress for the next run."""
+        pages = self._pages()
+        pages["page-2"] = {"metadata": {}}
+        store = _store(interval=3600)
+        store.save = Mock()
+        importer = resumable_importer(pages, store)
+
+        importer.run()
+
+        assert importer.import_status == "failed"
+        checkpoint = store.save.call_args.args[0]
+        assert checkpoint.cursor == "page-2"
+        assert checkpoint.processed_ids == set()
+        assert checkpoint.imported_servers == 3
@@ -0,0 +1,49 @@
+from unittest.mock import patch
+
+from kubernetes import client, config
+
+from importer.cluster import ClusterContext
+
+
+class TestClusterContext:
+    """Test cases for the cluster context shared by the importer."""
+
+    @patch("importer.cluster.read_current_namespace", return_value="test-namespace")
+    def test_namespace_resolved_once(self, mock_get_namespace):
+        """Test that the namespace is read once and cached."""
+        cluster = ClusterContext()
+
+        assert cluster.namespace == "test-namespace"
+        assert cluster.namespace == "test-namespace"
+        mock_get_namespace.assert_called_once()
+
+    @patch("importer.cluster.client.CoreV1Api")
+    def test_apis_cached(self, mock_core_v1_api):
+        """Test that a typed API is built once."""
+        cluster = ClusterContext()
+
+        assert cluster.core_v1 is cluster.core_v1
+        mock_core_v1_api.assert_called_once_with(None)
+
+    @patch("importer.cluster.config.load_kube_config")
+    @patch(
+        "importer.cluster.config.load_incluster_config",
+        side_effect=config.ConfigException,
+    )
+    def test_load(self, mock_load_incluster, mock_load_kube):
+        """Test that a pooled ApiClient is created once from the kubeconfig."""
+        cluster = ClusterContext(pool_size=4)
+        default = client.Configuration.get_default_copy()
+        try:
+            cluster.load()
+            api_client = cluster.api_client
+            cluster.load()
+
+            mock_load_kube.assert_called_once()
+            assert cluster.api_client is api_client
+            assert api_client.configuration.connection_pool_maxsize == 4
+            assert cluster.custom_objects.api_client is api_client
+            assert cluster.core_v1.api_client is api_client
+        finally:
+            cluster.close()
+            client.Configuration.set_default(default)
@@ -0,0 +1,71 @@
+from importer.filters import NameFilter
+from importer.registry import RegistryClient
+
+
+class TestNameFilter:
+    """Test cases for the name patterns of NAME_FILTER and NAME_EXCLUDE."""
+
+    def test_substrings(self):
+        """Test that plain patterns are case-insensitive substrings."""
+        name_filter = NameFilter("github, GitLab")
+
+        assert name_filter.matches("io.github.user/server")
+        assert name_filter.matches("com.gitlab.user/server")
+        assert not name_filter.matches("com.example/server")
+
+    def test_globs_and_regex(self):
+        """Test that globs match the whole name and regexes are searched."""
+        name_filter = NameFilter("io.github.*/mcp-*,re:^com\\.(acme|example)/")
+
+        assert name_filter.matches("io.github.user/mcp-server")
+        assert not name_filter.matches("org.io.github.user/mcp-server")
+        assert not name_filter.matches("io.github.user/server")
+        assert name_filter.matches("com.ACME/server")
+        assert not name_filter.matches("org.com.acme/server")
+
+    def test_exclude(self):
+        """Test that excluded names are dropped, with or without includes."""
+        assert not NameFilter("github", "*-deprecated").matches("github/x-deprecated")
+        assert NameFilter("", "*-deprecated").matches("github/x")
+        assert not NameFilter("", "test,demo").matches("demo-server")
+        assert NameFilter("", "").matches("")
+        assert not NameFilter()
+
+    def test_key(self):
+        """Test that the filter identity is the plain filter without excludes."""
+        assert NameFilter("github").key == "github"
+        assert NameFilter("github", "demo").key == "github;exclude=demo"
+
+    def test_search_term(self):
+        """Test that only a single substring is sent to the registry."""
+        assert NameFilter("github").search_term() == "github"
+        assert NameFilter("github", "demo").search_term() == "github"
+        assert NameFilter("github,gitlab").search_term() is None
+        assert NameFilter("io.github.*").search_term() is None
+        assert NameFilter("re:github").search_term() is None
+        assert NameFilter("").search_term() is None
+
+
+class TestRegistrySearch:
+    """Test cases for sending the name filter to the registry."""
+
+    def test_search_sent_to_registry(self, make_importer):
+        """Test that the search parameter is used when enabled."""
+        importer = make_importer(name_filter="github", registry_search=True)
+        importer.registry_client.list_servers.return_value = {"servers": []}
+
+        importer.import_next()
+
+        assert importer.registry_client.list_servers.call_args.kwargs["search"] == (
+            "github"
+        )
+        assert make_importer(name_filter="github").search is None
+
+    def test_page_path(self):
+        """Test the search query parameter of the page requests."""
+        registry_client = RegistryClient("http://localhost:8080/v0")
+
+        assert (
+            registry_client.page_path(limit=10, search="git hub")
+            == "servers?limit=10&search=git+hub"
+        )
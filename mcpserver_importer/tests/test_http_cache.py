@@ -0,0 +1,68 @@
+import os
+
+from importer.http_cache import HttpCache
+
+
+class TestHttpCache:
+    """Test cases for the persistent HTTP cache."""
+
+    def test_store_and_lookup(self, tmp_path):
+        """Test that stored bodies and validators are found by URL."""
+        cache = HttpCache(str(tmp_path))
+        cache.store("http://registry/servers/1", b'{"id": "1"}', '"v1"', None)
+
+        entry = cache.lookup("http://registry/servers/1")
+        assert entry.etag == '"v1"'
+        assert entry.request_headers() == {"If-None-Match": '"v1"'}
+        assert cache.read(entry) == b'{"id": "1"}'
+        assert cache.lookup("http://registry/servers/2") is None
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_last_modified_validator(self, tmp_path):
+        """Test the If-Modified-Since header."""
+        cache = HttpCache(str(tmp_path))
+        last_modified = "Wed, 21 Oct 2015 07:28:00 GMT"
+        cache.store("http://registry/servers/1", b"{}", None, last_modified)
+
+        entry = cache.lookup("http://registry/servers/1")
+        assert entry.request_headers() == {"If-Modified-Since": last_modified}
+
+    def test_persistence(self, tmp_path):
+        """Test that entries survive across cache instances."""
+        HttpCache(str(tmp_path)).store("http://registry/servers/1", b"{}", "e", None)
+
+        cache = HttpCache(str(tmp_path))
+        assert cache.size_bytes == 2
+        assert cache.lookup("http://registry/servers/1").etag == "e"
+
+    def test_size_based_eviction(self, tmp_path):
+        """Test that the least recently used entries are evicted first."""
+        cache = HttpCache(str(tmp_path), max_bytes=25)
+        cache.store("http://registry/servers/1", b"a" * 10, "e1", None)
+        cache.store("http://registry/servers/2", b"b" * 10, "e2", None)
+        first = cache.lookup("http://registry/servers/1")
+        # Mark the first entry as the most recently used
+        os.utime(cache._path(first.url, ".json"), (0, 2_000_000_000))
+
+        cache.store("http://registry/servers/3", b"c" * 10, "e3", None)
+
+        assert cache.lookup("http://registry/servers/1") is not None
+        assert cache.lookup("http://registry/servers/2") is None
+        assert cache.lookup("http://registry/servers/3") is not None
+        assert cache.size_bytes == 20
+        assert cache.evictions == 1
+
+    def test_stats_and_clear(self, tmp_path):
+        """Test the inspection and the clearing of the cache."""
+        cache = HttpCache(str(tmp_path))
+        cache.store("http://registry/servers/1", b"{}", "e1", None)
+        cache.store("http://registry/servers/2", b"{}", "e2", None)
+
+        stats = cache.stats()
+        assert stats["entries"] == 2
+        assert stats["size_bytes"] == 4
+
+        cache.clear()
+        assert cache.stats()["entries"] == 0
+        assert os.listdir(tmp_path) == []
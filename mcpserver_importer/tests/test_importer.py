@@ -1,11 +1,17 @@
+import io
+import json
 from datetime import datetime
 from unittest.mock import Mock, patch
 
 import pytest
 import requests
+import urllib3
 from kubernetes import client
 
 from importer.importer import Importer
+from importer.inventory import server_detail_hash
+from importer.registry import RegistryClient, StreamedPage
+from importer.utils import sanitize_k8s_name
 
 
 class TestImporterInitialization:
@@ -38,7 +44,7 @@ class TestImporterInitialization:
         assert importer.cursor is None
         assert importer.has_next is True
         assert isinstance(importer.start_time, datetime)
-        assert importer.server_tracking == []
+        assert len(importer.server_tracking) == 0
         assert importer.import_status == "running"
         assert importer.error_message is None
         assert importer.imported_count == 0
@@ -151,8 +157,9 @@ class TestNameMatch:
 class TestImportServerEntry:
     """Test cases for importing individual server entries."""
 
-    @patch("importer.importer.requests.get")
-    @patch("importer.importer.get_current_namespace")
+    @patch("importer.registry.requests.Session.get")
+    @patch("importer.cluster.read_current_namespace")
+    @patch("importer.cluster._shared", None)
     def test_import_server_entry_success(self, mock_get_namespace, mock_requests_get):
         """Test successful server import."""
         mock_crd_api = Mock()
@@ -168,10 +175,8 @@ class TestImportServerEntry:
         }
         mock_requests_get.return_value = mock_response
 
-        # Mock successful Kubernetes API call - 404 for get, success for create
-        mock_crd_api.get_namespaced_custom_object.side_effect = client.ApiException(
-            status=404
-        )
+        # Mock successful Kubernetes API call - no existing servers, success for create
+        mock_crd_api.list_namespaced_custom_object.return_value = {"items": []}
         mock_crd_api.create_namespaced_custom_object.return_value = {
             "metadata": {"name": "test-server"}
         }
@@ -189,12 +194,16 @@ class TestImportServerEntry:
 
         # Verify API calls
         mock_requests_get.assert_called_once_with(
-            "http://localhost:8080/v0/servers/test-id"
+            "http://localhost:8080/v0/servers/test-id",
+            headers=None,
+            timeout=(5.0, 30.0),
+            stream=False,
         )
         mock_crd_api.create_namespaced_custom_object.assert_called_once()
 
-    @patch("importer.importer.requests.get")
-    @patch("importer.importer.get_current_namespace")
+    @patch("importer.registry.requests.Session.get")
+    @patch("importer.cluster.read_current_namespace")
+    @patch("importer.cluster._shared", None)
     def test_import_server_entry_existing_resource(
         self, mock_get_namespace, mock_requests_get
     ):
@@ -213,8 +222,8 @@ class TestImportServerEntry:
         mock_requests_get.return_value = mock_response
 
         # Mock existing resource
-        mock_crd_api.get_namespaced_custom_object.return_value = {
-            "metadata": {"name": "test-server"}
+        mock_crd_api.list_namespaced_custom_object.return_value = {
+            "items": [{"metadata": {"name": "test-server"}}]
         }
 
         importer = Importer(
@@ -231,7 +240,7 @@ class TestImportServerEntry:
         # Verify that create was not called
         mock_crd_api.create_namespaced_custom_object.assert_not_called()
 
-    @patch("importer.importer.requests.get")
+    @patch("importer.registry.requests.Session.get")
     def test_import_server_entry_api_error(self, mock_requests_get):
         """Test handling of registry API errors."""
         mock_crd_api = Mock()
@@ -255,6 +264,10 @@ class TestImportServerEntry:
 
         # Verify that Kubernetes API was not called
         mock_crd_api.create_namespaced_custom_object.assert_not_called()
+        record = importer.server_tracking.get(server_entry)
+        assert (record.skipped, record.reason) == (True, "fetch_error")
+        assert importer.fetch_errors == 1
+        assert importer.server_tracking.skipped == 1
 
     def test_import_server_entry_missing_name(self):
         """Test handling of server entries without name field."""
@@ -272,6 +285,546 @@ class TestImportServerEntry:
             # Missing name field
         }
 
-        # This should raise an AttributeError when sanitize_k8s_name is called with None
-        with pytest.raises(AttributeError):
+        importer._import_server_entry(server_entry)
+
+        # Skipped before fetching its detail or calling the Kubernetes API
+        mock_crd_api.create_namespaced_custom_object.assert_not_called()
+        assert importer.fetch_errors == 0
+        assert importer.server_tracking.get(server_entry).reason == "missing_name"
+
+    def test_import_entries_missing_name(self, make_importer):
+        """Test that the detail of an entry without name is never requested."""
+        importer = make_importer()
+
+        importer._import_entries([{"id": "id-0", "name": "server-0"}, {"id": "id-1"}])
+
+        importer.registry_client.get_server.assert_called_once_with("id-0")
+        assert [(s.skipped, s.reason) for s in importer.server_tracking] == [
+            (False, None),
+            (True, "missing_name"),
+        ]
+        assert importer.imported_count == 1
+
+
+class TestImportNext:
+    """Test cases for importing a page of server entries."""
+
+    @staticmethod
+    def _page_response(servers, next_cursor=None):
+        response = Mock(content=b"")
+        response.raise_for_status.return_value = None
+        response.json.return_value = {
+            "servers": servers,
+            "metadata": {"next_cursor": next_cursor},
+        }
+        return response
+
+    @staticmethod
+    def _detail_response(server_id):
+        response = Mock()
+        response.raise_for_status.return_value = None
+        response.json.return_value = {"id": server_id}
+        return response
+
+    def _fake_get(self, servers, next_cursor=None):
+        def fake_get(url, **kwargs):
+            if "/servers?" in url:
+                return self._page_response(servers, next_cursor)
+            return self._detail_response(url.rsplit("/", 1)[-1])
+
+        return fake_get
+
+    @patch("importer.registry.requests.Session.get")
+    def test_import_next_preserves_order(self, mock_requests_get, make_importer):
+        """Test that details fetched in parallel are processed in page order."""
+        mock_crd_api = Mock()
+        mock_crd_api.list_namespaced_custom_object.return_value = {"items": []}
+        servers = [{"id": f"id-{i}", "name": f"server-{i}"} for i in range(20)]
+        mock_requests_get.side_effect = self._fake_get(servers)
+
+        importer = make_importer(
+            mock_crd_api,
+            RegistryClient("http://localhost:8080/v0"),
+            max_servers=0,
+            fetch_concurrency=4,
+        )
+        importer.import_next()
+
+        assert [s.id for s in importer.server_tracking] == [s["id"] for s in servers]
+        created = [
+            c.kwargs["body"]["spec"]["server_detail"]["id"]
+            for c in mock_crd_api.create_namespaced_custom_object.call_args_list
+        ]
+        assert created == [s["id"] for s in servers]
+        assert importer.imported_count == 20
+        assert importer.has_next is False
+
+    @patch("importer.registry.requests.Session.get")
+    def test_import_next_max_servers_and_filter(self, mock_requests_get, make_importer):
+        """Test that only matching servers up to max_servers are fetched."""
+        mock_crd_api = Mock()
+        mock_crd_api.list_namespaced_custom_object.return_value = {"items": []}
+        servers = [
+            {"id": f"id-{i}", "name": f"{'match' if i % 2 else 'other'}-{i}"}
+            for i in range(10)
+        ]
+        mock_requests_get.side_effect = self._fake_get(servers, next_cursor="next")
+
+        importer = make_importer(
+            mock_crd_api,
+            RegistryClient("http://localhost:8080/v0"),
+            name_filter="match",
+            max_servers=3,
+        )
+        importer.import_next()
+
+        assert [s.id for s in importer.server_tracking] == ["id-1", "id-3", "id-5"]
+        detail_urls = [
+            c.args[0]
+            for c in mock_requests_get.call_args_list
+            if "/servers?" not in c.args[0]
+        ]
+        assert sorted(detail_urls) == [
+            f"http://localhost:8080/v0/servers/id-{i}" for i in (1, 3, 5)
+        ]
+        assert importer.imported_servers == 3
+        assert importer.has_next is False
+
+    @patch("importer.registry.requests.Session.get")
+    def test_import_next_detail_error(self, mock_requests_get, make_importer):
+        """Test that a failed detail fetch does not stop the page."""
+        mock_crd_api = Mock()
+        mock_crd_api.list_namespaced_custom_object.return_value = {"items": []}
+        servers = [{"id": "id-0", "name": "server-0"}, {"id": "id-1", "name": "s-1"}]
+        fake_get = self._fake_get(servers)
+
+        def failing_get(url, **kwargs):
+            if url.endswith("/servers/id-0"):
+                raise requests.exceptions.RequestException("Connection error")
+            return fake_get(url, **kwargs)
+
+        mock_requests_get.side_effect = failing_get
+
+        importer = make_importer(
+            mock_crd_api,
+            RegistryClient("http://localhost:8080/v0"),
+        )
+        importer.import_next()
+
+        assert len(importer.server_tracking) == 2
+        assert importer.imported_servers == 2
+        assert importer.imported_count == 1
+        mock_crd_api.create_namespaced_custom_object.assert_called_once()
+
+
+class TestPagePrefetch:
+    """Test cases for prefetching the next registry page."""
+
+    @staticmethod
+    def _registry_client(pages):
+        registry_client = Mock(last_page_bytes=0)
+        registry_client.list_servers.side_effect = lambda cursor=None, **kwargs: pages[
+            cursor
+        ]
+        registry_client.get_server.side_effect = lambda id: {"id": id}
+        return registry_client
+
+    def test_next_page_is_prefetched(self, make_importer):
+        """Test that the next page is requested once and used by import_next."""
+        pages = {
+            None: {
+                "servers": [{"id": "id-0", "name": "server-0"}],
+                "metadata": {"next_cursor": "page-2"},
+            },
+            "page-2": {
+                "servers": [{"id": "id-1", "name": "server-1"}],
+                "metadata": {},
+            },
+        }
+        registry_client = self._registry_client(pages)
+        importer = make_importer(registry_client=registry_client, max_servers=0)
+
+        importer.import_next()
+        assert importer._prefetched_page[0] == "page-2"
+        importer.import_next()
+
+        assert [c.args for c in registry_client.list_servers.call_args_list] == [
+            (None,),
+            ("page-2",),
+        ]
+        assert [s.id for s in importer.server_tracking] == ["id-0", "id-1"]
+        assert importer.has_next is False
+
+    def test_no_prefetch_after_max_servers(self, make_importer):
+        """Test that no page is prefetched once max_servers is reached."""
+        pages = {
+            None: {
+                "servers": [{"id": f"id-{i}", "name": f"server-{i}"} for i in range(3)],
+                "metadata": {"next_cursor": "page-2"},
+            },
+        }
+        registry_client = self._registry_client(pages)
+        importer = make_importer(registry_client=registry_client, max_servers=2)
+
+        importer.run()
+
+        registry_client.list_servers.assert_called_once_with(
+            None, limit=2, updated_since=None, search=None
+        )
+        assert importer._prefetched_page is None
+        assert len(importer.server_tracking) == 2
+
+    def test_prefetch_disabled(self, make_importer):
+        """Test that pages are fetched on demand when prefetch is disabled."""
+        pages = {
+            None: {
+                "servers": [{"id": "id-0", "name": "server-0"}],
+                "metadata": {"next_cursor": "page-2"},
+            },
+            "page-2": {"servers": [], "metadata": {}},
+        }
+        registry_client = self._registry_client(pages)
+        importer = make_importer(registry_client=registry_client, prefetch_pages=False)
+
+        importer.import_next()
+        assert importer._prefetched_page is None
+        importer.import_next()
+
+        assert registry_client.list_servers.call_count == 2
+
+
+class TestStreamParse:
+    """Test cases for importing registry pages while they are parsed."""
+
+    @staticmethod
+    def _registry_client(pages):
+        def stream_servers(cursor=None, **kwargs):
+            response = requests.Response()
+            response.status_code = 200
+            response.raw = urllib3.HTTPResponse(
+                body=io.BytesIO(pages[cursor]), preload_content=False
+            )
+            return StreamedPage(response)
+
+        registry_client = Mock()
+        registry_client.stream_servers.side_effect = stream_servers
+        registry_client.get_server.side_effect = lambda id: {"id": id}
+        return registry_client
+
+    @staticmethod
+    def _page(servers, next_cursor=None):
+        return json.dumps(
+            {"servers": servers, "metadata": {"next_cursor": next_cursor}}
+        ).encode()
+
+    @pytest.fixture
+    def streaming_importer(self, make_importer):
+        def make(pages, **kwargs):
+            return make_importer(
+                registry_client=self._registry_client(pages),
+                fetch_concurrency=2,
+                stream_parse=True,
+                **kwargs,
+            )
+
+        return make
+
+    def test_all_pages(self, streaming_importer):
+        """Test that the entries of all the pages are imported in chunks."""
+        servers = [{"id": f"id-{i}", "name": f"server-{i}"} for i in range(5)]
+        pages = {
+            None: self._page(servers[:3], "c1"),
+            "c1": self._page(servers[3:]),
+        }
+        importer = streaming_importer(pages, max_servers=0)
+
+        importer.run()
+
+        assert [s.id for s in importer.server_tracking] == [s["id"] for s in servers]
+        assert importer.imported_count == 5
+        assert importer.walk_complete
+        assert importer.registry_client.stream_servers.call_count == 2
+
+    def test_max_servers_and_filter(self, streaming_importer):
+        """Test that the walk stops at max_servers within a page."""
+        servers = [
+            {"id": f"id-{i}", "name": f"{'match' if i % 2 else 'other'}-{i}"}
+            for i in range(8)
+        ]
+        importer = streaming_importer(
+            {None: self._page(servers, "c1")}, max_servers=2, name_filter="match"
+        )
+
+        importer.run()
+
+        assert [s.id for s in importer.server_tracking] == ["id-1", "id-3"]
+        assert importer.has_next is False
+        assert importer.walk_complete is False
+        assert importer.import_status == "running"
+
+    def test_invalid_page(self, streaming_importer):
+        """Test that a page without servers fails the import."""
+        importer = streaming_importer({None: b'{"metadata": {}}'})
+
+        importer.run()
+
+        assert importer.import_status == "failed"
+        assert "missing 'servers' list" in importer.error_message
+
+
+class TestExistingServers:
+    """Test cases for the existence checks against the catalog inventory."""
+
+    def test_inventory_listed_once(self, make_importer):
+        """Test that existing servers are listed once and never fetched by name."""
+        mock_crd_api = Mock()
+        mock_crd_api.list_namespaced_custom_object.return_value = {
+            "items": [
+                {
+                    "metadata": {
+                        "name": "renamed-server",
+                        "labels": {"mcp.opendatahub.io/server-id": "id-1"},
+                    }
+                },
+                {"metadata": {"name": "server-2"}},
+            ]
+        }
+        importer = make_importer(mock_crd_api)
+
+        for i in range(4):
+            server_entry = {"id": f"id-{i}", "name": f"server-{i}"}
+            importer._track_server(server_entry)
             importer._import_server_entry(server_entry)
+
+        mock_crd_api.list_namespaced_custom_object.assert_called_once()
+        mock_crd_api.get_namespaced_custom_object.assert_not_called()
+        assert [s.reason for s in importer.server_tracking] == [
+            None,
+            "already_exists",
+            "already_exists",
+            None,
+        ]
+        assert importer.imported_count == 2
+        assert "server-0" in importer.inventory.names
+
+    def test_create_conflict(self, make_importer):
+        """Test that a server created outside of the catalog is skipped."""
+        mock_crd_api = Mock()
+        mock_crd_api.list_namespaced_custom_object.return_value = {"items": []}
+        mock_crd_api.create_namespaced_custom_object.side_effect = client.ApiException(
+            status=409
+        )
+        importer = make_importer(mock_crd_api)
+
+        server_entry = {"id": "id-0", "name": "server-0"}
+        importer._track_server(server_entry)
+        importer._import_server_entry(server_entry)
+
+        assert next(iter(importer.server_tracking)).skipped is True
+        assert next(iter(importer.server_tracking)).reason == "already_exists"
+        assert importer.imported_count == 0
+
+    def test_update_existing(self, make_importer):
+        """Test that only changed servers are patched when updates are enabled."""
+        mock_crd_api = Mock()
+        mock_crd_api.list_namespaced_custom_object.return_value = {
+            "items": [
+                {
+                    "metadata": {
+                        "name": "server-0",
+                        "annotations": {
+                            "mcp.opendatahub.io/server-detail-hash": server_detail_hash(
+                                {"id": "id-0"}
+                            )
+                        },
+                    }
+                },
+                {
+                    "metadata": {
+                        "name": "renamed-server",
+                        "labels": {"mcp.opendatahub.io/server-id": "id-1"},
+                        "annotations": {
+                            "mcp.opendatahub.io/server-detail-hash": "outdated"
+                        },
+                    }
+                },
+            ]
+        }
+        importer = make_importer(mock_crd_api, update_existing=True)
+
+        for i in range(2):
+            server_entry = {"id": f"id-{i}", "name": f"server-{i}"}
+            importer._track_server(server_entry)
+            importer._import_server_entry(server_entry, {"id": f"id-{i}"})
+
+        assert [s.reason for s in importer.server_tracking] == [
+            "unchanged",
+            "updated",
+        ]
+        assert importer.updated_count == 1
+        assert importer.imported_count == 0
+        mock_crd_api.create_namespaced_custom_object.assert_not_called()
+        patch_kwargs = mock_crd_api.patch_namespaced_custom_object.call_args.kwargs
+        assert patch_kwargs["name"] == "renamed-server"
+        assert patch_kwargs["body"][-1] == {
+            "op": "add",
+            "path": "/spec/server_detail",
+            "value": {"id": "id-1"},
+        }
+        assert importer.inventory.lookup("renamed-server").detail_hash == (
+            server_detail_hash({"id": "id-1"})
+        )
+
+    def test_update_other_server(self, make_importer):
+        """Test that the McpServer of another server ID with the same name is
+        never patched."""
+        mock_crd_api = Mock()
+        mock_crd_api.list_namespaced_custom_object.return_value = {
+            "items": [
+                {
+                    "metadata": {
+                        "name": "foo",
+                        "labels": {"mcp.opendatahub.io/server-id": "id-1"},
+                        "annotations": {
+                            "mcp.opendatahub.io/server-detail-hash": "outdated"
+                        },
+                    }
+                }
+            ]
+        }
+        importer = make_importer(mock_crd_api, update_existing=True)
+
+        server_entry = {"id": "id-2", "name": "foo"}
+        importer._track_server(server_entry)
+        importer._import_server_entry(server_entry, {"id": "id-2"})
+
+        mock_crd_api.patch_namespaced_custom_object.assert_not_called()
+        mock_crd_api.create_namespaced_custom_object.assert_not_called()
+        assert next(iter(importer.server_tracking)).reason == "name_conflict"
+        assert importer.updated_count == 0
+        assert importer.inventory.lookup("foo").detail_hash == "outdated"
+
+    def test_other_server_name(self, make_importer):
+        """Test that a server whose name is taken by the McpServer of another
+        server ID gets its own suffixed McpServer."""
+        mock_crd_api = Mock()
+        mock_crd_api.list_namespaced_custom_object.return_value = {
+            "items": [
+                {
+                    "metadata": {
+                        "name": "foo",
+                        "labels": {"mcp.opendatahub.io/server-id": "id-1"},
+                    }
+                }
+            ]
+        }
+        importer = make_importer(mock_crd_api, update_existing=True)
+
+        server_entry = {"id": "id-2", "name": "Foo"}
+        importer._import_entries([server_entry])
+
+        mock_crd_api.patch_namespaced_custom_object.assert_not_called()
+        body = mock_crd_api.create_namespaced_custom_object.call_args.kwargs["body"]
+        assert body["metadata"]["name"] == sanitize_k8s_name(
+            "Foo", add_hash_suffix=True
+        )
+        assert importer.imported_count == 1
+        assert importer.names.collisions == 1
+
+    def test_update_dry_run(self, make_importer):
+        """Test that changed servers are not patched in dry run mode."""
+        mock_crd_api = Mock()
+        mock_crd_api.list_namespaced_custom_object.return_value = {
+            "items": [{"metadata": {"name": "server-0"}}]
+        }
+        importer = make_importer(mock_crd_api, update_existing=True, dry_run=True)
+
+        server_entry = {"id": "id-0", "name": "server-0"}
+        importer._track_server(server_entry)
+        importer._import_server_entry(server_entry, {"id": "id-0"})
+
+        mock_crd_api.patch_namespaced_custom_object.assert_not_called()
+        assert importer.updated_count == 0
+
+
+class TestIncrementalImport:
+    """Test cases for importing only the servers updated since the last import."""
+
+    @pytest.fixture
+    def incremental_importer(self, make_importer):
+        def make(server_data, **kwargs):
+            importer = make_importer(**kwargs)
+            importer.registry_client.list_servers.return_value = server_data
+            return importer
+
+        return make
+
+    @staticmethod
+    def _servers():
+        return {
+            "servers": [
+                {
+                    "id": "id-0",
+                    "name": "server-0",
+                    "updated_at": "2025-06-01T00:00:00Z",
+                },
+                {
+                    "id": "id-1",
+                    "name": "server-1",
+                    "updated_at": "2025-06-03T00:00:00Z",
+                },
+                {"id": "id-2", "name": "server-2"},
+            ],
+            "metadata": {},
+        }
+
+    def test_only_updated_servers_imported(self, incremental_importer):
+        """Test that unchanged servers are skipped and the mark moves forward."""
+        importer = incremental_importer(
+            self._servers(), max_servers=0, updated_since="2025-06-02T00:00:00Z"
+        )
+        importer.import_next()
+
+        importer.registry_client.list_servers.assert_called_once_with(
+            None, limit=100, updated_since="2025-06-02T00:00:00Z", search=None
+        )
+        assert [s.id for s in importer.server_tracking] == ["id-1", "id-2"]
+        assert importer.walk_complete is True
+        importer.import_status = "completed"
+        assert importer._can_record_high_water_mark() is True
+
+    @patch("importer.importer.client.CoreV1Api")
+    def test_high_water_mark_recorded(self, mock_core_v1_api, incremental_importer):
+        """Test that a complete import records its high-water mark."""
+        importer = incremental_importer(self._servers(), max_servers=0)
+        importer.run()
+        importer.import_status = "completed"
+
+        importer.generate_configmap()
+
+        body = mock_core_v1_api.return_value.create_namespaced_config_map.call_args
+        annotations = body.kwargs["body"]["metadata"]["annotations"]
+        assert annotations["mcp.opendatahub.io/high-water-mark"] == (
+            "2025-06-03T00:00:00Z"
+        )
+        assert annotations["mcp.opendatahub.io/name-filter"] == ""
+
+    def test_no_mark_after_max_servers(self, incremental_importer):
+        """Test that a walk cut by max_servers does not record a mark."""
+        importer = incremental_importer(self._servers(), max_servers=1)
+        importer.run()
+        importer.import_status = "completed"
+
+        assert importer.walk_complete is False
+        assert importer._can_record_high_water_mark() is False
+
+    def test_no_mark_after_errors(self, incremental_importer):
+        """Test that a mark is not recorded when a server failed."""
+        importer = incremental_importer(self._servers(), max_servers=0)
+        importer.crd_api.create_namespaced_custom_object.side_effect = (
+            client.ApiException(status=500)
+        )
+        importer.run()
+        importer.import_status = "completed"
+
+        assert importer._can_record_high_water_mark() is False
@@ -0,0 +1,98 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from importer.incremental import (
+    entry_updated_at,
+    format_timestamp,
+    load_high_water_mark,
+    parse_timestamp,
+)
+
+
+def _configmap(annotations):
+    return SimpleNamespace(metadata=SimpleNamespace(annotations=annotations))
+
+
+class TestTimestamps:
+    """Test cases for the registry update timestamps."""
+
+    def test_parse_timestamp(self):
+        """Test parsing of RFC 3339 timestamps."""
+        expected = datetime(2025, 6, 27, 19, 3, 19, tzinfo=timezone.utc)
+        assert parse_timestamp("2025-06-27T19:03:19Z") == expected
+        assert parse_timestamp("2025-06-27T21:03:19+02:00") == expected
+        assert parse_timestamp("2025-06-27T19:03:19") == expected
+        assert parse_timestamp("not a date") is None
+        assert parse_timestamp(None) is None
+
+    def test_entry_updated_at(self):
+        """Test the lookup of the update time of a server entry."""
+        official = {
+            "_meta": {
+                "io.modelcontextprotocol.registry/official": {
+                    "updated_at": "2025-06-02T00:00:00Z"
+                }
+            },
+            "updated_at": "2025-06-01T00:00:00Z",
+        }
+        assert entry_updated_at(official) == parse_timestamp("2025-06-02T00:00:00Z")
+        assert entry_updated_at(
+            {"version_detail": {"release_date": "2025-05-01T00:00:00Z"}}
+        ) == parse_timestamp("2025-05-01T00:00:00Z")
+        assert entry_updated_at({"name": "server"}) is None
+
+    def test_format_timestamp(self):
+        """Test the UTC formatting of the high-water mark."""
+        assert (
+            format_timestamp(parse_timestamp("2025-06-27T21:03:19+02:00"))
+            == "2025-06-27T19:03:19Z"
+        )
+
+
+class TestLoadHighWaterMark:
+    """Test cases for reading the high-water mark of previous imports."""
+
+    def test_latest_matching_mark(self):
+        """Test that the latest mark of the same registry and filter is used."""
+        registry = "http://localhost:8080/v0"
+        core_v1_api = Mock()
+        core_v1_api.list_namespaced_config_map.return_value = SimpleNamespace(
+            items=[
+                _configmap(
+                    {
+                        "mcp.opendatahub.io/registry": registry,
+                        "mcp.opendatahub.io/high-water-mark": "2025-06-01T00:00:00Z",
+                    }
+                ),
+                _configmap(
+                    {
+                        "mcp.opendatahub.io/registry": registry,
+                        "mcp.opendatahub.io/high-water-mark": "2025-06-03T00:00:00Z",
+                        "mcp.opendatahub.io/name-filter": "other",
+                    }
+                ),
+                _configmap(
+                    {
+                        "mcp.opendatahub.io/registry": "http://other/v0",
+                        "mcp.opendatahub.io/high-water-mark": "2025-06-04T00:00:00Z",
+                    }
+                ),
+                _configmap({"mcp.opendatahub.io/registry": registry}),
+                _configmap(None),
+            ]
+        )
+
+        mark = load_high_water_mark(core_v1_api, "test-ns", "test-catalog", registry)
+
+        assert mark == "2025-06-01T00:00:00Z"
+        core_v1_api.list_namespaced_config_map.assert_called_once_with(
+            namespace="test-ns",
+            label_selector="mcp.opendatahub.io/mcpcatalog=test-catalog",
+        )
+
+    def test_no_mark(self):
+        """Test that no mark is returned before a complete import."""
+        core_v1_api = Mock()
+        core_v1_api.list_namespaced_config_map.return_value = SimpleNamespace(items=[])
+        assert load_high_water_mark(core_v1_api, "ns", "catalog", "url") is None
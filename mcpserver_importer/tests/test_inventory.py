@@ -0,0 +1,133 @@
+from unittest.mock import Mock
+
+from importer.inventory import (
+    LIST_PAGE_SIZE,
+    McpServerInventory,
+    catalog_label_selector,
+    load_inventory,
+    patch_params,
+    server_detail_hash,
+)
+
+
+def _mcp_server(name, server_id=None):
+    labels = {"mcp.opendatahub.io/server-id": server_id} if server_id else {}
+    return {"metadata": {"name": name, "labels": labels}}
+
+
+class TestMcpServerInventory:
+    """Test cases for the index of existing McpServer resources."""
+
+    def test_contains_by_name_and_server_id(self):
+        """Test lookups by name and by registry server-id."""
+        inventory = McpServerInventory()
+        inventory.add(_mcp_server("server-a", "id-a"))
+        inventory.add(_mcp_server("server-b"))
+
+        assert inventory.contains("server-a")
+        assert inventory.contains("server-b", "id-b")
+        assert inventory.contains("renamed-server", "id-a")
+        assert not inventory.contains("server-c", "id-c")
+        assert not inventory.contains("server-c", None)
+        assert len(inventory) == 2
+
+    def test_catalog_label_selector(self):
+        """Test the label selector of the catalog resources."""
+        assert (
+            catalog_label_selector("my-catalog")
+            == "mcp.opendatahub.io/mcpcatalog=my-catalog"
+        )
+
+
+class TestServerUpdates:
+    """Test cases for the change detection and update of existing servers."""
+
+    def test_server_detail_hash_ignores_key_order(self):
+        """Test that the hash only depends on the content of the detail."""
+        assert server_detail_hash({"a": 1, "b": [1, 2]}) == server_detail_hash(
+            {"b": [1, 2], "a": 1}
+        )
+        assert server_detail_hash({"a": 1}) != server_detail_hash({"a": 2})
+
+    def test_lookup_records_hash(self):
+        """Test that the recorded hash is exposed by lookups."""
+        inventory = McpServerInventory()
+        mcp_server = _mcp_server("server-a", "id-a")
+        mcp_server["metadata"]["annotations"] = {
+            "mcp.opendatahub.io/server-detail-hash": "abc"
+        }
+        inventory.add(mcp_server)
+
+        assert inventory.lookup("renamed-server", "id-a").detail_hash == "abc"
+        assert inventory.lookup("server-b") is None
+
+    def test_patch_params(self):
+        """Test the JSON patch replacing the server detail."""
+        inventory = McpServerInventory()
+        inventory.add(_mcp_server("server-a", "id-a"))
+        mcp_server = {
+            "metadata": {
+                "annotations": {"mcp.opendatahub.io/server-detail-hash": "abc"}
+            },
+            "spec": {"server_detail": {"id": "id-a"}},
+        }
+
+        params = patch_params(
+            "test-namespace", inventory.lookup("x", "id-a"), mcp_server
+        )
+
+        assert params["name"] == "server-a"
+        assert params["_content_type"] == "application/json-patch+json"
+        assert params["body"] == [
+            {
+                "op": "add",
+                "path": "/metadata/annotations",
+                "value": {"mcp.opendatahub.io/server-detail-hash": "abc"},
+            },
+            {"op": "add", "path": "/spec/server_detail", "value": {"id": "id-a"}},
+        ]
+
+        inventory.add(
+            {
+                "metadata": {
+                    "name": "server-b",
+                    "annotations": {"owner": "someone"},
+                }
+            }
+        )
+        params = patch_params(
+            "test-namespace", inventory.lookup("server-b"), mcp_server
+        )
+
+        assert params["body"][0] == {
+            "op": "add",
+            "path": "/metadata/annotations/mcp.opendatahub.io~1server-detail-hash",
+            "value": "abc",
+        }
+
+
+class TestLoadInventory:
+    """Test cases for listing the existing McpServer resources."""
+
+    def test_load_inventory_pages(self):
+        """Test that all the pages of the list are consumed."""
+        crd_api = Mock()
+        crd_api.list_namespaced_custom_object.side_effect = [
+            {
+                "items": [_mcp_server("server-a", "id-a")],
+                "metadata": {"continue": "token"},
+            },
+            {"items": [_mcp_server("server-b", "id-b")], "metadata": {}},
+        ]
+
+        inventory = load_inventory(crd_api, "test-namespace", "test-catalog")
+
+        assert inventory.names == {"server-a", "server-b"}
+        assert inventory.server_ids == {"id-a", "id-b"}
+        calls = crd_api.list_namespaced_custom_object.call_args_list
+        assert [c.kwargs["_continue"] for c in calls] == [None, "token"]
+        assert all(c.kwargs["limit"] == LIST_PAGE_SIZE for c in calls)
+        assert all(
+            c.kwargs["label_selector"] == "mcp.opendatahub.io/mcpcatalog=test-catalog"
+            for c in calls
+        )
@@ -0,0 +1,132 @@
+import asyncio
+from unittest.mock import Mock, patch
+
+import pytest
+from kubernetes import client
+
+from importer import metrics
+from importer.throttle import Throttle
+
+
+def _sample(name, **labels):
+    return metrics.REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def importer(make_importer):
+    return make_importer(throttle=Throttle(qps=0))
+
+
+class TestHelpers:
+    """Test cases for the labels of the metrics."""
+
+    def test_request_kind(self):
+        """Test that pages and server details are told apart."""
+        assert metrics.request_kind("servers?limit=100") == "page"
+        assert metrics.request_kind("servers/abc") == "detail"
+
+    def test_server_result(self):
+        """Test that the result of a server is its skip reason if any."""
+        assert metrics.server_result(False, None) == "created"
+        assert metrics.server_result(False, "updated") == "updated"
+        assert metrics.server_result(True, "api_error") == "api_error"
+        assert metrics.server_result(True, None) == "skipped"
+
+
+class TestImporterMetrics:
+    """Test cases for the metrics recorded by the importer."""
+
+    def test_created_server(self, importer):
+        """Test that a created server counts a detail fetch and a creation."""
+        fetches = _sample("mcp_importer_detail_fetches_total", result="ok")
+        created = _sample("mcp_importer_servers_total", result="created")
+        calls = _sample("mcp_importer_kube_request_seconds_count", operation="call")
+
+        server_entry = {"id": "id-0", "name": "server-0"}
+        importer._track_server(server_entry)
+        importer._import_server_entry(server_entry)
+
+        assert _sample("mcp_importer_detail_fetches_total", result="ok") == fetches + 1
+        assert _sample("mcp_importer_servers_total", result="created") == created + 1
+        # Existence check and creation, the Mock methods have no name
+        assert (
+            _sample("mcp_importer_kube_request_seconds_count", operation="call")
+            == calls + 2
+        )
+        assert _sample("mcp_importer_kube_requests_in_flight") == 0
+
+    def test_api_error(self, importer):
+        """Test that a failed creation counts under its skip reason."""
+        importer.crd_api._api.create_namespaced_custom_object.side_effect = (
+            client.ApiException(status=500)
+        )
+        errors = _sample("mcp_importer_servers_total", result="api_error")
+
+        server_entry = {"id": "id-1", "name": "server-1"}
+        importer._track_server(server_entry)
+        importer._import_server_entry(server_entry)
+
+        assert _sample("mcp_importer_servers_total", result="api_error") == errors + 1
+
+    def test_async_api_latency(self):
+        """Test that the awaited calls are measured by their method name."""
+
+        async def patch_namespaced_custom_object(**kwargs):
+            return {}
+
+        api = Mock(patch_namespaced_custom_object=patch_namespaced_custom_object)
+        before = _sample(
+            "mcp_importer_kube_request_seconds_count",
+            operation="patch_namespaced_custom_object",
+        )
+
+        asyncio.run(
+            Throttle(qps=0).wrap_async(api).patch_namespaced_custom_object(name="x")
+        )
+
+        assert (
+            _sample(
+                "mcp_importer_kube_request_seconds_count",
+                operation="patch_namespaced_custom_object",
+            )
+            == before + 1
+        )
+
+
+class TestExport:
+    """Test cases for the export of the metrics at the end of the import."""
+
+    def test_textfile(self, tmp_path, monkeypatch):
+        """Test that the metrics are written to METRICS_TEXTFILE."""
+        path = tmp_path / "importer.prom"
+        monkeypatch.setenv("METRICS_TEXTFILE", str(path))
+        monkeypatch.delenv("PUSHGATEWAY_URL", raising=False)
+
+        metrics.export_from_env("test-catalog", "test-job", 12.5)
+
+        assert "mcp_importer_duration_seconds 12.5" in path.read_text()
+
+    @patch("importer.metrics.push_to_gateway")
+    def test_pushgateway(self, mock_push, monkeypatch):
+        """Test that the metrics are pushed grouped by catalog and import job."""
+        monkeypatch.delenv("METRICS_TEXTFILE", raising=False)
+        monkeypatch.setenv("PUSHGATEWAY_URL", "pushgateway:9091")
+
+        metrics.export_from_env("test-catalog", "test-job", 1.0)
+
+        mock_push.assert_called_once_with(
+            "pushgateway:9091",
+            job="mcpserver-importer",
+            registry=metrics.REGISTRY,
+            grouping_key={"catalog": "test-catalog", "import_job": "test-job"},
+        )
+
+    @patch("importer.metrics.push_to_gateway", side_effect=OSError("refused"))
+    def test_push_failure_ignored(self, mock_push, monkeypatch):
+        """Test that a failed push does not fail the import."""
+        monkeypatch.delenv("METRICS_TEXTFILE", raising=False)
+        monkeypatch.setenv("PUSHGATEWAY_URL", "pushgateway:9091")
+
+        metrics.export_from_env("test-catalog", "test-job", 1.0)
+
+        mock_push.assert_called_once()
@@ -0,0 +1,57 @@
+from importer.inventory import McpServerInventory
+from importer.names import NameSanitizer
+from importer.utils import sanitize_k8s_name
+
+
+class TestNameSanitizer:
+    """Test cases for the McpServer names of the registry entries."""
+
+    def test_memoized(self):
+        """Test that a registry name is sanitized once."""
+        names = NameSanitizer()
+
+        assert names.name("io.github.acme/Server") == "io-github-acme-server"
+        assert names.name("io.github.acme/Server") == "io-github-acme-server"
+        assert names.collisions == 0
+
+    def test_collision_suffix(self):
+        """Test that only the later colliding names get a hash suffix, the same
+        for the same registry name."""
+        names = NameSanitizer()
+
+        assert names.sanitize_page(
+            [{"name": "acme/server"}, {"name": "acme.server"}, {"name": "acme/server"}]
+        ) == [
+            "acme-server",
+            sanitize_k8s_name("acme.server", add_hash_suffix=True),
+            "acme-server",
+        ]
+        assert names.collisions == 1
+
+    def test_missing_name(self):
+        """Test that a missing name has an empty McpServer name."""
+        names = NameSanitizer()
+
+        assert names.sanitize_page([{"id": "id-0"}, {"name": ""}]) == ["", ""]
+
+    def test_inventory_collision(self):
+        """Test that the name of the McpServer of another server ID is never
+        given, whatever the registry names seen by the import."""
+        inventory = McpServerInventory()
+        inventory.add(
+            {
+                "metadata": {
+                    "name": "acme-server",
+                    "labels": {"mcp.opendatahub.io/server-id": "id-1"},
+                }
+            }
+        )
+        names = NameSanitizer(inventory)
+
+        assert names.sanitize_page(
+            [
+                {"id": "id-2", "name": "acme.server"},
+                {"id": "id-1", "name": "acme/server"},
+            ]
+        ) == [sanitize_k8s_name("acme.server", add_hash_suffix=True), "acme-server"]
+        assert names.collisions == 1
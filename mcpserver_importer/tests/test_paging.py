@@ -0,0 +1,66 @@
+from importer.paging import PageSizer
+
+
+class TestPageSizer:
+    """Test cases for the adaptive size of the registry pages."""
+
+    def test_budget_caps_limit(self):
+        """Test that the limit never exceeds the remaining budget."""
+        sizer = PageSizer(initial=100)
+
+        assert sizer.next_limit(10) == 10
+        assert sizer.next_limit(0) == 1
+        assert sizer.next_limit() == 100
+        assert sizer.sizes == [10, 1, 100]
+
+    def test_shrink_on_slow_or_large_pages(self):
+        """Test that slow and large pages halve the size, down to the minimum."""
+        sizer = PageSizer(initial=100, min_size=30, target_latency=1.0, max_bytes=1000)
+
+        sizer.record(100, 100, 1.5)
+        assert sizer.size == 50
+        sizer.record(50, 50, 0.1, size_bytes=2000)
+        assert sizer.size == 30
+
+    def test_grow_on_fast_full_pages(self):
+        """Test that fast full pages double the size, up to the maximum."""
+        sizer = PageSizer(initial=40, max_size=100, target_latency=1.0)
+
+        sizer.record(40, 40, 0.1, size_bytes=100)
+        assert sizer.size == 80
+        # Last page of the registry, not full
+        sizer.record(80, 12, 0.1)
+        assert sizer.size == 80
+        sizer.record(80, 80, 0.1)
+        assert sizer.size == 100
+
+    def test_budget_capped_page_does_not_grow(self):
+        """Test that a page capped by the budget says nothing about the size."""
+        sizer = PageSizer(initial=50)
+
+        sizer.record(5, 5, 0.01)
+
+        assert sizer.size == 50
+
+
+class TestPageBudget:
+    """Test cases for pushing the max_servers budget down to the registry."""
+
+    def test_budget(self, make_importer):
+        """Test the budget left by the imported and pending entries."""
+        importer = make_importer(max_servers=10)
+        importer.imported_servers = 4
+
+        assert importer._page_budget() == 6
+        assert importer._page_budget(pending=5) == 1
+
+    def test_no_budget_with_client_side_filtering(self, make_importer):
+        """Test that filtered or unlimited imports do not cap the pages."""
+        assert make_importer(max_servers=0)._page_budget() is None
+        assert make_importer(max_servers=10, name_filter="x")._page_budget() is None
+        assert (
+            make_importer(
+                max_servers=10, updated_since="2025-06-02T00:00:00Z"
+            )._page_budget()
+            is None
+        )
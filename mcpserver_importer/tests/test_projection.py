@@ -0,0 +1,97 @@
+from unittest.mock import patch
+
+from importer.inventory import server_detail_hash
+from importer.projection import DetailProjection, json_size
+
+SERVER_DETAIL = {
+    "id": "id-0",
+    "name": "io.github.acme/server",
+    "description": "Acme server",
+    "repository": {"url": "https://github.com/acme/server", "source": "github"},
+    "packages": [{"registry_name": "npm", "name": "@acme/server"}],
+    "readme": "x" * 4096,
+}
+
+
+class TestDetailProjection:
+    """Test cases for the projection of the server details."""
+
+    def test_disabled(self):
+        """Test that the whole detail is kept by default."""
+        projection = DetailProjection()
+
+        assert projection.project(SERVER_DETAIL) == (SERVER_DETAIL, [])
+
+    def test_fields(self):
+        """Test that only the listed fields are kept, when present."""
+        projection = DetailProjection(fields=("name", "description", "remotes"))
+
+        detail, dropped = projection.project(SERVER_DETAIL)
+
+        assert detail == {"name": "io.github.acme/server", "description": "Acme server"}
+        assert dropped == []
+        assert projection.as_dict()["server_detail_saved_kb"] > 4
+
+    def test_large_fields_dropped(self):
+        """Test that the fields larger than the limit are dropped."""
+        projection = DetailProjection(max_field_kb=1)
+
+        detail, dropped = projection.project(SERVER_DETAIL)
+
+        assert "readme" not in detail
+        assert dropped == ["readme"]
+        assert "readme" in SERVER_DETAIL
+        assert projection.as_dict()["dropped_fields"] == {"readme": 1}
+
+    def test_from_env(self):
+        """Test the settings read from the environment."""
+        with patch.dict(
+            "os.environ",
+            {
+                "SERVER_DETAIL_FIELDS": "name, packages,",
+                "SERVER_DETAIL_MAX_FIELD_KB": "64",
+            },
+        ):
+            projection = DetailProjection.from_env()
+
+        assert projection.fields == ("name", "packages")
+        assert projection.max_field_bytes == 64 * 1024
+
+
+class TestImporterProjection:
+    """Test cases for the McpServer resources built with a projection."""
+
+    def test_projected_mcp_server(self, make_importer):
+        """Test that the stored detail, its hash and the annotation follow the
+        projection."""
+        importer = make_importer(
+            projection=DetailProjection(fields=("name", "readme"), max_field_kb=1)
+        )
+
+        mcp_server = importer._build_mcp_server(
+            {"id": "id-0"}, "io-github-acme-server", SERVER_DETAIL
+        )
+
+        assert mcp_server["spec"]["server_detail"] == {"name": "io.github.acme/server"}
+        annotations = mcp_server["metadata"]["annotations"]
+        assert annotations["mcp.opendatahub.io/dropped-fields"] == "readme"
+        assert annotations["mcp.opendatahub.io/server-detail-hash"] == (
+            server_detail_hash({"name": "io.github.acme/server"})
+        )
+
+    def test_object_sizes(self, make_importer):
+        """Test that the sizes of the built resources are reported."""
+        importer = make_importer(projection=None)
+
+        mcp_server = importer._build_mcp_server(
+            {"id": "id-0"}, "io-github-acme-server", SERVER_DETAIL
+        )
+
+        sizes = importer.projection.as_dict()
+        assert sizes["count"] == 1
+        assert sizes["max_kb"] == round(json_size(mcp_server) / 1024, 1)
+        assert "dropped_fields" not in sizes
+        assert (
+            "mcp.opendatahub.io/dropped-fields"
+            not in mcp_server["metadata"]["annotations"]
+        )
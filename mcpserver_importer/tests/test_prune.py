@@ -0,0 +1,163 @@
+from unittest.mock import Mock
+
+import pytest
+from kubernetes import client
+
+from importer.inventory import McpServerInventory
+from importer.prune import Pruner
+
+
+def _mcp_server(index, orphaned_since=None):
+    annotations = {"mcp.opendatahub.io/server-detail-hash": "hash"}
+    if orphaned_since:
+        annotations["mcp.opendatahub.io/orphaned-since"] = orphaned_since
+    return {
+        "metadata": {
+            "name": f"server-{index}",
+            "labels": {"mcp.opendatahub.io/server-id": f"id-{index}"},
+            "annotations": annotations,
+        }
+    }
+
+
+def _inventory(count, **orphaned):
+    inventory = McpServerInventory()
+    for i in range(count):
+        inventory.add(_mcp_server(i, orphaned.get(f"id_{i}")))
+    return inventory
+
+
+def _pruner(action="delete", seen=10, max_fraction=0.2):
+    pruner = Pruner(action=action, max_fraction=max_fraction)
+    for i in range(seen):
+        pruner.see({"id": f"id-{i}"})
+    return pruner
+
+
+def _names(plan):
+    return [(record.name, restore) for record, restore in plan]
+
+
+class TestPruner:
+    """Test cases for the pruning of the orphaned McpServers."""
+
+    def test_plan(self):
+        """Test that only the owned McpServers not seen are pruned."""
+        pruner = _pruner(seen=8)
+
+        plan = pruner.plan(_inventory(10), owns=lambda server_id: True)
+
+        assert _names(plan) == [("server-8", False), ("server-9", False)]
+        assert pruner.stats["orphans"] == 2
+        assert pruner.plan(_inventory(10), owns=lambda server_id: False) == []
+
+    def test_max_fraction(self):
+        """Test that nothing is pruned when too many servers are orphaned."""
+        pruner = _pruner(seen=7)
+
+        assert pruner.plan(_inventory(10), owns=lambda server_id: True) == []
+        assert "PRUNE_MAX_FRACTION" in pruner.stats["skipped"]
+
+    def test_flag_and_restore(self):
+        """Test that flagged servers are not flagged again, and are restored
+        once listed again."""
+        pruner = _pruner(action="flag", seen=8)
+        inventory = _inventory(
+            10, id_2="2025-06-01T00:00:00Z", id_9="2025-06-01T00:00:00Z"
+        )
+
+        plan = pruner.plan(inventory, owns=lambda server_id: True)
+
+        assert _names(plan) == [("server-8", False), ("server-2", True)]
+        method, params = pruner.request("test-namespace", *plan[0])
+        assert method == "patch_namespaced_custom_object"
+        assert params["body"]["metadata"]["annotations"][
+            "mcp.opendatahub.io/orphaned-since"
+        ]
+        _, params = pruner.request("test-namespace", *plan[1])
+        assert params["body"] == {
+            "metadata": {"annotations": {"mcp.opendatahub.io/orphaned-since": None}}
+        }
+
+    def test_prune(self):
+        """Test that the orphans are deleted, already deleted ones included."""
+        pruner = _pruner(seen=8)
+        crd_api = Mock()
+        crd_api.delete_namespaced_custom_object.side_effect = [
+            None,
+            client.ApiException(status=404),
+        ]
+
+        pruner.prune(crd_api, "test-namespace", _inventory(10), lambda server_id: True)
+
+        deleted = [
+            c.kwargs["name"] for c in crd_api.delete_namespaced_custom_object.mock_calls
+        ]
+        assert sorted(deleted) == ["server-8", "server-9"]
+        assert pruner.stats["pruned"] == 2
+        assert pruner.stats["errors"] == 0
+
+    def test_prune_errors(self):
+        """Test that failed deletes are counted."""
+        pruner = _pruner(seen=9)
+        crd_api = Mock()
+        crd_api.delete_namespaced_custom_object.side_effect = client.ApiException(
+            status=403
+        )
+
+        pruner.prune(crd_api, "test-namespace", _inventory(10), lambda server_id: True)
+
+        assert pruner.stats["pruned"] == 0
+        assert pruner.stats["errors"] == 1
+
+    def test_invalid_action(self):
+        """Test that an unknown action is rejected."""
+        with pytest.raises(ValueError):
+            Pruner(action="archive")
+
+
+class TestImporterPrune:
+    """Test cases for the full sync of an import."""
+
+    @pytest.fixture
+    def sync_importer(self, make_importer):
+        def make(**kwargs):
+            crd_api = Mock()
+            crd_api.list_namespaced_custom_object.return_value = {
+                "items": [_mcp_server(i) for i in range(3)]
+            }
+            importer = make_importer(
+                crd_api,
+                max_servers=0,
+                pruner=Pruner(max_fraction=0.5),
+                **kwargs,
+            )
+            importer.registry_client.list_servers.return_value = {
+                "servers": [{"id": f"id-{i}", "name": f"server-{i}"} for i in range(2)],
+                "metadata": {},
+            }
+            return importer, crd_api
+
+        return make
+
+    def test_full_sync(self, sync_importer):
+        """Test that the servers no longer listed are deleted after the walk."""
+        importer, crd_api = sync_importer()
+
+        importer.run()
+
+        crd_api.delete_namespaced_custom_object.assert_called_once()
+        assert (
+            crd_api.delete_namespaced_custom_object.call_args.kwargs["name"]
+            == "server-2"
+        )
+        assert importer.pruner.stats["pruned"] == 1
+
+    def test_filtered_import(self, sync_importer):
+        """Test that a filtered import does not prune anything."""
+        importer, crd_api = sync_importer(name_filter="server-*")
+
+        importer.run()
+
+        crd_api.delete_namespaced_custom_object.assert_not_called()
+        assert importer.pruner.stats["skipped"] == "the servers are filtered by name"
@@ -0,0 +1,211 @@
+import io
+import json
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import Mock, patch
+
+import ijson
+import pytest
+import requests
+import urllib3
+
+from importer.http_cache import HttpCache
+from importer.registry import (
+    RegistryClient,
+    StreamedPage,
+    backoff_delay,
+    parse_retry_after,
+)
+
+
+def _response(status_code, json_data=None, headers=None):
+    response = Mock(content=b"")
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = json_data
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            f"{status_code} Error"
+        )
+    else:
+        response.raise_for_status.return_value = None
+    return response
+
+
+class TestBackoff:
+    """Test cases for the retry delays."""
+
+    def test_parse_retry_after_seconds(self):
+        """Test Retry-After given in seconds."""
+        assert parse_retry_after("3") == 3.0
+        assert parse_retry_after("-1") == 0.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("invalid") is None
+
+    def test_parse_retry_after_http_date(self):
+        """Test Retry-After given as an HTTP date."""
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=60)
+        delay = parse_retry_after(format_datetime(retry_at, usegmt=True))
+        assert 55 <= delay <= 60
+
+    def test_backoff_delay_bounds(self):
+        """Test the jittered exponential backoff bounds."""
+        for attempt in range(10):
+            delay = backoff_delay(attempt, base=0.5, max_delay=30.0)
+            assert 0 <= delay <= min(30.0, 0.5 * 2**attempt)
+
+    def test_backoff_delay_retry_after(self):
+        """Test that Retry-After takes precedence, capped to the max delay."""
+        assert backoff_delay(0, retry_after=7, max_delay=30.0) == 7
+        assert backoff_delay(0, retry_after=120, max_delay=30.0) == 30.0
+
+
+class TestRetryDelay:
+    """Test cases for the retry decisions shared by the import engines."""
+
+    def test_retry_delay(self):
+        """Test that only transient failures are retried, up to max_retries."""
+        registry = RegistryClient("http://localhost:8080/v0", max_retries=1)
+
+        assert registry.retry_delay("url", 0, 503, "2") == 2.0
+        assert registry.retry_delay("url", 0, error=OSError("reset")) is not None
+        assert registry.retry_delay("url", 0, 404) is None
+        assert registry.retry_delay("url", 0, 200) is None
+        assert registry.retry_delay("url", 1, 503) is None
+
+
+class TestRegistryClient:
+    """Test cases for the pooled registry client."""
+
+    def test_session_pool(self):
+        """Test that a single session with the configured pool is used."""
+        registry = RegistryClient("http://localhost:8080/v0/", pool_size=4)
+        adapter = registry.session.get_adapter("http://localhost:8080/v0")
+        assert registry.base_url == "http://localhost:8080/v0"
+        assert adapter._pool_maxsize == 4
+
+    def test_page_path(self):
+        """Test the path of the registry pages."""
+        registry = RegistryClient("http://localhost:8080/v0")
+        assert registry.page_path() == "servers?limit=100"
+        assert registry.page_path("abc", 10) == "servers?limit=10&cursor=abc"
+
+    @patch("importer.registry.time.sleep")
+    def test_retry_on_transient_status(self, mock_sleep):
+        """Test that transient statuses are retried honoring Retry-After."""
+        registry = RegistryClient("http://localhost:8080/v0")
+        registry.session.get = Mock(
+            side_effect=[
+                _response(503, headers={"Retry-After": "2"}),
+                _response(200, {"id": "test-id"}),
+            ]
+        )
+
+        assert registry.get_server("test-id") == {"id": "test-id"}
+        assert registry.session.get.call_count == 2
+        mock_sleep.assert_called_once_with(2.0)
+
+    @patch("importer.registry.time.sleep")
+    def test_retry_on_connection_error(self, mock_sleep):
+        """Test that connection errors are retried."""
+        registry = RegistryClient("http://localhost:8080/v0")
+        registry.session.get = Mock(
+            side_effect=[
+                requests.exceptions.ConnectionError("reset"),
+                _response(200, {"servers": []}),
+            ]
+        )
+
+        assert registry.list_servers() == {"servers": []}
+        mock_sleep.assert_called_once()
+
+    @patch("importer.registry.time.sleep")
+    def test_retries_exhausted(self, mock_sleep):
+        """Test that the error is raised once the retries are exhausted."""
+        registry = RegistryClient("http://localhost:8080/v0", max_retries=2)
+        registry.session.get = Mock(return_value=_response(502))
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            registry.get_server("test-id")
+        assert registry.session.get.call_count == 3
+        assert mock_sleep.call_count == 2
+
+    @patch("importer.registry.time.sleep")
+    def test_no_retry_on_client_error(self, mock_sleep):
+        """Test that non-transient errors are not retried."""
+        registry = RegistryClient("http://localhost:8080/v0")
+        registry.session.get = Mock(return_value=_response(404))
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            registry.get_server("test-id")
+        assert registry.session.get.call_count == 1
+        mock_sleep.assert_not_called()
+
+    def test_cached_server_revalidated(self, tmp_path):
+        """Test that a 304 response reuses the cached server detail."""
+        cache = HttpCache(str(tmp_path))
+        registry = RegistryClient("http://localhost:8080/v0", cache=cache)
+        fresh = _response(200, {"id": "test-id"}, headers={"ETag": '"v1"'})
+        fresh.content = b'{"id": "test-id", "cached": true}'
+        registry.session.get = Mock(side_effect=[fresh, _response(304)])
+
+        assert registry.get_server("test-id") == {"id": "test-id"}
+        assert registry.get_server("test-id") == {"id": "test-id", "cached": True}
+
+        second_call = registry.session.get.call_args_list[1]
+        assert second_call.kwargs["headers"] == {"If-None-Match": '"v1"'}
+        assert cache.hits == 1
+
+
+def _streamed_page(body: bytes) -> StreamedPage:
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = urllib3.HTTPResponse(body=io.BytesIO(body), preload_content=False)
+    return StreamedPage(response)
+
+
+class TestStreamedPage:
+    """Test cases for the incremental parsing of registry pages."""
+
+    def test_servers_and_cursor(self):
+        """Test that entries are yielded one by one with their nested fields."""
+        servers = [
+            {"id": "id-0", "name": "a", "remotes": [{"url": "http://a"}], "score": 1.5},
+            {"id": "id-1", "name": "b", "meta": {"tags": ["x", "y"]}},
+        ]
+        page = _streamed_page(
+            json.dumps(
+                {"servers": servers, "metadata": {"next_cursor": "next"}}
+            ).encode()
+        )
+
+        entries = page.servers()
+        assert next(entries) == servers[0]
+        assert page.next_cursor is None
+        assert list(entries) == servers[1:]
+        assert page.has_servers
+        assert page.next_cursor == "next"
+
+    def test_missing_servers(self):
+        """Test that a page without a servers list is reported."""
+        page = _streamed_page(b'{"metadata": {"next_cursor": null}}')
+
+        assert list(page.servers()) == []
+        assert not page.has_servers
+
+    def test_invalid_json(self):
+        """Test that a truncated page raises a JSON error."""
+        page = _streamed_page(b'{"servers": [{"id": "id-0"}, {"id"')
+
+        with pytest.raises(ijson.JSONError):
+            list(page.servers())
+
+    @patch("importer.registry.requests.Session.get")
+    def test_stream_servers(self, mock_get):
+        """Test that pages are requested without reading their body."""
+        mock_get.return_value = _response(200)
+
+        RegistryClient("http://localhost:8080/v0").stream_servers("abc")
+
+        assert mock_get.call_args.kwargs["stream"] is True
+        assert mock_get.call_args.args[0].endswith("servers?limit=100&cursor=abc")
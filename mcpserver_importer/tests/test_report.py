@@ -0,0 +1,189 @@
+import base64
+import gzip
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+
+from importer.importer import Importer
+from importer.report import (
+    REPORT_PART_LABEL,
+    SERVERS_KEY,
+    build_report,
+    load_yaml,
+    pack_servers,
+    read_servers,
+)
+
+
+def _servers(count):
+    return [
+        {
+            "id": f"id-{i}",
+            "name": f"server-{i}",
+            "skipped": i % 2 == 0,
+            "reason": "already_exists" if i % 2 == 0 else None,
+        }
+        for i in range(count)
+    ]
+
+
+def _configmap():
+    return {
+        "apiVersion": "v1",
+        "kind": "ConfigMap",
+        "metadata": {
+            "name": "mcp-import-1234abcd",
+            "namespace": "test-namespace",
+            "labels": {"mcp.opendatahub.io/mcpserverimportjob": "test-job"},
+        },
+    }
+
+
+def _core_v1_api(configmaps):
+    by_name = {
+        body["metadata"]["name"]: SimpleNamespace(binary_data=body.get("binaryData"))
+        for body in configmaps
+    }
+    core_v1_api = Mock()
+    core_v1_api.read_namespaced_config_map.side_effect = lambda name, namespace: (
+        by_name[name]
+    )
+    return core_v1_api, by_name
+
+
+class TestPackServers:
+    """Test cases for the compressed servers of the compact reports."""
+
+    def test_single_part(self):
+        """Test that the servers are gzip-compressed JSON lines."""
+        servers = _servers(3)
+
+        payloads = pack_servers(servers)
+
+        assert len(payloads) == 1
+        assert gzip.decompress(payloads[0]).count(b"\n") == 2
+
+    def test_split_in_parts(self):
+        """Test that the servers are split in parts fitting in the budget."""
+        servers = _servers(2000)
+
+        payloads = pack_servers(servers, budget=4096)
+
+        assert len(payloads) > 1
+        assert all(len(base64.b64encode(payload)) <= 4096 for payload in payloads)
+
+
+class TestBuildReport:
+    """Test cases for the ConfigMaps of the execution reports."""
+
+    def test_inline(self):
+        """Test that a small summary is written inline, as before."""
+        summary = {"status": "completed", "imported_servers": _servers(2)}
+
+        execution_yaml, configmaps = build_report(_configmap(), summary)
+
+        assert len(configmaps) == 1
+        assert "binaryData" not in configmaps[0]
+        assert load_yaml(configmaps[0]["data"]["execution.yaml"]) == summary
+        assert configmaps[0]["data"]["execution.yaml"] == execution_yaml
+
+    def test_compact(self):
+        """Test that the compact summary keeps counts and moves the servers."""
+        servers = _servers(4)
+        summary = {"status": "completed", "imported_servers": servers}
+
+        execution_yaml, configmaps = build_report(_configmap(), summary, "compact")
+
+        execution = load_yaml(execution_yaml)
+        assert "imported_servers" not in execution
+        assert execution["servers"] == {
+            "total": 4,
+            "skipped": 2,
+            "reasons": {"already_exists": 2},
+        }
+        assert execution["report"]["configmaps"] == ["mcp-import-1234abcd"]
+        core_v1_api, by_name = _core_v1_api(configmaps)
+        assert (
+            read_servers(
+                core_v1_api, "test-namespace", execution, by_name["mcp-import-1234abcd"]
+            )
+            == servers
+        )
+
+    @patch("importer.report.PART_BUDGET", 4096)
+    def test_auto_sharded(self):
+        """Test that servers too large for one ConfigMap are sharded, the
+        execution ConfigMap last."""
+        servers = _servers(20000)
+        summary = {"status": "completed", "imported_servers": servers}
+
+        execution_yaml, configmaps = build_report(_configmap(), summary)
+
+        assert len(configmaps) > 2
+        execution_configmap = configmaps[-1]
+        assert execution_configmap["metadata"]["name"] == "mcp-import-1234abcd"
+        assert all(
+            body["metadata"]["labels"][REPORT_PART_LABEL] == "mcp-import-1234abcd"
+            and SERVERS_KEY in body["binaryData"]
+            for body in configmaps[:-1]
+        )
+        execution = load_yaml(execution_yaml)
+        core_v1_api, by_name = _core_v1_api(configmaps)
+        assert (
+            read_servers(
+                core_v1_api, "test-namespace", execution, by_name["mcp-import-1234abcd"]
+            )
+            == servers
+        )
+
+    def test_invalid_format(self):
+        """Test that an unknown format is rejected."""
+        with pytest.raises(ValueError):
+            build_report(_configmap(), {}, "json")
+
+
+class TestImporterReport:
+    """Test cases for the report of an import."""
+
+    @patch("importer.importer.client.CoreV1Api")
+    def test_compact_report(self, mock_core_v1_api):
+        """Test that the compact summary keeps the status and the timings."""
+        importer = Importer(
+            crd_api=Mock(),
+            catalog_name="test-catalog",
+            import_job_name="test-job",
+            mcp_registry_url="http://localhost:8080/v0",
+            namespace="test-namespace",
+            registry_client=Mock(cache=None),
+            report_format="compact",
+        )
+        importer.import_status = "completed"
+        importer._set_server_outcome({"id": "id-0", "name": "server-0"}, False)
+
+        importer.generate_configmap()
+
+        body = mock_core_v1_api.return_value.create_namespaced_config_map.call_args
+        configmap = body.kwargs["body"]
+        execution = load_yaml(configmap["data"]["execution.yaml"])
+        assert execution["status"] == "completed"
+        assert execution["servers"]["total"] == 1
+        assert "timings" in execution
+        assert read_servers(
+            Mock(),
+            "test-namespace",
+            execution,
+            SimpleNamespace(binary_data=configmap["binaryData"]),
+        ) == [{"id": "id-0", "name": "server-0", "skipped": False, "reason": None}]
+
+    def test_invalid_format(self):
+        """Test that an unknown format is rejected before the import."""
+        with pytest.raises(ValueError):
+            Importer(
+                crd_api=Mock(),
+                catalog_name="test-catalog",
+                import_job_name="test-job",
+                mcp_registry_url="http://localhost:8080/v0",
+                registry_client=Mock(),
+                report_format="json",
+            )
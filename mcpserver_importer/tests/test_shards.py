@@ -0,0 +1,197 @@
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+import yaml
+
+from importer.filters import NameFilter
+from importer.importer import Importer
+from importer.report import build_report
+from importer.shards import merge_shards, merge_summaries, shard_from_env, shard_of
+
+
+def _summary(index, status="completed", mark="2025-06-01T00:00:00Z", **kwargs):
+    summary = {
+        "catalog_name": "test-catalog",
+        "registry_uri": "http://localhost:8080/v0",
+        "importjob_name": "test-job",
+        "timestamp": f"2025-06-0{index + 1}T00:00:00",
+        "duration_sec": 10.0 + index,
+        "name_filter": None,
+        "high_water_mark": mark,
+        "status": status,
+        "imported_count": 1,
+        "updated_count": 0,
+        "imported_servers": [{"id": f"id-{index}"}],
+        "shard": {"index": index, "count": 2, "recordable": status == "completed"},
+    }
+    summary.update(kwargs)
+    return summary
+
+
+class TestShardOf:
+    """Test cases for the assignment of the servers to the shards."""
+
+    def test_stable_and_balanced(self):
+        """Test that shards are stable and evenly used."""
+        shards = [shard_of(f"id-{i}", 4) for i in range(1000)]
+
+        assert shards == [shard_of(f"id-{i}", 4) for i in range(1000)]
+        assert all(200 < shards.count(shard) < 300 for shard in range(4))
+
+    def test_shard_from_env(self):
+        """Test that the index of Indexed Jobs is used by default."""
+        with patch.dict(
+            "os.environ", {"SHARD_COUNT": "3", "JOB_COMPLETION_INDEX": "2"}
+        ):
+            assert shard_from_env() == (2, 3)
+        with patch.dict("os.environ", {"SHARD_COUNT": "3", "SHARD_INDEX": "3"}):
+            with pytest.raises(ValueError):
+                shard_from_env()
+
+    def test_importer_filters_shard(self):
+        """Test that each shard imports its own servers only."""
+        servers = [{"id": f"id-{i}", "name": f"server-{i}"} for i in range(20)]
+        imported = []
+        for index in range(3):
+            importer = Importer(
+                crd_api=Mock(),
+                catalog_name="test-catalog",
+                import_job_name="test-job",
+                mcp_registry_url="http://localhost:8080/v0",
+                registry_client=Mock(),
+                max_servers=0,
+                shard_index=index,
+                shard_count=3,
+            )
+            imported.append(
+                [s["id"] for s in importer._read_page({"servers": servers})]
+            )
+
+        assert sorted(sum(imported, [])) == sorted(s["id"] for s in servers)
+        assert all(imported)
+
+
+class TestMergeSummaries:
+    """Test cases for combining the summaries of the shards."""
+
+    def test_all_shards_completed(self):
+        """Test that counters are summed and the earliest mark is kept."""
+        merged = merge_summaries(
+            [_summary(1, mark="2025-06-02T00:00:00Z"), _summary(0)], 2
+        )
+
+        assert merged["status"] == "completed"
+        assert merged["imported_count"] == 2
+        assert merged["duration_sec"] == 11.0
+        assert merged["high_water_mark"] == "2025-06-01T00:00:00Z"
+        assert [s["id"] for s in merged["imported_servers"]] == ["id-0", "id-1"]
+
+    def test_missing_or_failed_shard(self):
+        """Test that the mark is not recorded unless every shard completed."""
+        merged = merge_summaries([_summary(0)], 2)
+        assert merged["status"] == "failed"
+        assert merged["error"] == "Missing shards: [1]"
+        assert merged["high_water_mark"] is None
+
+        merged = merge_summaries([_summary(0), _summary(1, status="failed")], 2)
+        assert merged["error"] == "Failed shards: [1]"
+
+    def test_retried_shard(self):
+        """Test that the completed run of a retried shard is used."""
+        merged = merge_summaries(
+            [
+                _summary(0),
+                _summary(1, status="completed", timestamp="2025-06-03T00:00:00"),
+                _summary(1, status="failed", timestamp="2025-06-04T00:00:00"),
+            ],
+            2,
+        )
+
+        assert merged["status"] == "completed"
+
+
+class TestMergeShards:
+    """Test cases for the merged summary ConfigMap."""
+
+    def test_merge_shards(self):
+        """Test that the merged ConfigMap records the high-water mark."""
+        configmaps = [
+            SimpleNamespace(
+                metadata=SimpleNamespace(labels={"mcp.opendatahub.io/shard": str(i)}),
+                data={"execution.yaml": yaml.dump(_summary(i))},
+            )
+            for i in range(2)
+        ]
+        core_v1_api = Mock()
+        core_v1_api.list_namespaced_config_map.return_value = SimpleNamespace(
+            items=configmaps
+        )
+
+        merge_shards(core_v1_api, "test-namespace", "test-job", 2)
+
+        assert core_v1_api.list_namespaced_config_map.call_args.kwargs[
+            "label_selector"
+        ] == ("mcp.opendatahub.io/mcpserverimportjob=test-job,mcp.opendatahub.io/shard")
+        body = core_v1_api.create_namespaced_config_map.call_args.kwargs["body"]
+        assert body["metadata"]["labels"]["mcp.opendatahub.io/shard"] == "merged"
+        assert (
+            body["metadata"]["annotations"]["mcp.opendatahub.io/high-water-mark"]
+            == "2025-06-01T00:00:00Z"
+        )
+
+    def test_merge_shards_exclude(self):
+        """Test that the merged mark is recorded under the key of the whole name
+        filter, not of its includes only."""
+        configmaps = [
+            SimpleNamespace(
+                metadata=SimpleNamespace(labels={"mcp.opendatahub.io/shard": str(i)}),
+                data={
+                    "execution.yaml": yaml.dump(
+                        _summary(i, name_filter="acme", name_exclude="*-beta")
+                    )
+                },
+            )
+            for i in range(2)
+        ]
+        core_v1_api = Mock()
+        core_v1_api.list_namespaced_config_map.return_value = SimpleNamespace(
+            items=configmaps
+        )
+
+        merge_shards(core_v1_api, "test-namespace", "test-job", 2)
+
+        body = core_v1_api.create_namespaced_config_map.call_args.kwargs["body"]
+        assert body["metadata"]["annotations"]["mcp.opendatahub.io/name-filter"] == (
+            NameFilter("acme", "*-beta").key
+        )
+        assert yaml.safe_load(body["data"]["execution.yaml"])["name_exclude"] == (
+            "*-beta"
+        )
+
+    def test_merge_compact_shards(self):
+        """Test that the servers of compact shard reports are merged."""
+        configmaps = []
+        for i in range(2):
+            _, bodies = build_report(
+                {"metadata": {"name": f"mcp-import-{i}"}}, _summary(i), "compact"
+            )
+            configmaps.append(
+                SimpleNamespace(
+                    metadata=SimpleNamespace(
+                        labels={"mcp.opendatahub.io/shard": str(i)}
+                    ),
+                    data=bodies[-1]["data"],
+                    binary_data=bodies[-1]["binaryData"],
+                )
+            )
+        core_v1_api = Mock()
+        core_v1_api.list_namespaced_config_map.return_value = SimpleNamespace(
+            items=configmaps
+        )
+
+        merge_shards(core_v1_api, "test-namespace", "test-job", 2)
+
+        body = core_v1_api.create_namespaced_config_map.call_args.kwargs["body"]
+        merged = yaml.safe_load(body["data"]["execution.yaml"])
+        assert merged["imported_servers"] == [{"id": "id-0"}, {"id": "id-1"}]
@@ -0,0 +1,120 @@
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from importer.importer import Importer
+from importer.snapshot import SnapshotClient, SnapshotError
+
+SERVERS = [{"id": f"id-{i}", "name": f"server-{i}"} for i in range(5)]
+
+
+@pytest.fixture(params=["ndjson", "json", "list"])
+def snapshot(request, tmp_path):
+    """Snapshot of the servers in each of the supported formats."""
+    if request.param == "ndjson":
+        path = tmp_path / "snapshot.ndjson"
+        path.write_text("\n".join(json.dumps(s) for s in SERVERS) + "\n\n")
+    elif request.param == "json":
+        path = tmp_path / "snapshot.json"
+        path.write_text(json.dumps({"servers": SERVERS, "metadata": {}}, indent=2))
+    else:
+        path = tmp_path / "snapshot.json"
+        path.write_text(json.dumps(SERVERS))
+    with SnapshotClient(str(path)) as client:
+        yield client
+
+
+class TestSnapshotClient:
+    """Test cases for the registry snapshots."""
+
+    def test_pages(self, snapshot):
+        """Test that the snapshot is read page by page."""
+        first = snapshot.list_servers(limit=2)
+        second = snapshot.list_servers(first["metadata"]["next_cursor"], limit=2)
+        last = snapshot.list_servers(second["metadata"]["next_cursor"], limit=2)
+
+        assert first["servers"] + second["servers"] + last["servers"] == SERVERS
+        assert last["metadata"]["next_cursor"] is None
+        assert snapshot.get_server("id-4") == SERVERS[4]
+
+    def test_resume(self, snapshot):
+        """Test that a page is read at any cursor, backwards included."""
+        assert snapshot.list_servers("3", limit=10)["servers"] == SERVERS[3:]
+        assert snapshot.list_servers("1", limit=1)["servers"] == SERVERS[1:2]
+
+    def test_stream(self, snapshot):
+        """Test that a streamed page sets its next cursor once read."""
+        page = snapshot.stream_servers(None, limit=3)
+
+        assert list(page.servers()) == SERVERS[:3]
+        assert page.next_cursor == "3"
+
+    def test_details_of_last_pages(self, snapshot):
+        """Test that only the details of the last pages are kept."""
+        for cursor in range(5):
+            snapshot.list_servers(str(cursor), limit=1)
+
+        assert snapshot.get_server("id-4") == SERVERS[4]
+        with pytest.raises(SnapshotError):
+            snapshot.get_server("id-0")
+
+    def test_invalid_line(self, tmp_path):
+        """Test that an invalid line is reported like a registry error."""
+        path = tmp_path / "snapshot.jsonl"
+        path.write_text('{"id": "id-0"}\n{"id": \n')
+        with SnapshotClient(str(path)) as snapshot, pytest.raises(SnapshotError):
+            snapshot.list_servers(limit=10)
+
+    def test_empty(self, tmp_path):
+        """Test that an empty snapshot has no servers."""
+        path = tmp_path / "snapshot.ndjson"
+        path.write_text("")
+
+        with SnapshotClient(str(path)) as snapshot:
+            assert snapshot.list_servers() == {
+                "servers": [],
+                "metadata": {"next_cursor": None},
+            }
+
+    def test_close(self, tmp_path):
+        """Test that the snapshot file and its map are closed on exit."""
+        path = tmp_path / "snapshot.ndjson"
+        path.write_text('{"id": "id-0"}\n')
+
+        with SnapshotClient(str(path)) as snapshot:
+            mapped = snapshot._mmap
+            assert not mapped.closed
+
+        assert mapped.closed
+
+
+class TestImporterSnapshot:
+    """Test cases for the imports from a snapshot."""
+
+    @pytest.mark.parametrize("stream_parse", [False, True])
+    def test_import(self, snapshot, stream_parse):
+        """Test that every server of the snapshot is imported."""
+        crd_api = Mock()
+        crd_api.list_namespaced_custom_object.return_value = {"items": []}
+        importer = Importer(
+            crd_api=crd_api,
+            catalog_name="test-catalog",
+            import_job_name="test-job",
+            mcp_registry_url=snapshot.base_url,
+            max_servers=0,
+            namespace="test-namespace",
+            registry_client=snapshot,
+            stream_parse=stream_parse,
+        )
+
+        importer.run()
+
+        assert importer.imported_count == 5
+        assert importer.fetch_errors == 0
+        assert importer.walk_complete
+        bodies = [
+            c.kwargs["body"]
+            for c in crd_api.create_namespaced_custom_object.call_args_list
+        ]
+        assert [b["spec"]["server_detail"] for b in bodies] == SERVERS
@@ -0,0 +1,45 @@
+import subprocess
+import sys
+from pathlib import Path
+
+# Cumulative import time of the importer entry point, about 3 times the
+# measured one so that slow CI runners pass
+IMPORT_TIME_BUDGET_SEC = 1.0
+# Modules only needed by the API, the async engine or STREAM_PARSE
+DEFERRED_MODULES = ("fastapi", "kubernetes_asyncio", "httpx", "asyncio", "ijson")
+
+
+def _import_times(module: str) -> dict[str, float]:
+    """Cumulative import time, in seconds, of the modules imported by a fresh
+    interpreter importing the given module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).parent.parent,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative) / 1_000_000
+    return times
+
+
+class TestStartup:
+    """Test cases for the start-up cost of the importer Job."""
+
+    def test_deferred_modules(self):
+        """Test that the modules a sync run does not need are not imported."""
+        times = _import_times("importer.importer")
+
+        imported = {name.split(".")[0] for name in times}
+        assert imported.isdisjoint(DEFERRED_MODULES)
+
+    def test_import_time_budget(self):
+        """Test that the importer entry point imports within its budget."""
+        times = _import_times("importer.importer")
+
+        assert times["importer.importer"] < IMPORT_TIME_BUDGET_SEC
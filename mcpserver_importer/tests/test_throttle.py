@@ -0,0 +1,151 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from kubernetes import client
+
+from importer.importer import Importer
+from importer.throttle import Throttle
+
+
+def _throttled_error(retry_after=None):
+    error = client.ApiException(status=429)
+    error.headers = {"Retry-After": retry_after} if retry_after else {}
+    return error
+
+
+class TestTokenBucket:
+    """Test cases for the QPS limit of the Kubernetes API calls."""
+
+    @patch("importer.throttle.time.monotonic", return_value=100.0)
+    def test_burst_then_qps(self, mock_monotonic):
+        """Test that calls beyond the burst wait for new tokens."""
+        throttle = Throttle(qps=10, burst=2)
+
+        assert throttle.reserve() == 0.0
+        assert throttle.reserve() == 0.0
+        assert throttle.reserve() == pytest.approx(0.1)
+        assert throttle.reserve() == pytest.approx(0.2)
+
+        mock_monotonic.return_value = 101.0
+        assert throttle.reserve() == 0.0
+        assert throttle.wait_sec == pytest.approx(0.3)
+
+    def test_unlimited(self):
+        """Test that a QPS of 0 disables the limit."""
+        throttle = Throttle(qps=0, burst=1)
+
+        assert [throttle.reserve() for _ in range(5)] == [0.0] * 5
+
+
+class TestAdaptiveConcurrency:
+    """Test cases for the retries and the AIMD concurrency limit."""
+
+    @patch("importer.throttle.time.sleep")
+    def test_retry_after_429(self, mock_sleep):
+        """Test that throttled calls are retried after Retry-After."""
+        throttle = Throttle(qps=0, max_concurrency=8)
+        fn = Mock(side_effect=[_throttled_error("2"), _throttled_error("1"), "ok"])
+
+        assert throttle.call(fn, "a", key="b") == "ok"
+
+        fn.assert_called_with("a", key="b")
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [2.0, 1.0]
+        assert throttle.throttled == 2
+        assert throttle.retries == 2
+        assert throttle.concurrency == pytest.approx(2 + 1 / 2)
+        assert throttle.in_flight == 0
+
+    @patch("importer.throttle.time.sleep")
+    def test_retries_exhausted(self, mock_sleep):
+        """Test that the error is raised once the retries are exhausted."""
+        throttle = Throttle(qps=0, max_retries=1)
+        fn = Mock(side_effect=_throttled_error())
+
+        with pytest.raises(client.ApiException):
+            throttle.call(fn)
+
+        assert fn.call_count == 2
+
+    def test_other_errors_not_retried(self):
+        """Test that non-throttling errors are raised at once."""
+        throttle = Throttle(qps=0)
+        fn = Mock(side_effect=client.ApiException(status=409))
+
+        with pytest.raises(client.ApiException):
+            throttle.call(fn)
+
+        assert fn.call_count == 1
+        assert throttle.throttled == 0
+
+    def test_additive_increase(self):
+        """Test that the concurrency recovers up to its maximum."""
+        throttle = Throttle(qps=0, max_concurrency=4)
+        throttle.concurrency = 2.0
+
+        for _ in range(20):
+            throttle.call(Mock(return_value=None))
+
+        assert throttle.concurrency == 4
+
+    def test_async_concurrency_limit(self):
+        """Test that the async calls in flight never exceed the limit."""
+        throttle = Throttle(qps=0, max_concurrency=3)
+        peak = 0
+
+        async def fn():
+            nonlocal peak
+            peak = max(peak, throttle.in_flight)
+            await asyncio.sleep(0.001)
+
+        async def run():
+            await asyncio.gather(*(throttle.call_async(fn) for _ in range(10)))
+
+        asyncio.run(run())
+
+        assert peak == 3
+        assert throttle.calls == 10
+
+
+class TestThrottledImporter:
+    """Test cases for the Kubernetes calls of the importer behind the throttle."""
+
+    @patch("importer.throttle.time.sleep")
+    def test_throttled_create_retried(self, mock_sleep):
+        """Test that a 429 on create is retried instead of an api_error."""
+        crd_api = Mock()
+        crd_api.list_namespaced_custom_object.return_value = {"items": []}
+        crd_api.create_namespaced_custom_object.side_effect = [
+            _throttled_error("1"),
+            None,
+        ]
+        registry_client = Mock()
+        registry_client.get_server.side_effect = lambda id: {"id": id}
+        importer = Importer(
+            crd_api=crd_api,
+            catalog_name="test-catalog",
+            import_job_name="test-job",
+            mcp_registry_url="http://localhost:8080/v0",
+            namespace="test-namespace",
+            registry_client=registry_client,
+            throttle=Throttle(qps=0),
+        )
+
+        server_entry = {"id": "id-0", "name": "server-0"}
+        importer._track_server(server_entry)
+        importer._import_server_entry(server_entry)
+
+        assert importer.imported_count == 1
+        assert importer.throttle.stats()["throttled"] == 1
+        assert crd_api.create_namespaced_custom_object.call_count == 2
+
+    def test_async_proxy(self):
+        """Test that the async proxy awaits the wrapped coroutine."""
+        api = AsyncMock()
+        api.get_namespaced_custom_object.return_value = {"kind": "McpServer"}
+        proxy = Throttle(qps=0).wrap_async(api)
+
+        result = asyncio.run(proxy.get_namespaced_custom_object(name="x"))
+
+        assert result == {"kind": "McpServer"}
+        api.get_namespaced_custom_object.assert_awaited_once_with(name="x")
@@ -0,0 +1,94 @@
+from unittest.mock import Mock, patch
+
+import yaml
+
+from importer.importer import Importer
+from importer.timing import PhaseTimings, percentile
+
+
+class TestPhaseTimings:
+    """Test cases for the phase timings of an import."""
+
+    def test_percentile(self):
+        """Test the nearest-rank percentiles."""
+        samples = [float(i) for i in range(1, 21)]
+
+        assert percentile(samples, 0.5) == 10.0
+        assert percentile(samples, 0.95) == 19.0
+        assert percentile([], 0.5) == 0.0
+
+    def test_phases(self):
+        """Test the count, total and percentiles of a phase."""
+        timings = PhaseTimings()
+        for elapsed in (0.1, 0.2, 0.3, 0.4):
+            timings.record("detail_fetch", elapsed)
+
+        phases = timings.as_dict()["phases"]
+
+        assert phases["detail_fetch"] == {
+            "count": 4,
+            "total_sec": 1.0,
+            "p50_sec": 0.2,
+            "p95_sec": 0.4,
+        }
+        assert phases["write"]["count"] == 0
+
+    @patch("importer.timing.time.perf_counter")
+    def test_slowest_servers(self, mock_perf_counter):
+        """Test that only the slowest servers are kept, slowest first."""
+        timings = PhaseTimings(slowest=2)
+        for i, elapsed in enumerate((1.0, 3.0, 2.0)):
+            server_entry = {"id": f"id-{i}", "name": f"server-{i}"}
+            mock_perf_counter.return_value = 10.0
+            timings.start_server(server_entry)
+            mock_perf_counter.return_value = 10.0 + elapsed
+            timings.finish_server(server_entry)
+
+        assert timings.as_dict()["slowest_servers"] == [
+            {"name": "server-1", "duration_sec": 3.0},
+            {"name": "server-2", "duration_sec": 2.0},
+        ]
+
+
+class TestImporterTimings:
+    """Test cases for the timings in the execution summary."""
+
+    @patch("importer.importer.client.CoreV1Api")
+    def test_execution_summary(self, mock_core_v1_api):
+        """Test that the phases of an import are reported in execution.yaml."""
+        crd_api = Mock()
+        crd_api.list_namespaced_custom_object.return_value = {"items": []}
+        registry_client = Mock(last_page_bytes=0)
+        registry_client.cache = None
+        registry_client.list_servers.return_value = {
+            "servers": [
+                {"id": "id-0", "name": "server-0"},
+                {"id": "id-1", "name": "server-1"},
+            ],
+            "metadata": {},
+        }
+        registry_client.get_server.side_effect = lambda id: {"id": id}
+        importer = Importer(
+            crd_api=crd_api,
+            catalog_name="test-catalog",
+            import_job_name="test-job",
+            mcp_registry_url="http://localhost:8080/v0",
+            max_servers=0,
+            namespace="test-namespace",
+            registry_client=registry_client,
+        )
+
+        importer.run()
+        importer.generate_configmap()
+
+        body = mock_core_v1_api.return_value.create_namespaced_config_map.call_args
+        execution = yaml.safe_load(body.kwargs["body"]["data"]["execution.yaml"])
+        phases = execution["timings"]["phases"]
+        assert phases["page_fetch"]["count"] == 1
+        assert phases["detail_fetch"]["count"] == 2
+        # The names of a page are sanitized at once
+        assert phases["sanitize"]["count"] == 1
+        assert phases["write"]["count"] == 2
+        assert phases["report"]["count"] == 1
+        slowest = execution["timings"]["slowest_servers"]
+        assert sorted(s["name"] for s in slowest) == ["server-0", "server-1"]
@@ -0,0 +1,99 @@
+import pytest
+
+from importer.tracking import ServerLedger
+from importer.utils import sanitize_k8s_name
+
+
+class TestServerLedger:
+    """Test cases for the tracking of the processed servers."""
+
+    def test_counters(self):
+        """Test that the counters follow the outcomes of the servers."""
+        ledger = ServerLedger()
+        entries = [{"id": f"id-{i}", "name": f"server-{i}"} for i in range(4)]
+        for entry in entries:
+            ledger.track(entry)
+
+        ledger.set_outcome(entries[0], False)
+        ledger.set_outcome(entries[1], True, "already_exists")
+        ledger.set_outcome(entries[2], False, "updated")
+        ledger.set_outcome(entries[3], True, "api_error")
+
+        assert len(ledger) == 4
+        assert (ledger.imported, ledger.updated, ledger.skipped) == (1, 1, 2)
+        assert ledger.errors == 1
+
+        ledger.set_outcome(entries[3], False)
+
+        assert (ledger.imported, ledger.skipped, ledger.errors) == (2, 1, 0)
+        assert ledger.as_list()[3] == {
+            "id": "id-3",
+            "name": "server-3",
+            "skipped": False,
+            "reason": None,
+        }
+
+    def test_same_name(self):
+        """Test that entries with the same name keep their own outcome."""
+        ledger = ServerLedger()
+        first = {"id": "id-a", "name": "my-server"}
+        second = {"id": "id-b", "name": "my-server"}
+        ledger.track(first)
+        ledger.track(second)
+
+        ledger.set_outcome(second, True, "name_conflict")
+
+        assert not ledger.name_conflict(first)
+        assert ledger.name_conflict(second)
+        assert [(r.id, r.reason) for r in ledger] == [
+            ("id-a", None),
+            ("id-b", "name_conflict"),
+        ]
+
+
+class TestNameConflict:
+    """Test cases for registry entries sharing the same McpServer name."""
+
+    @pytest.fixture
+    def importer(self, make_importer):
+        return make_importer(update_existing=True)
+
+    def test_same_name_skipped(self, importer):
+        """Test that a second entry of the same name does not overwrite the
+        first one."""
+        crd_api = importer.crd_api
+
+        for entry in (
+            {"id": "id-a", "name": "my-server"},
+            {"id": "id-b", "name": "my-server"},
+        ):
+            importer._track_server(entry)
+            importer._import_server_entry(entry)
+
+        crd_api.create_namespaced_custom_object.assert_called_once()
+        crd_api.patch_namespaced_custom_object.assert_not_called()
+        assert [r.reason for r in importer.server_tracking] == [None, "name_conflict"]
+        assert importer.imported_count == 1
+
+    def test_colliding_names_suffixed(self, importer):
+        """Test that different names sanitized to the same McpServer name are
+        both imported, the second one with a hash suffix."""
+        crd_api = importer.crd_api
+        entries = [
+            {"id": "id-a", "name": "My Server"},
+            {"id": "id-b", "name": "my.server"},
+        ]
+
+        importer._import_entries(entries)
+
+        names = [
+            c.kwargs["body"]["metadata"]["name"]
+            for c in crd_api.create_namespaced_custom_object.call_args_list
+        ]
+        assert names == [
+            "my-server",
+            sanitize_k8s_name("my.server", add_hash_suffix=True),
+        ]
+        assert names[1].startswith("my-server-")
+        assert importer.imported_count == 2
+        assert importer.names.collisions == 1
@@ -1,8 +1,9 @@
 from unittest.mock import MagicMock, mock_open, patch
 
 import pytest
-from kubernetes import config
+from kubernetes import client, config
 
+from importer.cluster import read_current_namespace
 from importer.utils import get_current_namespace, get_k8s_client, sanitize_k8s_name
 
 
@@ -62,44 +63,55 @@ class TestGetCurrentNamespace:
     @patch("builtins.open", new_callable=mock_open, read_data="test-namespace")
     def test_get_current_namespace_incluster(self, mock_file):
         """Test in-cluster namespace detection."""
-        result = get_current_namespace()
+        result = read_current_namespace()
         assert result == "test-namespace"
 
     @patch("builtins.open", side_effect=FileNotFoundError)
-    @patch("importer.utils.config.list_kube_config_contexts")
+    @patch("importer.cluster.config.list_kube_config_contexts")
     def test_get_current_namespace_local(self, mock_list_contexts, mock_open):
         """Test local namespace detection from kubeconfig."""
-        # Mock the kubeconfig contexts properly
-        mock_contexts = [
-            {"name": "current-context"},
-            {"context": {"context": {"namespace": "my-namespace"}}},
-        ]
-        mock_list_contexts.return_value = mock_contexts
+        mock_list_contexts.return_value = (
+            [{"name": "other-context"}],
+            {"name": "current-context", "context": {"namespace": "my-namespace"}},
+        )
 
-        # The function should return the namespace from the mocked context
-        result = get_current_namespace()
-        # Since the mock might not be working as expected, let's just verify it doesn't crash
-        assert isinstance(result, str)
-        assert len(result) > 0
+        result = read_current_namespace()
+        assert result == "my-namespace"
 
     @patch("builtins.open", side_effect=FileNotFoundError)
-    @patch("importer.utils.config.list_kube_config_contexts")
+    @patch("importer.cluster.config.list_kube_config_contexts")
     def test_get_current_namespace_default_fallback(
         self, mock_list_contexts, mock_open
     ):
         """Test fallback to default namespace."""
-        mock_contexts = [{"name": "current-context"}, {"context": {"context": {}}}]
+        mock_contexts = [{"name": "current-context"}, {"context": {}}]
         mock_list_contexts.return_value = mock_contexts
 
-        result = get_current_namespace()
+        result = read_current_namespace()
         assert result == "default"
 
+    @patch("importer.cluster._shared", None)
+    @patch("importer.cluster.read_current_namespace", return_value="test-namespace")
+    def test_get_current_namespace_cached(self, mock_read_namespace):
+        """Test that the namespace of the shared cluster context is read once."""
+        assert get_current_namespace() == "test-namespace"
+        assert get_current_namespace() == "test-namespace"
+        mock_read_namespace.assert_called_once()
+
 
 class TestGetK8sClient:
     """Test cases for the get_k8s_client function."""
 
-    @patch("importer.utils.config.load_incluster_config")
-    @patch("importer.utils.client.CustomObjectsApi")
+    @pytest.fixture(autouse=True)
+    def shared_cluster(self):
+        """Fresh shared cluster context, and default configuration restored."""
+        default = client.Configuration.get_default_copy()
+        with patch("importer.cluster._shared", None):
+            yield
+        client.Configuration.set_default(default)
+
+    @patch("importer.cluster.config.load_incluster_config")
+    @patch("importer.cluster.client.CustomObjectsApi")
     def test_get_k8s_client_incluster_success(
         self, mock_custom_objects_api, mock_load_incluster
     ):
@@ -112,13 +124,14 @@ class TestGetK8sClient:
         mock_load_incluster.assert_called_once()
         mock_custom_objects_api.assert_called_once()
         assert result == mock_api
+        assert get_k8s_client() is result
 
     @patch(
-        "importer.utils.config.load_incluster_config",
+        "importer.cluster.config.load_incluster_config",
         side_effect=config.ConfigException,
     )
-    @patch("importer.utils.config.load_kube_config")
-    @patch("importer.utils.client.CustomObjectsApi")
+    @patch("importer.cluster.config.load_kube_config")
+    @patch("importer.cluster.client.CustomObjectsApi")
     def test_get_k8s_client_fallback_to_kubeconfig(
         self, mock_custom_objects_api, mock_load_kube, mock_load_incluster
     ):